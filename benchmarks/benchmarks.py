@@ -0,0 +1,259 @@
+"""Benchmarks for the network, monitoring and simulation hot paths.
+
+Written in the asv style: each class has ``params`` (network sizes),
+``setup(num_nodes)`` and ``time_*`` methods. Classes with ``number = 1`` are
+set up again before every sample, for operations that consume their input.
+Run them with ``python benchmarks/run.py`` (or with asv).
+"""
+import numpy as np
+from network.network_manager import NetworkManager
+from network.sharded_network_manager import ShardedNetworkManager
+from monitoring.performance_monitor import PerformanceMonitor
+from monitoring.anomaly_detection import AnomalyDetector
+from simulation.failure_simulation import FailureSimulation
+from simulation.quantum_simulation import QuantumSimulation
+
+SIZES = [10, 1000, 100000, 1000000]
+
+def build_network(num_nodes, seed=0):
+    network_manager = NetworkManager(num_nodes=num_nodes, seed=seed)
+    network_manager.initialize_network()
+    return network_manager
+
+class NetworkManagerSuite:
+    params = SIZES
+    param_names = ['num_nodes']
+
+    def setup(self, num_nodes):
+        self.network_manager = build_network(num_nodes)
+
+    def time_monitor_network(self, num_nodes):
+        self.network_manager.monitor_network()
+
+class PerformanceMonitorSuite:
+    params = SIZES
+    param_names = ['num_nodes']
+
+    def setup(self, num_nodes):
+        self.performance_monitor = PerformanceMonitor(build_network(num_nodes))
+
+    def time_collect_performance_data(self, num_nodes):
+        self.performance_monitor.collect_performance_data()
+
+class AnomalyDetectorSuite:
+    """Scores one tick of new samples against already fitted models."""
+
+    params = SIZES
+    param_names = ['num_nodes']
+    number = 1
+    repeat = 5
+
+    def setup(self, num_nodes):
+        self.network_manager = build_network(num_nodes)
+        self.anomaly_detector = AnomalyDetector(self.network_manager, refit_interval=1000, seed=0)
+        for _ in range(3):
+            self.network_manager.monitor_network()
+            self.anomaly_detector.detect_anomalies()
+        self.network_manager.monitor_network()
+
+    def time_detect_anomalies(self, num_nodes):
+        self.anomaly_detector.detect_anomalies()
+
+class SelfHealingSuite:
+    """Repairs a batch of 1% failed nodes."""
+
+    params = SIZES
+    param_names = ['num_nodes']
+    number = 1
+    repeat = 5
+
+    def setup(self, num_nodes):
+        self.network_manager = build_network(num_nodes)
+        rng = np.random.default_rng(0)
+        failed = rng.choice(num_nodes, size=max(1, num_nodes // 100), replace=False)
+        self.network_manager.nodes.fail(failed)
+
+    def time_check_nodes(self, num_nodes):
+        self.network_manager.self_healing_mechanism.check_nodes()
+
+class FailureSimulationSuite:
+    """Injects one round of random failures into a healthy network."""
+
+    params = SIZES
+    param_names = ['num_nodes']
+    number = 1
+    repeat = 5
+
+    def setup(self, num_nodes):
+        self.failure_simulation = FailureSimulation(build_network(num_nodes), seed=0)
+
+    def time_simulate_random_failures(self, num_nodes):
+        self.failure_simulation.simulate_random_failures()
+
+class ShardedNetworkManagerSuite:
+    """One monitoring tick over one shard per core."""
+
+    params = SIZES
+    param_names = ['num_nodes']
+
+    def setup(self, num_nodes):
+        self.network_manager = ShardedNetworkManager(num_nodes=num_nodes, seed=0)
+        self.network_manager.initialize_network()
+
+    def teardown(self, num_nodes):
+        self.network_manager.close()
+
+    def time_monitor_network(self, num_nodes):
+        self.network_manager.monitor_network()
+
+class QuantumSimulationSuite:
+    """GHZ preparation (H and a CNOT chain) and a layered circuit on the native simulator.
+
+    The layered circuit (rotations on every qubit, then a CNOT chain, five
+    times) runs both gate by gate and as a fused lazy circuit. Sampling draws
+    a histogram of one million shots from a uniform superposition.
+    """
+
+    params = [10, 16, 20]
+    param_names = ['num_qubits']
+
+    def setup(self, num_qubits):
+        self.simulation = QuantumSimulation(num_qubits, seed=0)
+        self.fused = QuantumSimulation(num_qubits, seed=0, lazy=True)
+        angles = np.random.default_rng(0).uniform(0, np.pi, size=(5, num_qubits))
+        self.rotations = [[np.array([[np.cos(a / 2), -np.sin(a / 2)], [np.sin(a / 2), np.cos(a / 2)]])
+                           for a in layer] for layer in angles]
+        self.sampled = QuantumSimulation(num_qubits, seed=0)
+        for qubit in range(num_qubits):
+            self.sampled.apply_hadamard(qubit)
+
+    def layered_circuit(self, simulation):
+        simulation.reset()
+        for layer in self.rotations:
+            for qubit, rotation in enumerate(layer):
+                simulation.apply_gate(rotation, qubit)
+            for qubit in range(simulation.num_qubits - 1):
+                simulation.apply_cnot(qubit, qubit + 1)
+        simulation.run()
+
+    def time_layered_circuit(self, num_qubits):
+        self.layered_circuit(self.simulation)
+
+    def time_layered_circuit_fused(self, num_qubits):
+        self.layered_circuit(self.fused)
+
+    def time_ghz(self, num_qubits):
+        self.simulation.state = self.simulation.initialize_states()
+        self.simulation.apply_hadamard(0)
+        for qubit in range(num_qubits - 1):
+            self.simulation.apply_cnot(qubit, qubit + 1)
+
+    def time_measure_shots(self, num_qubits):
+        self.sampled.measure(shots=1_000_000, as_array=True)
+
+class AlgorithmSuite:
+    """A full Grover search and quantum teleportation on the native simulator.
+
+    Grover needs O(sqrt(2^n)) iterations, so these only run at a small size.
+    """
+
+    params = [10]
+    param_names = ['num_qubits']
+
+    def setup(self, num_qubits):
+        self.simulation = QuantumSimulation(num_qubits, seed=0)
+
+    def time_grovers_search(self, num_qubits):
+        self.simulation.simulate_grovers_search()
+
+    def time_teleportation(self, num_qubits):
+        self.simulation.simulate_quantum_teleportation()
+
+def load_aer():
+    """Import qiskit and qiskit Aer, skipping the calling benchmark when they are not installed."""
+    try:
+        import qiskit
+        import qiskit_aer
+    except ImportError:
+        raise NotImplementedError("qiskit-aer is not installed.")
+    return qiskit, qiskit_aer
+
+class AerSuite:
+    """The GHZ circuit of ``QuantumSimulationSuite`` on qiskit Aer's statevector simulator."""
+
+    params = QuantumSimulationSuite.params
+    param_names = ['num_qubits']
+
+    def setup(self, num_qubits):
+        qiskit, qiskit_aer = load_aer()
+        self.simulator = qiskit_aer.AerSimulator(method='statevector')
+        ghz = qiskit.QuantumCircuit(num_qubits)
+        ghz.h(0)
+        for qubit in range(num_qubits - 1):
+            ghz.cx(qubit, qubit + 1)
+        ghz.save_statevector()
+        self.ghz = qiskit.transpile(ghz, self.simulator)
+
+    def time_ghz(self, num_qubits):
+        self.simulator.run(self.ghz).result()
+
+class AerAlgorithmSuite:
+    """The circuits of ``AlgorithmSuite`` on qiskit Aer, measured with one shot like the native runs.
+
+    Grover marks ``|1...1⟩`` and runs the same optimal number of iterations.
+    Teleportation prepares the same message on qubit 0 and applies the X and
+    Z corrections conditioned on the mid-circuit measurements.
+    """
+
+    params = AlgorithmSuite.params
+    param_names = ['num_qubits']
+
+    def setup(self, num_qubits):
+        qiskit, qiskit_aer = load_aer()
+        self.simulator = qiskit_aer.AerSimulator(method='statevector')
+        self.grover = qiskit.transpile(self.grover_circuit(qiskit, num_qubits), self.simulator)
+        self.teleportation = qiskit.transpile(self.teleportation_circuit(qiskit, num_qubits), self.simulator)
+
+    @staticmethod
+    def grover_circuit(qiskit, num_qubits):
+        circuit = qiskit.QuantumCircuit(num_qubits)
+        qubits = list(range(num_qubits))
+
+        def phase_flip_all_ones():
+            circuit.h(num_qubits - 1)
+            circuit.mcx(qubits[:-1], num_qubits - 1)
+            circuit.h(num_qubits - 1)
+
+        circuit.h(qubits)
+        for _ in range(int(np.pi / 4 * np.sqrt(2 ** num_qubits))):
+            phase_flip_all_ones()  # Oracle for |1...1⟩
+            circuit.h(qubits)
+            circuit.x(qubits)
+            phase_flip_all_ones()
+            circuit.x(qubits)
+            circuit.h(qubits)
+        circuit.measure_all()
+        return circuit
+
+    @staticmethod
+    def teleportation_circuit(qiskit, num_qubits, theta=np.pi / 3, phi=np.pi / 5):
+        circuit = qiskit.QuantumCircuit(num_qubits, 2)
+        circuit.h(1)
+        circuit.cx(1, 2)
+        circuit.ry(theta, 0)  # cos(theta/2)|0⟩ + exp(i phi) sin(theta/2)|1⟩
+        circuit.p(phi, 0)
+        circuit.cx(0, 1)
+        circuit.h(0)
+        circuit.measure([0, 1], [0, 1])
+        with circuit.if_test((circuit.clbits[1], 1)):
+            circuit.x(2)
+        with circuit.if_test((circuit.clbits[0], 1)):
+            circuit.z(2)
+        circuit.save_statevector()
+        return circuit
+
+    def time_grovers_search(self, num_qubits):
+        self.simulator.run(self.grover, shots=1).result()
+
+    def time_teleportation(self, num_qubits):
+        self.simulator.run(self.teleportation, shots=1).result()
@@ -0,0 +1,163 @@
+"""Run the asv-style benchmarks, write JSON results and compare them with a stored baseline.
+
+Usage::
+
+    python benchmarks/run.py --sizes 10 1000 100000 --output results.json
+    python benchmarks/run.py --save-baseline            # Refresh benchmarks/baseline.json
+    python benchmarks/run.py --tolerance 1.5            # Exit with status 1 on regressions
+
+Each benchmark is timed over ``repeat`` samples of ``number`` calls (chosen
+so a sample lasts at least ``--min-sample-time``) and reported by its median
+per-call time. A benchmark regresses when its median exceeds the baseline's
+by more than ``tolerance`` times.
+"""
+import argparse
+import gc
+import inspect
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+def discover(module, pattern=None):
+    """Yield ``(name, suite class, method name)`` for every ``time_*`` benchmark in ``module``."""
+    for class_name, suite in inspect.getmembers(module, inspect.isclass):
+        if suite.__module__ != module.__name__:
+            continue
+        for method in sorted(name for name in vars(suite) if name.startswith('time_')):
+            name = f"{class_name}.{method}"
+            if pattern is None or pattern in name:
+                yield name, suite, method
+
+def time_benchmark(suite, method, param, repeat=None, min_sample_time=0.05):
+    """Return the per-call timings of one benchmark at one parameter value, in seconds."""
+    repeat = repeat or getattr(suite, 'repeat', 5)
+    number = getattr(suite, 'number', None)
+    fresh = number == 1  # Suites with number = 1 are set up again for every sample
+    instance = suite()
+    teardown = getattr(instance, 'teardown', lambda param: None)
+    if not fresh:
+        instance.setup(param)
+        function = getattr(instance, method)
+        function(param)  # Warm up
+        if number is None:
+            number = 1
+            while True:
+                start = time.perf_counter()
+                for _ in range(number):
+                    function(param)
+                if time.perf_counter() - start >= min_sample_time or number >= 1 << 20:
+                    break
+                number *= 2
+    samples = []
+    for sample in range(repeat):
+        if fresh:
+            if sample:
+                teardown(param)
+            instance.setup(param)
+        function = getattr(instance, method)
+        gc.collect()
+        gc.disable()  # As timeit does, so collections of earlier garbage do not land in the sample
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                function(param)
+            samples.append((time.perf_counter() - start) / number)
+        finally:
+            gc.enable()
+    teardown(param)
+    return samples, number
+
+def run(sizes, pattern=None, repeat=None, min_sample_time=0.05):
+    """Run all matching benchmarks and return the results document."""
+    import benchmarks
+
+    results = {}
+    for name, suite, method in discover(benchmarks, pattern):
+        timings = {}
+        for param in suite.params:
+            if sizes and param not in sizes:
+                continue
+            try:
+                samples, number = time_benchmark(suite, method, param, repeat, min_sample_time)
+            except NotImplementedError:  # asv's convention for skipping a benchmark
+                print(f"{name}[{param}]: skipped", flush=True)
+                continue
+            timings[str(param)] = {
+                "median": statistics.median(samples),
+                "min": min(samples),
+                "max": max(samples),
+                "repeat": len(samples),
+                "number": number,
+            }
+            print(f"{name}[{param}]: {statistics.median(samples) * 1000:.3f} ms", flush=True)
+        if timings:
+            results[name] = timings
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+def compare(results, baseline, tolerance=1.5):
+    """Return ``(name, param, ratio)`` for every benchmark slower than ``tolerance`` times its baseline."""
+    regressions = []
+    for name, params in results["results"].items():
+        for param, result in params.items():
+            reference = baseline.get("results", {}).get(name, {}).get(param)
+            if reference:
+                ratio = result["median"] / reference["median"]
+                if ratio > tolerance:
+                    regressions.append((name, param, ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=None, help="Network sizes to run (default: all).")
+    parser.add_argument("--bench", default=None, help="Only run benchmarks whose name contains this string.")
+    parser.add_argument("--repeat", type=int, default=None)
+    parser.add_argument("--min-sample-time", type=float, default=0.05)
+    parser.add_argument("--output", default=None, help="Write the results JSON here.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.CRITICAL)  # Keep per-tick log lines out of the timings
+    results = run(args.sizes, args.bench, args.repeat, args.min_sample_time)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.tolerance)
+    for name, param, ratio in regressions:
+        print(f"REGRESSION {name}[{param}]: {ratio:.2f}x slower than baseline")
+    if not regressions:
+        print(f"No regressions beyond {args.tolerance:.2f}x of the baseline.")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
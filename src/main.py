@@ -1,3 +1,4 @@
+import argparse
 import time
 import random
 import logging
@@ -5,14 +6,15 @@ import json
 from network.network_manager import NetworkManager
 from monitoring.performance_monitor import PerformanceMonitor
 from monitoring.anomaly_detection import AnomalyDetector
-from network.self_healing import SelfHealingMechanism
+from monitoring.profiling import TickProfiler
+from monitoring.telemetry_store import TelemetryStore
 from config import Config
 
 # Configure logging
 logging.basicConfig(
-    filename=Config.LOGGING_FILE,
-    level=Config.LOGGING_LEVEL,
-    format=Config.LOGGING_FORMAT
+    filename=Config.DEFAULTS["LOGGING_FILE"],
+    level=Config.DEFAULTS["LOGGING_LEVEL"],
+    format=Config.DEFAULTS["LOGGING_FORMAT"]
 )
 
 def load_configuration():
@@ -25,7 +27,24 @@ def load_configuration():
         logging.error(f"Error loading configuration: {e}")
         return None
 
-def main():
+def parse_args(argv=None):
+    """Parse the profiling options of the monitoring loop."""
+    parser = argparse.ArgumentParser(description="Run the Quantum-Pi Network monitoring loop.")
+    parser.add_argument("--ticks", type=int, default=None, help="Stop after this many ticks (default: run forever).")
+    parser.add_argument("--interval", type=float, default=None, help="Override MONITOR_INTERVAL (seconds).")
+    parser.add_argument("--track-allocations", action="store_true", help="Record per-stage allocations with tracemalloc.")
+    parser.add_argument("--profile-every", type=int, default=0, help="Capture a full profile every N ticks.")
+    parser.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default="cprofile")
+    parser.add_argument("--profile-dir", default="profiles", help="Directory for captured profiles.")
+    parser.add_argument("--flamegraph", action="store_true", help="Also dump collapsed stacks for flamegraph tools.")
+    parser.add_argument("--report-every", type=int, default=100, help="Log the per-stage latency summary every N ticks.")
+    parser.add_argument("--telemetry-dir", default=None,
+                        help="Persist every tick to a telemetry store here and warm-start from it on restart.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
     # Load configuration settings
     config_data = load_configuration()
     if config_data:
@@ -34,43 +53,63 @@ def main():
     else:
         NUM_NODES = 10
         MONITOR_INTERVAL = 5
+    if args.interval is not None:
+        MONITOR_INTERVAL = args.interval
 
     # Initialize components
-    network_manager = NetworkManager(num_nodes=NUM_NODES)
-    performance_monitor = PerformanceMonitor(network_manager)
-    anomaly_detector = AnomalyDetector()
-    self_healing_mechanism = SelfHealingMechanism(network_manager)
+    network_manager = NetworkManager(num_nodes=NUM_NODES, telemetry=args.telemetry_dir is not None)
+    telemetry_store = TelemetryStore(args.telemetry_dir, NUM_NODES) if args.telemetry_dir else None
+    performance_monitor = PerformanceMonitor(network_manager, telemetry_store=telemetry_store)
+    anomaly_detector = AnomalyDetector(network_manager)
+    profiler = TickProfiler(track_allocations=args.track_allocations, profile_every=args.profile_every,
+                            profiler=args.profiler, profile_dir=args.profile_dir, flamegraph=args.flamegraph)
 
     # Start the network
     logging.info("Starting the Quantum-Pi Network...")
     network_manager.initialize_network()
+    if telemetry_store is not None:
+        anomaly_detector.warm_start(telemetry_store)
 
     try:
-        while True:
-            # Monitor performance of nodes
-            performance_data = performance_monitor.collect_performance_data()
-            logging.info(f"Performance Data: {performance_data}")
+        while args.ticks is None or profiler.ticks < args.ticks:
+            with profiler.tick():
+                # Monitor performance of nodes
+                with profiler.stage('collect'):
+                    performance_data = performance_monitor.collect_performance_data()
+                    performance_monitor.analyze_performance(performance_data)
+
+                # Check for anomalies
+                with profiler.stage('detect'):
+                    anomalies = anomaly_detector.detect_anomalies()
 
-            # Check for anomalies
-            anomalies = anomaly_detector.detect_anomalies(performance_data)
-            if anomalies:
-                logging.warning(f"Anomalies detected in nodes: {anomalies}")
                 # Trigger self-healing mechanism
-                self_healing_mechanism.repair_nodes(anomalies)
+                with profiler.stage('repair'):
+                    if anomalies:
+                        logging.warning(f"Anomalies detected in {len(anomalies)} samples.")
+                        anomaly_detector.trigger_self_healing(anomalies)
 
-            # Simulate random node failures for testing
-            if random.random() < 0.1:  # 10% chance of failure
-                failed_node = random.randint(0, NUM_NODES - 1)
-                logging.error(f"Simulating failure in node {failed_node}")
-                network_manager.simulate_node_failure(failed_node)
+                # Simulate random node failures for testing
+                with profiler.stage('inject'):
+                    if random.random() < 0.1:  # 10% chance of failure
+                        failed_node = random.randint(0, NUM_NODES - 1)
+                        logging.error(f"Simulating failure in node {failed_node}")
+                        network_manager.simulate_node_failure(failed_node)
 
+            if args.report_every and profiler.ticks % args.report_every == 0:
+                logging.info(f"Stage latency over the last {profiler.window} ticks:\n{profiler.format_summary()}")
             time.sleep(MONITOR_INTERVAL)
 
     except KeyboardInterrupt:
         logging.info("Shutting down the Quantum-Pi Network...")
     finally:
+        logging.info(f"Stage latency summary:\n{profiler.format_summary()}")
+        profiler.close()
+        anomaly_detector.close()
+        if telemetry_store is not None:
+            telemetry_store.close()
         network_manager.shutdown_network()
         logging.info("Network shutdown complete.")
+    return profiler
 
 if __name__ == "__main__":
     main()
@@ -1,81 +1,452 @@
 import logging
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
 import numpy as np
 from sklearn.ensemble import IsolationForest
 from sklearn.neighbors import LocalOutlierFactor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
 import matplotlib.pyplot as plt
+from network.performance_history import HistoryViews
+from monitoring.reporting import PerformanceReport
+from monitoring.streaming_detectors import STREAMING_DETECTORS
+from config import Config
+
+def build_model(algorithm, random_state=None, multivariate=False, contamination='auto'):
+    """Create an unfitted model for the given algorithm.
+
+    Multivariate models standardize their features first, so telemetry
+    fields with different units weigh equally. ``contamination`` is the
+    expected fraction of outliers; ``'auto'`` cuts off at a fixed score
+    instead of flagging a fixed fraction of the training data.
+    """
+    if algorithm == 'isolation_forest':
+        model = IsolationForest(contamination=contamination, random_state=random_state)
+    elif algorithm == 'local_outlier_factor':
+        # Novelty mode scores unseen samples
+        model = LocalOutlierFactor(n_neighbors=5, novelty=True, contamination=contamination)
+    else:
+        raise ValueError("Unsupported algorithm specified.")
+    return make_pipeline(StandardScaler(), model) if multivariate else model
+
+def fit_cohort_model(algorithm, data, random_state, multivariate=False, contamination='auto', score_threshold=None):
+    """Fit one cohort model; runs in a worker process for parallel refits.
+
+    With ``contamination='auto'``, a ``score_threshold`` replaces the
+    IsolationForest cut-off of 0.5 on its anomaly score, which ordinary
+    samples from a narrow distribution already reach.
+    """
+    model = build_model(algorithm, random_state, multivariate, contamination).fit(data)
+    estimator = model.steps[-1][1] if multivariate else model
+    if score_threshold is not None and contamination == 'auto' and isinstance(estimator, IsolationForest):
+        estimator.offset_ = -score_threshold  # predict() flags score_samples < offset_
+    return model
+
+_worker_models = {}  # cohort -> (shared memory segment name, model), cached in each worker process
+
+def score_chunk(task):
+    """Score a chunk of one cohort's samples in a worker process.
+
+    The cohort model is unpickled from its shared memory segment the first
+    time a worker sees that segment and reused until the next refit, so only
+    the samples themselves are sent with every task.
+    """
+    cohort, segment, size, features = task
+    cached = _worker_models.get(cohort)
+    if cached is None or cached[0] != segment:
+        shm = shared_memory.SharedMemory(name=segment)
+        try:
+            payload = shm.buf[:size]
+            cached = (segment, pickle.loads(payload))
+            payload.release()
+        finally:
+            shm.close()
+        _worker_models[cohort] = cached
+    return cached[1].predict(features) == -1  # -1 indicates an anomaly
 
 class AnomalyDetector:
-    """Detects anomalies in node performance data."""
+    """Detects anomalies in node performance data.
+
+    ``performance_history`` maps node IDs to read-only views of the network's
+    shared history buffer.
+
+    Models are trained once and reused: a shared model (or one per cohort,
+    with ``cohorts`` nodes grouped by ``node_id % cohorts``) is fitted on up
+    to ``max_training_samples`` samples drawn from the last
+    ``training_window`` samples of each node, and refitted every
+    ``refit_interval`` detection ticks, in a background thread when
+    ``background_refit`` is set. Each tick only scores samples that arrived
+    since the previous tick. ``contamination`` is passed to the models and
+    defaults to ``'auto'``, so a healthy network is not flagged at a fixed
+    rate; a fraction such as 0.1 flags that share of the training data.
+    With ``'auto'``, IsolationForest samples are anomalies when their
+    anomaly score (0 to 1) exceeds ``score_threshold``.
+
+    Until a model can be fitted (fewer than ``min_training_samples``
+    samples), samples below Config ``ANOMALY_DETECTION_THRESHOLD`` are
+    reported as anomalies. This replaces the original behaviour of skipping
+    nodes with fewer than 10 samples, so that a clearly degraded node is
+    reported from its first sample.
 
-    def __init__(self, network_manager, algorithm='isolation_forest'):
+    The streaming algorithms ``'ewma'``, ``'cusum'`` and ``'hst'`` need no
+    training: they keep constant-size state per node (see
+    ``monitoring.streaming_detectors``, configured via ``detector_options``)
+    and flag each sample on the tick it arrives.
+
+    With ``n_jobs`` other than 1 (-1 for all cores), cohort models are fitted
+    and new samples are scored on a process pool. Fitted models are published
+    once per refit through shared memory, and each tick's samples are split
+    into chunks of at least ``parallel_chunk_size`` so scoring spreads over
+    all workers even with a single cohort.
+
+    With ``multivariate`` set, models are fitted over the telemetry vectors
+    of the network's latest monitoring tick (``NodeTable.TELEMETRY_DTYPE``)
+    instead of scalar performance; the network must simulate telemetry. The training set is a float32 ring of
+    ``max_training_samples`` vectors, refreshed every tick with a random
+    sample of nodes so that it spans about ``training_window`` ticks.
+
+    After a restart, ``warm_start`` restores recent ticks from a persistent
+    ``TelemetryStore`` and fits the models on them immediately.
+    """
+
+    parallel_chunk_size = 4096
+
+    def __init__(self, network_manager, algorithm='isolation_forest', training_window=50, refit_interval=10,
+                 min_training_samples=10, max_training_samples=10000, cohorts=1, background_refit=False, seed=None,
+                 detector_options=None, n_jobs=1, multivariate=False, contamination='auto',
+                 score_threshold=0.65):
         self.network_manager = network_manager
         self.algorithm = algorithm
-        self.performance_history = {node.node_id: [] for node in network_manager.nodes}
+        self.performance_history = HistoryViews(network_manager.nodes.history)
         self.model = None
+        self.training_window = training_window
+        self.refit_interval = refit_interval
+        self.min_training_samples = min_training_samples
+        self.max_training_samples = max_training_samples
+        self.cohorts = cohorts
+        self.background_refit = background_refit
+        self.contamination = contamination
+        self.score_threshold = score_threshold
+        self.threshold = Config.CONFIG.get("ANOMALY_DETECTION_THRESHOLD", Config.DEFAULTS["ANOMALY_DETECTION_THRESHOLD"])
+        self.rng = np.random.default_rng(seed)
+        self.models = {}  # Cached model per cohort
+        self.ticks_since_fit = 0
+        self._scored = np.zeros(network_manager.num_nodes, dtype=np.int64)  # Samples already scored per node
+        self._refit_executor = None
+        self._pending_fit = None
+        self.n_jobs = os.cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+        self._pool = None
+        self._model_segments = {}  # cohort -> (SharedMemory, payload size)
+        self.multivariate = multivariate
+        if multivariate:
+            if algorithm in STREAMING_DETECTORS:
+                raise ValueError("Streaming detectors only support univariate performance data.")
+            if not network_manager.telemetry:
+                raise ValueError("Multivariate models need a NetworkManager created with telemetry=True.")
+            fields = len(network_manager.nodes.TELEMETRY_DTYPE.names)
+            self._training_features = np.zeros((max_training_samples, fields), dtype=np.float32)
+            self._training_rows = np.zeros(max_training_samples, dtype=np.int64)
+            self._training_count = 0  # Vectors ever written to the training ring
+            self._scored_readings = None
+        self.report = None
+        self.streaming_detector = None
+        if algorithm in STREAMING_DETECTORS:
+            self.streaming_detector = STREAMING_DETECTORS[algorithm](network_manager.num_nodes,
+                                                                     **(detector_options or {}))
 
     def update_performance_history(self, performance_data):
-        """Update the performance history with the latest data."""
+        """Update the performance history with the latest data.
+
+        Readings returned by the network's own monitoring tick are already in
+        the shared history and are not recorded a second time.
+        """
+        if performance_data is self.network_manager.last_readings:
+            return
+        history = self.network_manager.nodes.history
+        if isinstance(performance_data, np.ndarray):
+            history.append(performance_data['node_id'], performance_data['performance'])
+            return
         for data in performance_data:
-            node_id = data['node_id']
-            self.performance_history[node_id].append(data['performance'])
+            history.append(data['node_id'], data['performance'])
 
     def detect_anomalies(self):
-        """Detect anomalies in the performance data of all nodes."""
-        anomalies = []
-        for node_id, history in self.performance_history.items():
-            if len(history) < 10:  # Need enough data to make predictions
-                continue
-
-            # Prepare data for anomaly detection
-            data = np.array(history).reshape(-1, 1)  # Reshape for sklearn
-            self.train_model(data)
-            predictions = self.model.predict(data)
-
-            # Identify anomalies
-            for i, prediction in enumerate(predictions):
-                if prediction == -1:  # -1 indicates an anomaly
-                    anomalies.append({
-                        "node_id": node_id,
-                        "anomaly_index": i,
-                        "performance": history[i]
-                    })
-                    logging.warning(f"Anomaly detected in Node {node_id} at index {i}: {history[i]:.2f}")
+        """Detect anomalies in the samples that arrived since the last call."""
+        if self.multivariate:
+            rows, ages, values, features = self._new_telemetry()
+        else:
+            rows, ages, values = self._new_samples()
+            features = values.reshape(-1, 1)
+        if self.streaming_detector is not None:
+            is_anomaly = self._score_streaming(ages, rows, values)
+        else:
+            self._maybe_refit()
+            is_anomaly = self._score_with_models(rows, values, features)
+        if values.size == 0:
+            return []
 
+        history = self.network_manager.nodes.history
+        anomaly_rows = rows[is_anomaly]
+        anomaly_index = history.count[anomaly_rows] - 1 - ages[is_anomaly]
+        node_ids = self.network_manager.nodes.node_id[anomaly_rows]
+        anomalies = [
+            {"node_id": node_id, "anomaly_index": index, "performance": performance}
+            for node_id, index, performance in zip(node_ids.tolist(), anomaly_index.tolist(),
+                                                   values[is_anomaly].tolist())
+        ]
+        if self.multivariate:
+            names = self.network_manager.nodes.TELEMETRY_DTYPE.names
+            for anomaly, vector in zip(anomalies, features[is_anomaly].tolist()):
+                anomaly["telemetry"] = dict(zip(names, vector))
+        if anomalies:
+            logging.warning(f"Detected {len(anomalies)} anomalies in {np.unique(node_ids).size} nodes "
+                            f"out of {values.size} new samples.")
         return anomalies
 
+    def _score_with_models(self, rows, values, features):
+        """Score samples with their cohort's model, or the fixed threshold before the first fit."""
+        cohort_of_row = rows % self.cohorts
+        is_anomaly = np.zeros(values.size, dtype=bool)
+        chunks = []
+        for cohort in np.unique(cohort_of_row).tolist():
+            selected = np.flatnonzero(cohort_of_row == cohort)
+            model = self.models.get(cohort)
+            if model is None:
+                is_anomaly[selected] = values[selected] < self.threshold  # Cold start
+            elif cohort in self._model_segments and values.size > self.parallel_chunk_size:
+                pieces = max(1, min(self.n_jobs, selected.size // self.parallel_chunk_size))
+                chunks.extend((cohort, piece) for piece in np.array_split(selected, pieces))
+            else:
+                is_anomaly[selected] = model.predict(features[selected]) == -1  # -1 indicates an anomaly
+        if chunks:
+            tasks = [(cohort, self._model_segments[cohort][0].name, self._model_segments[cohort][1], features[piece])
+                     for cohort, piece in chunks]
+            for (_, piece), flagged in zip(chunks, self._get_pool().map(score_chunk, tasks)):
+                is_anomaly[piece] = flagged
+        return is_anomaly
+
+    def _score_streaming(self, ages, rows, values):
+        """Feed samples to the streaming detector oldest first, so each node sees them in order."""
+        is_anomaly = np.zeros(values.size, dtype=bool)
+        for age in np.unique(ages)[::-1].tolist():
+            selected = ages == age  # Rows are unique within one age
+            is_anomaly[selected] = self.streaming_detector.update(rows[selected], values[selected])
+        return is_anomaly
+
+    def _new_samples(self):
+        """Return ``(rows, ages, values)`` for every sample not scored yet, and mark them scored."""
+        history = self.network_manager.nodes.history
+        new = np.minimum(history.count - self._scored, history.window)
+        rows = np.flatnonzero(new)
+        self._scored[rows] = history.count[rows]
+        if rows.size == 0:
+            return rows, rows, np.empty(0)
+        recent = history.recent(rows, int(new[rows].max()))
+        ages = np.arange(recent.shape[1])
+        fresh = ages < new[rows][:, None]
+        row_index, age = np.nonzero(fresh)
+        return rows[row_index], age, recent[row_index, age]
+
+    def _new_telemetry(self):
+        """Return ``(rows, ages, performance, features)`` for the latest tick if it is not scored yet.
+
+        A random sample of the new vectors also goes into the training ring.
+        """
+        nodes = self.network_manager.nodes
+        readings = self.network_manager.last_readings
+        if readings is None or readings is self._scored_readings:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), \
+                np.empty((0, self._training_features.shape[1]), dtype=np.float32)
+        self._scored_readings = readings
+        rows = np.flatnonzero(readings['telemetry']['latency'] > 0)  # Inactive nodes report all-zero telemetry
+        features = nodes.telemetry_matrix(readings['telemetry'][rows])
+        self._add_training_vectors(rows, features)
+        return rows, np.zeros(rows.size, dtype=np.int64), readings['performance'][rows], features
+
+    def _add_training_vectors(self, rows, features):
+        """Write a random sample of one tick's vectors into the training ring."""
+        capacity = self._training_features.shape[0]
+        per_tick = min(rows.size, max(1, capacity // max(1, self.training_window)))
+        if per_tick == 0:
+            return
+        sample = self.rng.choice(rows.size, size=per_tick, replace=False)
+        slots = (self._training_count + np.arange(per_tick)) % capacity
+        self._training_features[slots] = features[sample]
+        self._training_rows[slots] = rows[sample]
+        self._training_count += per_tick
+
+    def warm_start(self, store, ticks=None):
+        """Restore the last ``ticks`` ticks (default ``training_window``) from a ``TelemetryStore``.
+
+        The stored samples of active nodes are appended to the shared history
+        (and, for multivariate models, the training ring) and marked scored,
+        streaming detectors absorb them, and models are fitted at once, so a
+        restarted detector does not wait for new samples to accumulate.
+        Returns the number of ticks restored.
+        """
+        if store.num_nodes != self.network_manager.num_nodes:
+            raise ValueError(f"Store holds {store.num_nodes} nodes, the network has {self.network_manager.num_nodes}.")
+        nodes = self.network_manager.nodes
+        records = store.tail(ticks or self.training_window)
+        for record in records:
+            rows = np.flatnonzero(record['telemetry']['latency'] > 0)  # Inactive nodes were stored as all-zero
+            performance = record['performance'][rows].astype(np.float64)
+            nodes.history.append(rows, performance)
+            if self.multivariate:
+                self._add_training_vectors(rows, nodes.telemetry_matrix(record['telemetry'][rows]))
+            if self.streaming_detector is not None:
+                self.streaming_detector.update(rows, performance)
+        self._scored = nodes.history.count.copy()
+        if self.streaming_detector is None:
+            training_data = self._training_data()
+            if training_data:
+                self._set_models(self._fit_models(training_data))
+                self.ticks_since_fit = 0
+        logging.info(f"Warm-started anomaly detection from {len(records)} stored ticks.")
+        return len(records)
+
+    def _maybe_refit(self):
+        """Refit the cohort models on schedule, synchronously or in the background."""
+        if self._pending_fit is not None and self._pending_fit.done():
+            self._set_models(self._pending_fit.result() or self.models)
+            self._pending_fit = None
+        self.ticks_since_fit += 1
+        if self.models and self.ticks_since_fit < self.refit_interval:
+            return
+        if self._pending_fit is not None:
+            return
+        training_data = self._training_data()
+        if not training_data:
+            return
+        self.ticks_since_fit = 0
+        if self.background_refit and self.models:
+            if self._refit_executor is None:
+                self._refit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="anomaly-refit")
+            self._pending_fit = self._refit_executor.submit(self._fit_models, training_data)
+        else:
+            self._set_models(self._fit_models(training_data))
+
+    def _training_data(self):
+        """Sample a rolling training set per cohort from the shared history."""
+        if self.multivariate:
+            filled = min(self._training_count, self._training_features.shape[0])
+            cohort_of_row = self._training_rows[:filled] % self.cohorts
+            training_data = {}
+            for cohort in range(self.cohorts):
+                features = self._training_features[:filled][cohort_of_row == cohort]
+                if len(features) >= self.min_training_samples:
+                    training_data[cohort] = features.copy()  # Detached from the ring for background fits
+            return training_data
+        history = self.network_manager.nodes.history
+        rows = np.flatnonzero(history.count > 0)
+        samples_per_row = max(1, min(self.training_window, history.window))
+        max_rows = max(1, self.max_training_samples // samples_per_row)
+        training_data = {}
+        for cohort in range(self.cohorts):
+            cohort_rows = rows[rows % self.cohorts == cohort]
+            if cohort_rows.size > max_rows:
+                cohort_rows = self.rng.choice(cohort_rows, size=max_rows, replace=False)
+            values = history.recent(cohort_rows, samples_per_row).ravel()
+            values = values[~np.isnan(values)]
+            if values.size >= self.min_training_samples:
+                training_data[cohort] = values.reshape(-1, 1)
+        return training_data
+
+    def _fit_models(self, training_data):
+        """Fit one model per cohort, on the process pool when there are several."""
+        if self.n_jobs != 1 and len(training_data) > 1:
+            random_states = self.rng.integers(2**31, size=len(training_data)).tolist()
+            fitted = self._get_pool().map(fit_cohort_model, [self.algorithm] * len(training_data),
+                                          training_data.values(), random_states,
+                                          [self.multivariate] * len(training_data),
+                                          [self.contamination] * len(training_data),
+                                          [self.score_threshold] * len(training_data))
+            models = dict(zip(training_data, fitted))
+        else:
+            models = {cohort: self.train_model(data) for cohort, data in training_data.items()}
+        logging.info(f"Fitted {self.algorithm} models for {len(models)} cohorts.")
+        return models
+
     def train_model(self, data):
         """Train the anomaly detection model based on the selected algorithm."""
-        if self.algorithm == 'isolation_forest':
-            self.model = IsolationForest(contamination=0.1)
-        elif self.algorithm == 'local_outlier_factor':
-            self.model = LocalOutlierFactor(n_neighbors=5)
-        else:
-            raise ValueError("Unsupported algorithm specified.")
-        
-        self.model.fit(data)
+        model = fit_cohort_model(self.algorithm, data, int(self.rng.integers(2**31)), self.multivariate,
+                                 self.contamination, self.score_threshold)
+        self.model = model
+        return model
+
+    def _set_models(self, models):
+        """Install freshly fitted models and publish them to the scoring workers."""
+        self.models = models
+        if self.n_jobs == 1:
+            return
+        segments = {}
+        for cohort, model in models.items():
+            payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+            shm = shared_memory.SharedMemory(create=True, size=len(payload))
+            shm.buf[:len(payload)] = payload
+            segments[cohort] = (shm, len(payload))
+        self._release_segments()
+        self._model_segments = segments
+
+    def _release_segments(self):
+        """Unlink the shared memory of previously published models."""
+        for shm, _ in self._model_segments.values():
+            shm.close()
+            shm.unlink()
+        self._model_segments = {}
+
+    def _get_pool(self):
+        """Start the worker process pool on first use."""
+        if self._pool is None:
+            resource_tracker.ensure_running()  # Workers share it, so segments are only unlinked by close()
+            self._pool = ProcessPoolExecutor(max_workers=self.n_jobs)
+        return self._pool
+
+    def close(self):
+        """Wait for a background refit to finish, then stop the worker pool and free shared memory."""
+        if self._refit_executor is not None:
+            self._refit_executor.shutdown(wait=True)
+            self._refit_executor = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self._release_segments()
 
     def trigger_self_healing(self, anomalies):
-        """Trigger self-healing mechanisms based on detected anomalies."""
-        for anomaly in anomalies:
-            node_id = anomaly['node_id']
-            logging.info(f"Triggering self-healing for Node {node_id} due to detected anomaly.")
-            node = self.network_manager.nodes[node_id]
-            node.simulate_failure()  # Simulate failure to trigger repair
-            self.network_manager.self_healing_mechanism.repair_node(node)
-
-    def visualize_anomalies(self):
-        """Visualize the performance history and detected anomalies."""
-        for node_id, history in self.performance_history.items():
+        """Trigger self-healing mechanisms based on detected anomalies.
+
+        Each anomalous node is failed once and all of them are repaired in a
+        single batch; returns the repair report.
+        """
+        node_ids = np.unique([anomaly['node_id'] for anomaly in anomalies]).astype(np.int64)
+        logging.info(f"Triggering self-healing for {node_ids.size} nodes due to detected anomalies.")
+        self.network_manager.nodes.fail(node_ids)  # Simulate failure to trigger repair
+        return self.network_manager.self_healing_mechanism.repair_many(node_ids)
+
+    def visualize_anomalies(self, output_path=None, json_path=None, top_k=10):
+        """Visualize the performance history with anomalies in one aggregate figure.
+
+        Shows percentile bands over all nodes and the ``top_k`` worst nodes
+        with samples below 0.5 marked. With ``output_path`` (PNG or SVG) the
+        figure is rendered headless, and with ``json_path`` its series are
+        written as compact JSON; otherwise it is shown interactively. Returns
+        the aggregated data.
+        """
+        if self.report is None or self.report.top_k != top_k:
+            self.report = PerformanceReport(self.network_manager.nodes.history, self.network_manager.nodes.node_id,
+                                            top_k=top_k, anomaly_threshold=0.5,  # Example threshold for anomalies
+                                            title='Node Performance with Anomalies')
+        data = self.report.compute()
+        if json_path:
+            self.report.write_json(json_path, data)
+        if output_path:
+            return self.report.render(output_path, data)
+        if not json_path:
             plt.figure(figsize=(10, 5))
-            plt.plot(history, label='Performance', marker='o')
-            anomalies = [i for i, val in enumerate(history) if val < 0.5]  # Example threshold for anomalies
-            plt.scatter(anomalies, [history[i] for i in anomalies], color='red', label='Anomalies', zorder=5)
-            plt.title(f'Node {node_id} Performance with Anomalies')
-            plt.xlabel('Time')
-            plt.ylabel('Performance')
-            plt.legend()
-            plt.grid()
+            self.report.plot(plt.gca(), data)
             plt.show()
+        return data
 
     def __str__(self):
         return "AnomalyDetector for Quantum-Pi Network"
@@ -0,0 +1,322 @@
+import bisect
+import logging
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _format_value(value):
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"') for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+class _ThreadCells:
+    """Per-thread accumulators, summed on collection.
+
+    Each thread updates its own cell without locking; the lock is only taken
+    the first time a thread touches the metric and when cells are read.
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+        self._cells = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = self._local.cell = self._factory()
+            with self._lock:
+                self._cells.append(cell)
+            return cell
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._cells)
+
+class _Metric:
+    """Base class for metrics, with optional label children."""
+
+    metric_type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=(), labels=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._labels = labels or {}
+        self._children = {}
+        self._children_lock = threading.Lock()
+
+    def labels(self, **labels):
+        """Return the child metric for the given label values."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._children_lock:
+                child = self._children.setdefault(key, self._child(dict(zip(self.labelnames, key))))
+        return child
+
+    def _child(self, labels):
+        return type(self)(self.name, self.documentation, labels=labels)
+
+    def collect(self):
+        """Return ``(name, labels, value)`` samples for this metric and its children."""
+        if self.labelnames:
+            return [sample for child in list(self._children.values()) for sample in child._samples()]
+        return self._samples()
+
+    def _samples(self):
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """Monotonically increasing counter with lock-free per-thread increments."""
+
+    metric_type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=(), labels=None):
+        super().__init__(name, documentation, labelnames, labels)
+        self._cells = _ThreadCells(lambda: [0.0])
+
+    def inc(self, amount=1):
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        self._cells.get()[0] += amount
+
+    @property
+    def value(self):
+        return sum(cell[0] for cell in self._cells.snapshot())
+
+    def _samples(self):
+        return [(self.name, self._labels, self.value)]
+
+class Gauge(_Metric):
+    """Value that can go up and down, or be computed by a callback at scrape time."""
+
+    metric_type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), labels=None):
+        super().__init__(name, documentation, labelnames, labels)
+        self._value = 0.0
+        self._function = None
+
+    def set(self, value):
+        self._value = float(value)
+
+    def set_function(self, function):
+        """Compute the value with ``function()`` on every scrape instead of on every update."""
+        self._function = function
+
+    @property
+    def value(self):
+        return float(self._function()) if self._function is not None else self._value
+
+    def _samples(self):
+        return [(self.name, self._labels, self.value)]
+
+class Histogram(_Metric):
+    """Cumulative histogram with lock-free per-thread bucket counts."""
+
+    metric_type = 'histogram'
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, documentation, labelnames=(), labels=None, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames, labels)
+        self.buckets = tuple(sorted(buckets))
+        size = len(self.buckets) + 1  # Last slot counts observations above every bound
+        self._cells = _ThreadCells(lambda: [[0] * size, 0.0])
+
+    def _child(self, labels):
+        return Histogram(self.name, self.documentation, labels=labels, buckets=self.buckets)
+
+    def observe(self, value):
+        cell = self._cells.get()
+        cell[0][bisect.bisect_left(self.buckets, value)] += 1
+        cell[1] += value
+
+    def observe_many(self, values):
+        """Record a batch of observations with one vectorized bucket count."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+        counts = np.bincount(np.searchsorted(self.buckets, values, side='left'), minlength=len(self.buckets) + 1)
+        cell = self._cells.get()
+        cell[0] = [total + int(count) for total, count in zip(cell[0], counts)]
+        cell[1] += float(values.sum())
+
+    def snapshot(self):
+        """Return ``(per-bucket counts, sum)`` merged over all threads."""
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for bucket_counts, bucket_sum in self._cells.snapshot():
+            counts = [a + b for a, b in zip(counts, bucket_counts)]
+            total += bucket_sum
+        return counts, total
+
+    def _samples(self):
+        counts, total = self.snapshot()
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            samples.append((f'{self.name}_bucket', {**self._labels, 'le': _format_value(bound)}, cumulative))
+        samples.append((f'{self.name}_sum', self._labels, total))
+        samples.append((f'{self.name}_count', self._labels, cumulative))
+        return samples
+
+class MetricsRegistry:
+    """In-process metrics registry with Prometheus text exposition.
+
+    Metrics are exposed over HTTP at ``/metrics`` with ``serve`` or written
+    for the node exporter's textfile collector with ``write_textfile``.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=Histogram.DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def get(self, name):
+        return self._metrics[name]
+
+    def exposition(self):
+        """Render all metrics in the Prometheus text format."""
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.metric_type}')
+            for name, labels, value in metric.collect():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """Atomically write the exposition to ``path`` for a textfile collector."""
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as file:
+            file.write(self.exposition())
+        os.replace(temporary, path)
+
+    def serve(self, port=8000, host='127.0.0.1'):
+        """Serve ``/metrics`` from a daemon thread; returns the running server (port 0 picks a free one)."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.exposition().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logging.debug(f"Metrics scrape: {format % args}")
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+        logging.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+class NetworkMetrics:
+    """Standard metrics for a ``NetworkManager`` and the components attached to it.
+
+    Failures and repairs are counted from the node table's state transitions
+    and the node gauges are computed at scrape time, so neither touches the
+    monitoring hot path. Monitoring ticks, event-driven repairs, injected
+    failures and performance analyses report through ``network_manager.metrics``.
+    """
+
+    def __init__(self, network_manager, registry=None, prefix='quantum_pi'):
+        self.network_manager = network_manager
+        self.registry = registry or MetricsRegistry()
+        nodes = network_manager.nodes
+        self.failures = self.registry.counter(f'{prefix}_node_failures_total', 'Node transitions to inactive.')
+        self.repairs = self.registry.counter(f'{prefix}_node_repairs_total', 'Node transitions to active.')
+        self.injected_failures = self.registry.counter(f'{prefix}_injected_failures_total',
+                                                       'Failures injected by the failure simulation.', ('type',))
+        self.nodes_total = self.registry.gauge(f'{prefix}_nodes', 'Nodes in the network.')
+        self.nodes_total.set_function(lambda: nodes.num_nodes)
+        self.active_nodes = self.registry.gauge(f'{prefix}_active_nodes', 'Currently active nodes.')
+        self.active_nodes.set_function(lambda: nodes.num_active)
+        self.mean_performance = self.registry.gauge(f'{prefix}_mean_performance', 'Mean performance of active nodes.')
+        self.mean_performance.set_function(self._mean_performance)
+        self.performance_stddev = self.registry.gauge(f'{prefix}_performance_stddev',
+                                                      'Performance standard deviation at the last analysis.')
+        self.tick_duration = self.registry.histogram(f'{prefix}_monitor_tick_duration_seconds',
+                                                     'Duration of monitoring ticks.')
+        self.repair_latency = self.registry.histogram(
+            f'{prefix}_repair_latency_seconds', 'Time from node failure to repair by the healing engine.',
+            buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0))
+        nodes.subscribe(self._on_state_change)
+        network_manager.metrics = self
+
+    def _on_state_change(self, rows, is_active):
+        (self.repairs if is_active else self.failures).inc(len(rows))
+
+    def _mean_performance(self):
+        nodes = self.network_manager.nodes
+        active = nodes.active_indices()
+        return float(nodes.performance[active].mean()) if active.size else 0.0
+
+    def close(self):
+        """Stop counting transitions and detach from the network manager."""
+        self.network_manager.nodes.unsubscribe(self._on_state_change)
+        if self.network_manager.metrics is self:
+            self.network_manager.metrics = None
+
+    def __str__(self):
+        return f"NetworkMetrics for {self.network_manager.num_nodes} nodes."
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    import urllib.request
+    from network.network_manager import NetworkManager
+
+    logging.basicConfig(level=logging.INFO)
+    network_manager = NetworkManager(num_nodes=1000, seed=0)
+    network_manager.initialize_network()
+    metrics = NetworkMetrics(network_manager)
+    server = metrics.registry.serve(port=0)
+    network_manager.self_healing_mechanism.start()
+    for _ in range(5):
+        network_manager.monitor_network()
+        network_manager.simulate_node_failure(network_manager.rng.integers(0, 1000, size=10))
+        time.sleep(0.2)
+    network_manager.self_healing_mechanism.stop()
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+        print(response.read().decode())
+    server.shutdown()
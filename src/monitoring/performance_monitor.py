@@ -1,42 +1,61 @@
 import logging
 import numpy as np
 import matplotlib.pyplot as plt
-from collections import deque
+from network.performance_history import HistoryViews
+from monitoring.reporting import PerformanceReport
 
 class PerformanceMonitor:
-    """Monitors the performance of nodes in the Quantum-Pi Network."""
+    """Monitors the performance of nodes in the Quantum-Pi Network.
 
-    def __init__(self, network_manager, history_size=10):
+    ``performance_history`` maps node IDs to read-only views of the last
+    ``history_size`` samples in the network's shared history buffer. With a
+    ``telemetry_store`` (see ``monitoring.telemetry_store``), every collected
+    tick is also appended to it, asynchronously, to persist across restarts.
+    """
+
+    def __init__(self, network_manager, history_size=10, telemetry_store=None):
         self.network_manager = network_manager
         self.history_size = history_size
-        self.performance_history = {node.node_id: deque(maxlen=history_size) for node in network_manager.nodes}
-
-    def collect_performance_data(self):
-        """Collect performance data from all nodes."""
-        performance_data = []
-        for node in self.network_manager.nodes:
-            if node.is_active:
-                performance = node.monitor_performance()
-                self.performance_history[node.node_id].append(performance)
-                performance_data.append({
-                    "node_id": node.node_id,
-                    "performance": performance
-                })
-            else:
-                performance_data.append({
-                    "node_id": node.node_id,
-                    "performance": 0.0  # Inactive nodes have no performance
-                })
-        logging.info(f"Collected performance data: {performance_data}")
+        self.telemetry_store = telemetry_store
+        self.performance_history = HistoryViews(network_manager.nodes.history, limit=history_size)
+        self.report = None
+
+    def collect_performance_data(self, rng=None):
+        """Collect performance data from all nodes.
+
+        Runs one vectorized monitoring tick and returns a structured array
+        with ``node_id`` and ``performance`` fields, zero for inactive nodes.
+        Only when the ``NetworkManager`` was created with ``telemetry=True``
+        does it also carry float32 ``telemetry`` (latency, queue depth, error
+        rate, throughput) fields, which a ``telemetry_store`` requires.
+        Performance samples of active nodes are recorded in the shared
+        history by the tick.
+        """
+        performance_data = self.network_manager.monitor_network_vectorized(rng)
+        if self.telemetry_store is not None:
+            self.telemetry_store.append(performance_data)
+        logging.info(f"Collected performance data for {len(performance_data)} nodes.")
         return performance_data
 
     def analyze_performance(self, performance_data):
         """Analyze the collected performance data."""
-        performances = [data['performance'] for data in performance_data]
+        if isinstance(performance_data, np.ndarray):
+            performances = performance_data['performance']
+        else:
+            performances = [data['performance'] for data in performance_data]
         mean_performance = np.mean(performances)
         std_dev_performance = np.std(performances)
 
         logging.info(f"Performance Analysis: Mean = {mean_performance:.2f}, Std Dev = {std_dev_performance:.2f}")
+        if self.network_manager.metrics is not None:
+            self.network_manager.metrics.performance_stddev.set(std_dev_performance)
+        mean_telemetry = None
+        if isinstance(performance_data, np.ndarray) and 'telemetry' in performance_data.dtype.names:
+            telemetry = performance_data['telemetry'][performance_data['telemetry']['latency'] > 0]  # Active nodes
+            if telemetry.size:
+                mean_telemetry = {name: float(telemetry[name].mean()) for name in telemetry.dtype.names}
+                logging.info("Telemetry Analysis: " + ", ".join(f"{name} = {value:.3f}"
+                                                                for name, value in mean_telemetry.items()))
 
         # Thresholds for alerts
         if std_dev_performance > 0.1:
@@ -47,30 +66,45 @@ class PerformanceMonitor:
 
         return {
             "mean_performance": mean_performance,
-            "std_dev_performance": std_dev_performance
+            "std_dev_performance": std_dev_performance,
+            "mean_telemetry": mean_telemetry
         }
 
     def trigger_self_healing(self, performance_data):
-        """Trigger self-healing mechanisms based on performance metrics."""
-        for data in performance_data:
-            if data['performance'] < 0.5:  # Threshold for triggering self-healing
-                node_id = data['node_id']
-                logging.info(f"Triggering self-healing for Node {node_id} due to low performance.")
-                node = self.network_manager.nodes[node_id]
-                node.simulate_failure()  # Simulate failure to trigger repair
-                self.network_manager.self_healing_mechanism.repair_node(node)
-
-    def visualize_performance(self):
-        """Visualize the performance history of all nodes."""
-        plt.figure(figsize=(10, 5))
-        for node_id, history in self.performance_history.items():
-            plt.plot(history, label=f'Node {node_id}')
-        plt.title('Node Performance History')
-        plt.xlabel('Time')
-        plt.ylabel('Performance')
-        plt.legend()
-        plt.grid()
-        plt.show()
+        """Trigger self-healing mechanisms based on performance metrics.
+
+        All low-performance nodes are failed and repaired in a single batch;
+        returns the repair report.
+        """
+        # Threshold for triggering self-healing is 0.5
+        if isinstance(performance_data, np.ndarray):
+            node_ids = performance_data['node_id'][performance_data['performance'] < 0.5]
+        else:
+            node_ids = np.array([data['node_id'] for data in performance_data if data['performance'] < 0.5], dtype=np.int64)
+        logging.info(f"Triggering self-healing for {node_ids.size} nodes due to low performance.")
+        self.network_manager.nodes.fail(node_ids)  # Simulate failure to trigger repair
+        return self.network_manager.self_healing_mechanism.repair_many(node_ids)
+
+    def visualize_performance(self, output_path=None, json_path=None, top_k=10):
+        """Visualize the performance history as percentile bands and the ``top_k`` worst nodes.
+
+        With ``output_path`` (PNG or SVG) the report is rendered headless, and
+        with ``json_path`` its series are written as compact JSON; otherwise
+        it is shown interactively. Returns the aggregated data.
+        """
+        if self.report is None or self.report.top_k != top_k:
+            self.report = PerformanceReport(self.network_manager.nodes.history, self.network_manager.nodes.node_id,
+                                            top_k=top_k, window=self.history_size, title='Node Performance History')
+        data = self.report.compute()
+        if json_path:
+            self.report.write_json(json_path, data)
+        if output_path:
+            return self.report.render(output_path, data)
+        if not json_path:
+            plt.figure(figsize=(10, 5))
+            self.report.plot(plt.gca(), data)
+            plt.show()
+        return data
 
     def __str__(self):
         return "PerformanceMonitor for Quantum-Pi Network"
@@ -0,0 +1,206 @@
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+import numpy as np
+
+class StackSampler:
+    """Samples the call stack of one thread at a fixed interval.
+
+    Samples are aggregated as collapsed stacks (``outer;inner;leaf count``
+    lines), the input format of flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id=None, interval=0.001):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def write_folded(self, path):
+        """Write the collapsed stacks to ``path``."""
+        with open(path, 'w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+class TickProfiler:
+    """Per-stage instrumentation for a periodic monitoring loop.
+
+    Wrap each loop iteration in ``tick()`` and each stage in ``stage(name)``.
+    Every stage records wall time, CPU time and, with ``track_allocations``,
+    the net and peak memory allocated according to tracemalloc. The last
+    ``window`` samples per stage feed a rolling p50/p95/p99 summary.
+
+    With ``profile_every`` set, every N-th tick is captured in full with
+    cProfile (or pyinstrument, with ``profiler='pyinstrument'``) and written
+    to ``profile_dir``; ``flamegraph`` additionally samples that tick's stack
+    into collapsed ``.folded`` files for flamegraph tools.
+    """
+
+    def __init__(self, window=1000, track_allocations=False, profile_every=0, profiler='cprofile',
+                 profile_dir='profiles', flamegraph=False, sample_interval=0.001):
+        self.window = window
+        self.track_allocations = track_allocations
+        self.profile_every = profile_every
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.flamegraph = flamegraph
+        self.sample_interval = sample_interval
+        self.ticks = 0
+        self.samples = defaultdict(lambda: {key: deque(maxlen=window) for key in ('wall', 'cpu', 'alloc', 'peak')})
+        self.profiles = []  # Paths of dumped profiles
+        self._started_tracemalloc = track_allocations and not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, peak=True):
+        """Measure one stage of the current tick.
+
+        Peak allocation tracking resets tracemalloc's peak, so it is skipped
+        (``peak=False``) for measurements that enclose other stages.
+        """
+        if self.track_allocations:
+            if peak:
+                tracemalloc.reset_peak()
+            allocated = tracemalloc.get_traced_memory()[0]
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            samples = self.samples[name]
+            samples['wall'].append(time.perf_counter() - wall)
+            samples['cpu'].append(time.thread_time() - cpu)
+            if self.track_allocations:
+                current = tracemalloc.get_traced_memory()[0]
+                samples['alloc'].append(current - allocated)
+                if peak:
+                    samples['peak'].append(tracemalloc.get_traced_memory()[1] - allocated)
+
+    @contextmanager
+    def tick(self):
+        """Measure one loop iteration, capturing a full profile every ``profile_every`` ticks."""
+        self.ticks += 1
+        capture = self.profile_every and self.ticks % self.profile_every == 0
+        profiler = sampler = None
+        if capture:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler = self._start_profiler()
+            if self.flamegraph:
+                sampler = StackSampler(interval=self.sample_interval)
+                sampler.start()
+        try:
+            with self.stage('tick', peak=False):
+                yield
+        finally:
+            if capture:
+                self._dump(profiler, sampler)
+
+    def _start_profiler(self):
+        if self.profiler == 'pyinstrument':
+            from pyinstrument import Profiler
+            profiler = Profiler(interval=self.sample_interval)
+        elif self.profiler == 'cprofile':
+            profiler = cProfile.Profile()
+        else:
+            raise ValueError("Unsupported profiler specified.")
+        if isinstance(profiler, cProfile.Profile):
+            profiler.enable()
+        else:
+            profiler.start()
+        return profiler
+
+    def _dump(self, profiler, sampler):
+        base = os.path.join(self.profile_dir, f"tick-{self.ticks:06d}")
+        if sampler is not None:
+            sampler.stop()
+            sampler.write_folded(f"{base}.folded")
+            self.profiles.append(f"{base}.folded")
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            profiler.dump_stats(f"{base}.prof")  # Readable by pstats, snakeviz and flameprof
+            self.profiles.append(f"{base}.prof")
+        else:
+            profiler.stop()
+            with open(f"{base}.html", 'w') as file:
+                file.write(profiler.output_html())
+            self.profiles.append(f"{base}.html")
+        logging.info(f"Captured profile of tick {self.ticks} to {base}.*")
+
+    def summary(self):
+        """Return ``{stage: {metric: {'p50', 'p95', 'p99'}}}`` over the rolling window.
+
+        Times are in seconds and allocations in bytes.
+        """
+        report = {}
+        for name, samples in self.samples.items():
+            report[name] = {}
+            for metric, values in samples.items():
+                if values:
+                    p50, p95, p99 = np.percentile(np.fromiter(values, dtype=np.float64), [50, 95, 99])
+                    report[name][metric] = {'p50': p50, 'p95': p95, 'p99': p99}
+        return report
+
+    def format_summary(self):
+        """Return the rolling summary as a fixed-width text table."""
+        lines = [f"{'stage':<12}{'wall p50/p95/p99 (ms)':>28}{'cpu p50/p95/p99 (ms)':>28}"
+                 + (f"{'peak alloc p95 (KiB)':>24}" if self.track_allocations else '')]
+        for name, metrics in self.summary().items():
+            wall = '/'.join(f"{metrics['wall'][p] * 1000:.2f}" for p in ('p50', 'p95', 'p99'))
+            cpu = '/'.join(f"{metrics['cpu'][p] * 1000:.2f}" for p in ('p50', 'p95', 'p99'))
+            line = f"{name:<12}{wall:>28}{cpu:>28}"
+            if self.track_allocations and 'peak' in metrics:
+                line += f"{metrics['peak']['p95'] / 1024:>24.1f}"
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def close(self):
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __str__(self):
+        return f"TickProfiler after {self.ticks} ticks over {len(self.samples)} stages."
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    profiler = TickProfiler(track_allocations=True, profile_every=50, flamegraph=True)
+    for _ in range(100):
+        with profiler.tick():
+            with profiler.stage('compute'):
+                np.sort(np.random.random(100000))
+            with profiler.stage('sleep'):
+                time.sleep(0.001)
+    print(profiler.format_summary())
+    profiler.close()
@@ -0,0 +1,203 @@
+import json
+import logging
+import warnings
+import numpy as np
+import matplotlib.image as mpimg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+class PerformanceReport:
+    """Aggregate, headless view of the performance history of a whole network.
+
+    Instead of one line per node, the report shows percentile bands over a
+    random sample of at most ``max_nodes`` nodes and the ``top_k`` nodes with
+    the lowest windowed mean (picked from the O(1) running stats of every
+    node), each downsampled to at most ``max_points`` points over the last
+    ``window`` samples. Samples below ``anomaly_threshold`` are marked on
+    the worst nodes. The cost of a report is bounded by these limits, not by
+    the number of nodes.
+
+    ``render`` draws on an Agg canvas without pyplot. For PNG output the axes
+    and labels are drawn once and cached, and later renders only redraw the
+    data artists on top of the cached background (blitting). SVG output is
+    always drawn in full. ``write_json`` exports the same series as compact
+    JSON for external dashboards.
+    """
+
+    PERCENTILES = (5, 25, 50, 75, 95)
+
+    def __init__(self, history, node_ids=None, top_k=10, window=None, max_nodes=10000, max_points=200,
+                 anomaly_threshold=0.5, title='Node Performance', seed=None):
+        self.history = history
+        self.node_ids = np.arange(history.num_nodes) if node_ids is None else node_ids
+        self.top_k = top_k
+        self.window = min(window or history.window, history.window)
+        self.max_nodes = max_nodes
+        self.max_points = max_points
+        self.anomaly_threshold = anomaly_threshold
+        self.title = title
+        self.rng = np.random.default_rng(seed)
+        self._canvas = None
+        self._background = None
+        self._artists = None
+
+    def compute(self):
+        """Return the aggregated series as a dict of arrays, oldest sample first."""
+        rows = np.flatnonzero(self.history.count > 0)
+        sampled = rows if rows.size <= self.max_nodes else self.rng.choice(rows, size=self.max_nodes, replace=False)
+        recent = self.history.recent(sampled, self.window)[:, ::-1]  # Oldest first
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # Ages no sampled node has reached yet
+            bands = np.nanpercentile(recent, self.PERCENTILES, axis=0) if sampled.size else \
+                np.full((len(self.PERCENTILES), self.window), np.nan)
+            below = np.nanmean(recent < self.anomaly_threshold, axis=0) if sampled.size else np.full(self.window, np.nan)
+
+        k = min(self.top_k, rows.size)
+        means = self.history.mean(rows)
+        lowest = np.argpartition(means, k - 1)[:k] if 0 < k < rows.size else np.arange(k)
+        worst = rows[lowest[np.argsort(means[lowest])]]
+        return {
+            "samples_ago": self._downsample(np.arange(-self.window + 1, 1, dtype=np.float64)),
+            "bands": self._downsample(bands),
+            "below_threshold": self._downsample(below),
+            "worst_node_ids": self.node_ids[worst],
+            "worst": self._downsample(self.history.recent(worst, self.window)[:, ::-1]),
+            "num_nodes": rows.size,
+            "sampled_nodes": sampled.size,
+        }
+
+    def _downsample(self, values):
+        """Average consecutive samples along the last axis down to at most ``max_points``."""
+        factor = -(-values.shape[-1] // self.max_points)
+        if factor <= 1:
+            return values
+        pad = -values.shape[-1] % factor
+        padded = np.concatenate([np.full(values.shape[:-1] + (pad,), np.nan), values], axis=-1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return np.nanmean(padded.reshape(values.shape[:-1] + (-1, factor)), axis=-1)
+
+    def plot(self, ax, data=None):
+        """Draw the report on a Matplotlib axes (e.g. one created with pyplot for interactive use)."""
+        artists = self._create_artists(ax)
+        self._update_artists(artists, data or self.compute())
+        ax.legend(loc='lower left', fontsize='small')
+        return artists
+
+    def _setup_axes(self, ax):
+        ax.set_xlim(-self.window + 1, 0)
+        ax.set_ylim(0.0, 1.05)
+        ax.set_xlabel('Samples ago')
+        ax.set_ylabel('Performance')
+        ax.grid(True)
+
+    def _create_artists(self, ax, animated=False):
+        self._setup_axes(ax)
+        empty = np.empty((0, 2))
+        artists = {
+            "outer": ax.fill_between([], [], [], color='tab:blue', alpha=0.15, label='p5-p95', animated=animated),
+            "inner": ax.fill_between([], [], [], color='tab:blue', alpha=0.3, label='p25-p75', animated=animated),
+            "median": ax.plot([], [], color='tab:blue', label='median', animated=animated)[0],
+            "worst": [ax.plot([], [], linewidth=1, animated=animated)[0] for _ in range(self.top_k)],
+            "anomalies": ax.plot([], [], linestyle='none', marker='o', color='red', markersize=4,
+                                 label='anomalies', animated=animated)[0],
+            "title": ax.set_title(self.title, animated=animated),
+        }
+        artists["outer"].set_verts([empty])
+        artists["inner"].set_verts([empty])
+        return artists
+
+    def _update_artists(self, artists, data):
+        x = data["samples_ago"]
+        bands = data["bands"]
+        for name, low, high in (("outer", bands[0], bands[-1]), ("inner", bands[1], bands[-2])):
+            valid = np.isfinite(low) & np.isfinite(high)
+            artists[name].set_verts([np.concatenate([np.column_stack([x[valid], low[valid]]),
+                                                     np.column_stack([x[valid], high[valid]])[::-1]])])
+        artists["median"].set_data(x, bands[len(bands) // 2])
+
+        anomaly_x, anomaly_y = [], []
+        for line, node_id, values in zip(artists["worst"], data["worst_node_ids"].tolist(), data["worst"]):
+            line.set_data(x, values)
+            line.set_label(f'Node {node_id}')
+            flagged = values < self.anomaly_threshold
+            anomaly_x.append(x[flagged])
+            anomaly_y.append(values[flagged])
+        for line in artists["worst"][len(data["worst"]):]:
+            line.set_data([], [])
+            line.set_label('_unused')
+        artists["anomalies"].set_data(np.concatenate(anomaly_x or [[]]), np.concatenate(anomaly_y or [[]]))
+        artists["title"].set_text(f'{self.title}: {data["num_nodes"]} nodes '
+                                  f'({data["sampled_nodes"]} sampled), {len(data["worst"])} worst shown')
+
+    def render(self, path, data=None, figsize=(10, 5), dpi=100):
+        """Render the report to a PNG or SVG file (by suffix) and return the aggregated data."""
+        data = data or self.compute()
+        if str(path).lower().endswith('.svg'):
+            figure = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(figure)
+            self.plot(figure.add_subplot(), data)
+            figure.savefig(path, format='svg')
+            return data
+
+        if self._canvas is None:
+            figure = Figure(figsize=figsize, dpi=dpi)
+            self._canvas = FigureCanvasAgg(figure)
+            ax = figure.add_subplot()
+            self._artists = self._create_artists(ax, animated=True)
+            self._canvas.draw()  # Animated artists are left out of the cached background
+            self._background = self._canvas.copy_from_bbox(figure.bbox)
+        ax = self._artists["median"].axes
+        self._canvas.restore_region(self._background)
+        self._update_artists(self._artists, data)
+        legend = ax.legend(loc='lower left', fontsize='small')
+        legend.set_animated(True)
+        for artist in (self._artists["outer"], self._artists["inner"], self._artists["median"],
+                       *self._artists["worst"], self._artists["anomalies"], self._artists["title"], legend):
+            ax.draw_artist(artist)
+        mpimg.imsave(path, np.asarray(self._canvas.buffer_rgba()), format='png')
+        return data
+
+    def to_dict(self, data=None, decimals=4):
+        """Return the aggregated series as JSON-ready lists, rounded to ``decimals``."""
+        data = data or self.compute()
+
+        def series(values):
+            return [None if np.isnan(value) else value for value in np.round(values, decimals).tolist()]
+
+        return {
+            "num_nodes": int(data["num_nodes"]),
+            "sampled_nodes": int(data["sampled_nodes"]),
+            "samples_ago": data["samples_ago"].round(2).tolist(),
+            "percentiles": {f"p{p}": series(band) for p, band in zip(self.PERCENTILES, data["bands"])},
+            "below_threshold": series(data["below_threshold"]),
+            "worst": {str(node_id): series(values) for node_id, values in zip(data["worst_node_ids"].tolist(),
+                                                                               data["worst"])},
+        }
+
+    def write_json(self, path, data=None):
+        """Write the aggregated series as compact JSON and return the written dict."""
+        report = self.to_dict(data)
+        with open(path, 'w') as file:
+            json.dump(report, file, separators=(',', ':'))
+        return report
+
+    def __str__(self):
+        return f"PerformanceReport over {self.history.num_nodes} nodes, top {self.top_k}, window {self.window}."
+
+# Example usage
+if __name__ == "__main__":
+    import time
+    from network.performance_history import PerformanceHistory
+
+    logging.basicConfig(level=logging.INFO)
+    history = PerformanceHistory(num_nodes=1_000_000, window=100)
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        history.append(np.arange(history.num_nodes), rng.beta(8, 2, size=history.num_nodes))
+    report = PerformanceReport(history, top_k=5, seed=0)
+    for path in ("report.png", "report.png", "report.svg"):
+        start = time.perf_counter()
+        report.render(path)
+        logging.info(f"Rendered {path} in {time.perf_counter() - start:.2f}s.")
+    report.write_json("report.json")
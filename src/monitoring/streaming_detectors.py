@@ -0,0 +1,153 @@
+import logging
+import numpy as np
+
+class StreamingDetector:
+    """Base class for online anomaly detectors with constant-size state per node.
+
+    State lives in NumPy arrays indexed by table row, and ``update`` scores
+    and absorbs one sample for each of a batch of (unique) rows in O(1) per
+    sample, so a sample is flagged on the tick it arrives.
+    """
+
+    def __init__(self, num_nodes):
+        self.num_nodes = num_nodes
+        self.samples = np.zeros(num_nodes, dtype=np.int64)
+
+    def update(self, rows, values):
+        """Score ``values`` for ``rows``, update the state and return an anomaly mask."""
+        raise NotImplementedError
+
+    @property
+    def nbytes(self):
+        """Memory used by the per-node state, in bytes."""
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+    def __str__(self):
+        return f"{type(self).__name__} for {self.num_nodes} nodes ({self.nbytes / 1e6:.1f} MB)."
+
+class EWMADetector(StreamingDetector):
+    """Flags samples more than ``z_threshold`` exponentially weighted standard deviations from the EWMA."""
+
+    def __init__(self, num_nodes, alpha=0.1, z_threshold=3.0, warmup=5, min_std=0.01):
+        super().__init__(num_nodes)
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.min_std = min_std
+        self.mean = np.zeros(num_nodes)
+        self.var = np.zeros(num_nodes)
+
+    def update(self, rows, values):
+        first = self.samples[rows] == 0
+        mean = np.where(first, values, self.mean[rows])
+        var = self.var[rows]
+        diff = values - mean
+        z = np.abs(diff) / np.maximum(np.sqrt(var), self.min_std)
+        anomalies = (self.samples[rows] >= self.warmup) & (z > self.z_threshold)
+
+        increment = self.alpha * diff
+        self.mean[rows] = mean + increment
+        self.var[rows] = (1 - self.alpha) * (var + diff * increment)
+        self.samples[rows] += 1
+        return anomalies
+
+class CUSUMDetector(StreamingDetector):
+    """Two-sided CUSUM on deviations from an EWMA baseline, in units of its standard deviation.
+
+    A node alarms when either cumulative sum exceeds ``h``; ``k`` is the
+    slack subtracted per sample. Sums reset after an alarm.
+    """
+
+    def __init__(self, num_nodes, alpha=0.05, k=0.5, h=5.0, warmup=5, min_std=0.01):
+        super().__init__(num_nodes)
+        self.alpha = alpha
+        self.k = k
+        self.h = h
+        self.warmup = warmup
+        self.min_std = min_std
+        self.mean = np.zeros(num_nodes)
+        self.var = np.zeros(num_nodes)
+        self.upper = np.zeros(num_nodes)
+        self.lower = np.zeros(num_nodes)
+
+    def update(self, rows, values):
+        first = self.samples[rows] == 0
+        mean = np.where(first, values, self.mean[rows])
+        var = self.var[rows]
+        diff = values - mean
+        z = diff / np.maximum(np.sqrt(var), self.min_std)
+        warm = self.samples[rows] >= self.warmup
+        upper = np.where(warm, np.maximum(0.0, self.upper[rows] + z - self.k), 0.0)
+        lower = np.where(warm, np.maximum(0.0, self.lower[rows] - z - self.k), 0.0)
+        anomalies = (upper > self.h) | (lower > self.h)
+        self.upper[rows] = np.where(anomalies, 0.0, upper)
+        self.lower[rows] = np.where(anomalies, 0.0, lower)
+
+        increment = self.alpha * diff
+        self.mean[rows] = mean + increment
+        self.var[rows] = (1 - self.alpha) * (var + diff * increment)
+        self.samples[rows] += 1
+        return anomalies
+
+class HalfSpaceTreesDetector(StreamingDetector):
+    """Streaming Half-Space Trees over one-dimensional performance samples.
+
+    For a single feature, a half-space tree with midpoint splits over a
+    randomly perturbed workspace reduces to an equal-width histogram with a
+    random offset, so each of the ``n_trees`` trees is kept as ``2 ** depth``
+    leaf counters per node. Counts from the last complete window of
+    ``window`` samples form the reference profile; a sample whose average
+    reference mass across trees is below ``min_mass`` is anomalous.
+    """
+
+    def __init__(self, num_nodes, n_trees=4, depth=4, window=50, min_mass=0.02, seed=None):
+        super().__init__(num_nodes)
+        self.n_trees = n_trees
+        self.leaves = 2 ** depth
+        self.window = window
+        self.min_mass = min_mass
+        rng = np.random.default_rng(seed)
+        offset = rng.uniform(0.0, 1.0, size=n_trees)
+        half_width = 2 * np.maximum(offset, 1.0 - offset)
+        self.low = offset - half_width
+        self.width = 2 * half_width
+        self.reference = np.zeros((num_nodes, n_trees, self.leaves), dtype=np.uint16)
+        self.latest = np.zeros((num_nodes, n_trees, self.leaves), dtype=np.uint16)
+        self.has_reference = np.zeros(num_nodes, dtype=bool)
+
+    def update(self, rows, values):
+        leaves = ((values[:, None] - self.low) / self.width * self.leaves).astype(np.int64)
+        leaves = np.clip(leaves, 0, self.leaves - 1)
+        trees = np.arange(self.n_trees)
+        mass = self.reference[rows[:, None], trees, leaves].mean(axis=1) / self.window
+        anomalies = self.has_reference[rows] & (mass < self.min_mass)
+
+        self.latest[rows[:, None], trees, leaves] += 1
+        self.samples[rows] += 1
+        done = rows[self.samples[rows] % self.window == 0]
+        if done.size:
+            self.reference[done] = self.latest[done]
+            self.latest[done] = 0
+            self.has_reference[done] = True
+        return anomalies
+
+STREAMING_DETECTORS = {
+    'ewma': EWMADetector,
+    'cusum': CUSUMDetector,
+    'hst': HalfSpaceTreesDetector,
+}
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rng = np.random.default_rng(0)
+    rows = np.arange(100000)
+    for name, detector_class in STREAMING_DETECTORS.items():
+        detector = detector_class(rows.size)
+        for tick in range(200):
+            values = rng.normal(0.8, 0.02, size=rows.size)
+            if tick == 150:
+                values[:10] = 0.1  # Injected outage
+            flagged = detector.update(rows, values)
+            if tick == 150:
+                logging.info(f"{name}: flagged {flagged[:10].sum()}/10 injected and {flagged[10:].sum()} others.")
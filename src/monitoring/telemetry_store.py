@@ -0,0 +1,281 @@
+import glob
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from network.node_table import NodeTable
+
+MAGIC = b'QPTS'
+VERSION = 1
+HEADER_SIZE = 64
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u4'),
+    ('num_nodes', '<i8'),
+    ('first_tick', '<i8'),
+    ('resolution', '<i8'),  # Monitoring ticks per record; above 1 for compacted segments
+    ('record_size', '<i8'),
+])
+
+class TelemetryStore:
+    """Persistent, append-only store of monitoring ticks.
+
+    Every tick is one fixed-width record: its tick number, a timestamp, the
+    float32 performance of every node and its ``NodeTable.TELEMETRY_DTYPE``
+    telemetry. Records go to segment files of ``segment_ticks`` records each,
+    named after their first tick, in ``directory``; a full segment is closed
+    and a new one started. With ``max_segments`` set, the oldest segments are
+    deleted on rotation.
+
+    Reads memory-map the segments, so records within one segment come back
+    as zero-copy NumPy views. Appends are written by a single background
+    thread with ``async_writes``, with at most ``max_pending`` ticks queued;
+    reads wait for pending appends first. A store reopened on the same
+    directory continues after its last complete record, so restarted
+    monitors and detectors can warm up from it (see
+    ``AnomalyDetector.warm_start``).
+
+    ``compact`` averages old segments down to one record per ``factor``
+    ticks and merges them into a single segment.
+    """
+
+    def __init__(self, directory, num_nodes, segment_ticks=1000, max_segments=None, async_writes=True, max_pending=16):
+        self.directory = directory
+        self.num_nodes = num_nodes
+        self.segment_ticks = segment_ticks
+        self.max_segments = max_segments
+        self.record_dtype = np.dtype([
+            ('tick', '<i8'),
+            ('timestamp', '<f8'),
+            ('performance', '<f4', (num_nodes,)),
+            ('telemetry', NodeTable.TELEMETRY_DTYPE, (num_nodes,)),
+        ])
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telemetry-writer") if async_writes else None
+        self._pending = deque()
+        self._maps = {}  # Path of a closed segment -> its memory map
+        self._file = None
+        self._records = 0  # Records in the open segment
+        os.makedirs(directory, exist_ok=True)
+        self.next_tick = self._recover()
+
+    def _segment_path(self, first_tick):
+        return os.path.join(self.directory, f"segment-{first_tick:012d}.bin")
+
+    def segments(self):
+        """Paths of all segment files, oldest first."""
+        return sorted(glob.glob(os.path.join(self.directory, "segment-*.bin")))
+
+    def _read_header(self, path):
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if header.size == 0 or header['magic'][0] != MAGIC:
+            raise ValueError(f"{path} is not a telemetry segment.")
+        if header['num_nodes'][0] != self.num_nodes or header['record_size'][0] != self.record_dtype.itemsize:
+            raise ValueError(f"{path} was written for {header['num_nodes'][0]} nodes, not {self.num_nodes}.")
+        return header[0]
+
+    def _record_count(self, path):
+        return (os.path.getsize(path) - HEADER_SIZE) // self.record_dtype.itemsize
+
+    def _recover(self):
+        """Reopen the last segment for appending, dropping a torn trailing record; return the next tick."""
+        segments = self.segments()
+        if not segments:
+            return 0
+        path = segments[-1]
+        header = self._read_header(path)
+        records = self._record_count(path)
+        os.truncate(path, HEADER_SIZE + records * self.record_dtype.itemsize)
+        if records == 0:
+            return int(header['first_tick'])
+        last = self._map(path, records)[-1]
+        self._maps.pop(path, None)
+        next_tick = int(last['tick']) + int(header['resolution'])
+        if header['resolution'] == 1 and records < self.segment_ticks:
+            self._file = open(path, 'ab')
+            self._records = records
+        logging.info(f"Recovered telemetry store in {self.directory} at tick {next_tick}.")
+        return next_tick
+
+    def _open_segment(self, first_tick, resolution=1, path=None):
+        """Create a segment file with its header and return it open for appending."""
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['num_nodes'] = self.num_nodes
+        header['first_tick'] = first_tick
+        header['resolution'] = resolution
+        header['record_size'] = self.record_dtype.itemsize
+        file = open(path or self._segment_path(first_tick), 'wb')
+        file.write(header.tobytes().ljust(HEADER_SIZE, b'\0'))
+        return file
+
+    def append(self, readings, timestamp=None):
+        """Append one monitoring tick (a ``NetworkManager.TELEMETRY_MONITOR_DTYPE`` array) and return its tick number."""
+        if 'telemetry' not in readings.dtype.names:
+            raise ValueError("Readings carry no telemetry; create the NetworkManager with telemetry=True.")
+        record = np.zeros(1, dtype=self.record_dtype)
+        tick = self.next_tick
+        record['tick'] = tick
+        record['timestamp'] = time.time() if timestamp is None else timestamp
+        record['performance'][0] = readings['performance']
+        record['telemetry'][0] = readings['telemetry']
+        self.next_tick += 1
+        if self._executor is None:
+            self._write(record)
+            return tick
+        while len(self._pending) >= self.max_pending:
+            self._pending.popleft().result()  # Back-pressure when the writer falls behind
+        self._pending.append(self._executor.submit(self._write, record))
+        return tick
+
+    def _write(self, record):
+        if self._file is None:
+            self._file = self._open_segment(int(record['tick'][0]))
+            self._records = 0
+        self._file.write(record.view(np.uint8))
+        self._file.flush()
+        self._records += 1
+        if self._records >= self.segment_ticks:
+            self._rotate()
+
+    def _rotate(self):
+        """Close the open segment and enforce ``max_segments``."""
+        self._file.close()
+        self._file = None
+        if self.max_segments:
+            for path in self.segments()[:-self.max_segments]:
+                self._maps.pop(path, None)
+                os.remove(path)
+                logging.info(f"Dropped expired telemetry segment {path}.")
+
+    def flush(self):
+        """Wait until every appended tick has been written."""
+        while self._pending:
+            self._pending.popleft().result()
+
+    def _map(self, path, records=None):
+        """Memory-map a segment's records, read-only; maps of closed segments are cached."""
+        cached = self._maps.get(path)
+        if cached is not None:
+            return cached
+        records = self._record_count(path) if records is None else records
+        if records == 0:
+            return np.empty(0, dtype=self.record_dtype)
+        records_map = np.memmap(path, dtype=self.record_dtype, mode='r', offset=HEADER_SIZE, shape=(records,))
+        if self._file is None or self._file.name != path:
+            self._maps[path] = records_map
+        return records_map
+
+    def read(self, start=None, stop=None):
+        """Return the records with ``start <= tick < stop``, oldest first.
+
+        Ranges within one segment are zero-copy views of its memory map;
+        ranges across segments are concatenated into a new array.
+        """
+        self.flush()
+        parts = []
+        for path in self.segments():
+            records = self._map(path)
+            if records.size == 0:
+                continue
+            if stop is not None and records['tick'][0] >= stop:
+                break
+            if start is not None and records['tick'][-1] < start:
+                continue
+            ticks = records['tick']
+            lo = 0 if start is None else int(np.searchsorted(ticks, start))
+            hi = records.size if stop is None else int(np.searchsorted(ticks, stop))
+            parts.append(records[lo:hi])
+        if not parts:
+            return np.empty(0, dtype=self.record_dtype)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def tail(self, ticks):
+        """Return the records of the last ``ticks`` ticks."""
+        return self.read(start=max(0, self.next_tick - ticks))
+
+    def compact(self, factor=10, keep_segments=1):
+        """Average all but the newest ``keep_segments`` segments down to one record per ``factor`` ticks.
+
+        Per node, only records in which the node was active (non-zero
+        latency) are averaged. The result replaces the old segments as a
+        single segment; returns its path, or None if nothing was compacted.
+        """
+        self.flush()
+        old = self.segments()[:-keep_segments] if keep_segments else self.segments()
+        if self._file is not None and self._file.name in old:
+            old.remove(self._file.name)
+        if len(old) < 2 and all(self._read_header(path)['resolution'] > 1 for path in old):
+            return None
+        records = np.concatenate([self._map(path) for path in old]) if old else None
+        if records is None or records.size == 0:
+            return None
+        groups = (records['tick'] - records['tick'][0]) // factor
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        active = records['telemetry']['latency'] > 0
+        counts = np.maximum(np.add.reduceat(active.astype(np.int64), starts, axis=0), 1)
+        compacted = np.zeros(starts.size, dtype=self.record_dtype)
+        compacted['tick'] = records['tick'][starts]
+        compacted['timestamp'] = records['timestamp'][starts]
+        compacted['performance'] = np.add.reduceat(np.where(active, records['performance'], 0), starts, axis=0) / counts
+        for name in NodeTable.TELEMETRY_DTYPE.names:
+            field = np.where(active, records['telemetry'][name], 0)
+            compacted['telemetry'][name] = np.add.reduceat(field, starts, axis=0) / counts
+
+        path = self._segment_path(int(compacted['tick'][0]))
+        temporary = f"{path}.tmp"
+        with self._open_segment(int(compacted['tick'][0]), resolution=factor, path=temporary) as file:
+            file.write(compacted.view(np.uint8))
+        for segment in old:
+            self._maps.pop(segment, None)
+        os.replace(temporary, path)  # Takes the place of the oldest segment, then the rest go
+        for segment in old:
+            if segment != path:
+                os.remove(segment)
+        logging.info(f"Compacted {records.size} ticks from {len(old)} segments into {compacted.size} records.")
+        return path
+
+    @property
+    def nbytes(self):
+        """Size of all segment files on disk, in bytes."""
+        self.flush()
+        return sum(os.path.getsize(path) for path in self.segments())
+
+    def close(self):
+        """Write pending appends and close the open segment."""
+        self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._maps = {}
+
+    def __len__(self):
+        self.flush()
+        return sum(self._record_count(path) for path in self.segments())
+
+    def __str__(self):
+        return f"TelemetryStore in {self.directory} for {self.num_nodes} nodes at tick {self.next_tick}."
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+    from network.network_manager import NetworkManager
+
+    logging.basicConfig(level=logging.INFO)
+    network_manager = NetworkManager(num_nodes=1000, seed=0, telemetry=True)
+    network_manager.initialize_network()
+    with tempfile.TemporaryDirectory() as directory:
+        store = TelemetryStore(directory, num_nodes=1000, segment_ticks=100)
+        for _ in range(500):
+            store.append(network_manager.monitor_network_vectorized())
+        store.compact(factor=10)
+        logging.info(f"{len(store)} records in {len(store.segments())} segments ({store.nbytes / 1e6:.1f} MB).")
+        logging.info(f"Mean latency over the last 50 ticks: {store.tail(50)['telemetry']['latency'].mean():.2f} ms")
+        store.close()
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import random
+from collections import deque
+
+class MessageBus:
+    """Simulated asyncio transport between nodes of the Quantum-Pi Network.
+
+    Each transmission waits a simulated latency (``latency`` seconds plus up
+    to ``jitter`` seconds) without blocking the event loop, is dropped with
+    probability ``loss_rate``, and otherwise lands in the recipient's bounded
+    inbox. A full inbox discards its oldest message.
+    """
+
+    def __init__(self, latency=0.1, jitter=0.0, loss_rate=0.0, inbox_size=100, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.loss_rate = loss_rate
+        self.inbox_size = inbox_size
+        self.random = random.Random(seed)
+        self.inboxes = {}  # Created lazily per node ID
+        self.delivered = 0
+        self.dropped = 0
+        self.overflowed = 0
+
+    def inbox(self, node_id):
+        """Return the bounded inbox of a node."""
+        inbox = self.inboxes.get(node_id)
+        if inbox is None:
+            inbox = self.inboxes[node_id] = deque(maxlen=self.inbox_size)
+        return inbox
+
+    async def transmit(self, node_id, message):
+        """Deliver a message to a node after the simulated latency.
+
+        Returns False if the message was lost in transit.
+        """
+        delay = self.latency + (self.random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.loss_rate and self.random.random() < self.loss_rate:
+            self.dropped += 1
+            return False
+        inbox = self.inbox(node_id)
+        if len(inbox) == inbox.maxlen:
+            self.overflowed += 1
+        inbox.append(message)
+        self.delivered += 1
+        return True
+
+    def receive(self, node_id):
+        """Drain and return all pending messages of a node, oldest first."""
+        inbox = self.inboxes.get(node_id)
+        if not inbox:
+            return []
+        messages = list(inbox)
+        inbox.clear()
+        return messages
+
+    def __str__(self):
+        return f"MessageBus: {self.delivered} delivered, {self.dropped} dropped, {self.overflowed} overflowed."
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    async def demo():
+        bus = MessageBus(latency=0.05, jitter=0.01, loss_rate=0.1, inbox_size=2, seed=1)
+        await asyncio.gather(*(bus.transmit(node_id % 10, f"ping {node_id}") for node_id in range(100)))
+        logging.info(bus)
+        logging.info(f"Node 0 inbox: {bus.receive(0)}")
+
+    asyncio.run(demo())
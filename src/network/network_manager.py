@@ -1,65 +1,235 @@
+import asyncio
 import logging
 import random
+import time
+import numpy as np
 from network.node import Node
+from network.node_table import NodeTable
+from network.message_bus import MessageBus
 from network.self_healing import SelfHealingMechanism
 
 class NetworkManager:
-    """Manages the network and nodes in the Quantum-Pi Network."""
+    """Manages the network and nodes in the Quantum-Pi Network.
 
-    def __init__(self, num_nodes=10, redundancy_level=2):
+    Node state is held in a columnar ``NodeTable``; ``self.nodes`` indexes and
+    iterates as a sequence of ``Node`` views, while monitoring, failures and
+    status queries operate on whole arrays. Multivariate telemetry is only
+    simulated when ``telemetry`` is set, since it costs several times more
+    per tick than performance alone.
+    """
+
+    MONITOR_DTYPE = np.dtype([('node_id', np.int64), ('performance', np.float64)])
+    TELEMETRY_MONITOR_DTYPE = np.dtype([
+        ('node_id', np.int64),
+        ('performance', np.float64),
+        ('telemetry', NodeTable.TELEMETRY_DTYPE),
+    ])
+
+    def __init__(self, num_nodes=10, redundancy_level=2, history_window=None, history_tiers=None, seed=None,
+                 message_bus=None, node_ids=None, telemetry=False):
         self.num_nodes = num_nodes
-        self.redundancy_level = redundancy_level
-        self.nodes = [Node(node_id=i, redundancy_level=redundancy_level) for i in range(num_nodes)]
-        self.active_nodes = []
+        self.rng = np.random.default_rng(seed)
+        self.nodes = NodeTable(num_nodes, redundancy_level=redundancy_level, node_ids=node_ids,
+                               history_window=history_window, history_tiers=history_tiers,
+                               telemetry_enabled=telemetry, rng=self.rng)
+        self.last_readings = None
+        self.metrics = None  # Set by monitoring.metrics.NetworkMetrics
+        self.message_bus = message_bus or MessageBus(seed=seed)
         self.self_healing_mechanism = SelfHealingMechanism(self)
 
+    @property
+    def telemetry(self):
+        """Whether monitoring simulates multivariate telemetry, in ticks and per node."""
+        return self.nodes.telemetry_enabled
+
+    @telemetry.setter
+    def telemetry(self, value):
+        self.nodes.telemetry_enabled = value
+
+    @property
+    def redundancy_level(self):
+        return self.nodes.redundancy_level
+
+    @redundancy_level.setter
+    def redundancy_level(self, value):
+        self.nodes.redundancy_level = value
+        self.nodes._rebuild_indexes()
+
+    @property
+    def active_nodes(self):
+        """Views of all currently active nodes, in node order.
+
+        This builds one view per node; internal hot paths read
+        ``nodes.active_indices()`` instead.
+        """
+        return [self.nodes.view(index) for index in np.sort(self.nodes.active_indices()).tolist()]
+
+    @property
+    def inactive_nodes(self):
+        """Views of all currently inactive nodes, in node order (see ``active_nodes``)."""
+        return [self.nodes.view(index) for index in np.sort(self.nodes.inactive_indices()).tolist()]
+
     def initialize_network(self):
         """Initialize all nodes in the network."""
-        for node in self.nodes:
-            node.repair()  # Start all nodes as active
-            self.active_nodes.append(node)
+        self.nodes.repair(np.arange(self.num_nodes))  # Start all nodes as active
         logging.info(f"Initialized {self.num_nodes} nodes in the network.")
 
     def monitor_network(self):
         """Monitor the performance of all nodes in the network."""
-        for node in self.nodes:
-            node.monitor_performance()
+        self.monitor_network_vectorized(self.rng)
+
+    def monitor_network_vectorized(self, rng=None, log_sample=0):
+        """Run one monitoring tick over the whole network as array operations.
+
+        Degradations for every node are drawn from ``rng`` (a
+        ``numpy.random.Generator``, defaulting to the manager's own) and
+        applied to active nodes only. Returns a structured array with
+        ``node_id`` and ``performance`` fields, where inactive nodes report
+        0.0. With ``telemetry`` set, active nodes also draw fresh telemetry
+        and the array has a ``telemetry`` field, all-zero for inactive nodes.
+        A single summary line is logged, plus ``log_sample`` randomly chosen
+        per-node lines at DEBUG level.
+        """
+        start = time.perf_counter()
+        rng = self.rng if rng is None else rng
+        active = self.nodes.is_active.copy()
+        degradation = rng.uniform(0.0, 0.1, size=self.num_nodes)
+        performance = self.nodes.degrade_where(active, degradation)
+
+        readings = np.empty(self.num_nodes, dtype=self.TELEMETRY_MONITOR_DTYPE if self.telemetry else self.MONITOR_DTYPE)
+        readings['node_id'] = self.nodes.node_id
+        readings['performance'] = np.where(active, performance, 0.0)
+        if self.telemetry:
+            all_active = self.nodes.num_active == self.num_nodes
+            self.nodes.simulate_telemetry(slice(None) if all_active else active, rng)
+            inactive = self.nodes.inactive_indices()
+            for name in NodeTable.TELEMETRY_DTYPE.names:
+                field = readings['telemetry'][name]
+                field[:] = self.nodes.telemetry[name]
+                field[inactive] = 0.0
+        self.last_readings = readings
+
+        num_active = np.count_nonzero(active)
+        if num_active:
+            logging.info(f"Monitored {num_active} active nodes. Mean performance: {performance[active].mean():.2f}")
+        if log_sample and num_active:
+            sample = rng.choice(np.flatnonzero(active), size=min(log_sample, num_active), replace=False)
+            for index in sample.tolist():
+                logging.debug(f"Node {readings['node_id'][index]} performance monitored: {readings['performance'][index]:.2f}")
+        if self.metrics is not None:
+            self.metrics.tick_duration.observe(time.perf_counter() - start)
+        return readings
 
     def simulate_node_failure(self, node_id):
-        """Simulate a failure in a specific node."""
-        if 0 <= node_id < self.num_nodes:
-            self.nodes[node_id].simulate_failure()
-            self.handle_failure(node_id)
+        """Simulate a failure in a specific node, or in an array of nodes."""
+        node_ids = np.atleast_1d(np.asarray(node_id, dtype=np.int64))
+        node_ids = node_ids[(node_ids >= 0) & (node_ids < self.num_nodes)]
+        if node_ids.size == 0:
+            return
+        self.nodes.fail(node_ids)
+        if node_ids.size == 1:
+            failed = node_ids[0]
+            logging.error(f"Node {failed} has failed. Total failures: {self.nodes.failure_count[failed]}")
+        else:
+            logging.error(f"{node_ids.size} nodes have failed.")
+        self.handle_failure(node_ids)
 
     def handle_failure(self, node_id):
-        """Handle the failure of a node and activate redundancy if necessary."""
-        logging.info(f"Handling failure for Node {node_id}.")
-        # Check for redundancy
-        if self.redundancy_level > 0:
+        """Handle the failure of a node (or array of nodes) and activate redundancy if necessary.
+
+        Nodes of the failed batch are never chosen as redundant nodes for
+        each other.
+        """
+        node_ids = np.atleast_1d(np.asarray(node_id, dtype=np.int64))
+        failed = np.unique(node_ids)
+        if node_ids.size == 1:
+            logging.info(f"Handling failure for Node {node_ids[0]}.")
+        else:
+            logging.info(f"Handling failure for {node_ids.size} nodes.")
+        # Only nodes with an inactive node on their redundancy ring need a failover
+        node_ids = node_ids[self.nodes.inactive_replicas[node_ids] > 0]
+        pending = np.ones(node_ids.size, dtype=bool)
+        for i in range(self.redundancy_level):
             # Activate a redundant node if available
-            for i in range(self.redundancy_level):
-                redundant_node_id = (node_id + i + 1) % self.num_nodes
-                if not self.nodes[redundant_node_id].is_active:
-                    self.nodes[redundant_node_id].repair()
-                    logging.info(f"Activated redundant Node {redundant_node_id} to replace Node {node_id}.")
-                    break
-
-    def get_network_status(self):
-        """Return the status of all nodes in the network."""
-        status = [node.get_status() for node in self.nodes]
+            redundant_ids = (node_ids + i + 1) % self.num_nodes
+            activate = pending & ~self.nodes.is_active[redundant_ids] & ~np.isin(redundant_ids, failed)
+            if not activate.any():
+                continue
+            self.nodes.repair(redundant_ids[activate])
+            pending &= ~activate
+            if node_ids.size == 1:
+                logging.info(f"Activated redundant Node {redundant_ids[0]} to replace Node {node_ids[0]}.")
+            else:
+                logging.info(f"Activated {np.count_nonzero(activate)} redundant nodes at offset {i + 1}.")
+
+    def get_network_summary(self):
+        """Return node counts and the inactive node IDs without scanning the network."""
+        inactive = np.sort(self.nodes.inactive_indices())
+        return {
+            "num_nodes": self.num_nodes,
+            "active": self.nodes.num_active,
+            "inactive": self.nodes.num_inactive,
+            "inactive_node_ids": self.nodes.node_id[inactive].tolist()
+        }
+
+    def get_network_status(self, as_array=False):
+        """Return the status of all nodes in the network.
+
+        With ``as_array=True`` a structured NumPy array is returned instead of
+        a list of dicts.
+        """
+        if as_array:
+            return self.nodes.to_records()
+        history = self.nodes.history
+        status = [
+            {
+                "node_id": node_id,
+                "is_active": is_active,
+                "performance": performance,
+                "failure_count": failure_count,
+                "performance_history": history.view(index)
+            }
+            for index, (node_id, is_active, performance, failure_count) in enumerate(zip(
+                self.nodes.node_id.tolist(),
+                self.nodes.is_active.tolist(),
+                self.nodes.performance.tolist(),
+                self.nodes.failure_count.tolist()
+            ))
+        ]
         return status
 
     def communicate_between_nodes(self, message):
-        """Simulate communication between all active nodes."""
-        for node in self.active_nodes:
-            response = node.communicate(message)
-            if response:
-                logging.info(response)
+        """Simulate communication between all active nodes.
+
+        Blocking wrapper around ``broadcast``; returns the responses.
+        """
+        responses = asyncio.run(self.broadcast(message))
+        received = [response for response in responses if response]
+        logging.info(f"Broadcast reached {len(received)} of {len(responses)} active nodes.")
+        return responses
+
+    async def broadcast(self, message, max_in_flight=10000):
+        """Send a message to all active nodes concurrently over the message bus.
+
+        At most ``max_in_flight`` transmissions are outstanding at once, which
+        bounds memory on very large networks. Returns one response per active
+        node, in node order (None where the message was lost).
+        """
+        targets = np.sort(self.nodes.active_indices()).tolist()  # Rows from the partition index, not Node views
+        responses = [None] * len(targets)
+        pending = iter(enumerate(targets))
+
+        async def sender():
+            for index, row in pending:
+                node = self.nodes.view(row)
+                responses[index] = await node.acommunicate(message, bus=self.message_bus)
+
+        await asyncio.gather(*(sender() for _ in range(min(max_in_flight, len(targets)))))
+        return responses
 
     def shutdown_network(self):
         """Shutdown all nodes in the network."""
-        for node in self.nodes:
-            node.is_active = False
+        self.nodes.set_active(np.arange(self.num_nodes), False)
         logging.info("All nodes have been shut down.")
 
     def trigger_self_healing(self):
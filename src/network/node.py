@@ -1,3 +1,4 @@
+import asyncio
 import random
 import logging
 import time
@@ -5,25 +6,107 @@ import json
 import numpy as np
 
 class Node:
-    """Represents a node in the Quantum-Pi Network."""
+    """Represents a node in the Quantum-Pi Network.
+
+    A ``Node`` is a thin view onto one row of a ``NodeTable``; its state is
+    read from and written through to the table's columnar arrays, and its
+    performance history is a view into the table's shared ring buffer. A
+    node created directly gets its own single-row table.
+    """
+
+    __slots__ = ('_table', '_index')
 
     def __init__(self, node_id, redundancy_level=2):
-        self.node_id = node_id
-        self.performance = 1.0  # Performance metric (1.0 = 100% performance)
-        self.is_active = True
-        self.redundancy_level = redundancy_level
-        self.failure_count = 0
-        self.history = []  # Store performance history for analysis
+        from network.node_table import NodeTable
+        self._table = NodeTable(1, redundancy_level=redundancy_level, node_ids=[node_id])
+        self._index = 0
+
+    @classmethod
+    def bind(cls, table, index):
+        """Create a view onto row ``index`` of ``table``."""
+        node = cls.__new__(cls)
+        node._table = table
+        node._index = index
+        return node
+
+    @property
+    def node_id(self):
+        return int(self._table.node_id[self._index])
+
+    @node_id.setter
+    def node_id(self, value):
+        self._table.node_id[self._index] = value
+
+    @property
+    def performance(self):
+        """Performance metric (1.0 = 100% performance)."""
+        return float(self._table.performance[self._index])
+
+    @performance.setter
+    def performance(self, value):
+        self._table.performance[self._index] = value
+
+    @property
+    def is_active(self):
+        return bool(self._table.is_active[self._index])
+
+    @is_active.setter
+    def is_active(self, value):
+        self._table.set_active(self._index, bool(value))
+
+    @property
+    def failure_count(self):
+        return int(self._table.failure_count[self._index])
+
+    @failure_count.setter
+    def failure_count(self, value):
+        self._table.failure_count[self._index] = value
+
+    @property
+    def redundancy_level(self):
+        return self._table.redundancy_level
+
+    @property
+    def telemetry(self):
+        """Latest telemetry vector as a ``{field: value}`` dict, or None if none was ever recorded."""
+        if not self._table.has_telemetry:
+            return None
+        record = self._table.telemetry[self._index]
+        return {name: float(record[name]) for name in self._table.TELEMETRY_DTYPE.names}
+
+    @property
+    def history(self):
+        """Read-only view of the recent performance history, oldest first."""
+        return self._table.history.view(self._index)
+
+    def performance_stats(self):
+        """Return ``(samples, mean, std)`` over the history window in O(1)."""
+        history = self._table.history
+        return int(history.length(self._index)), float(history.mean(self._index)), float(history.std(self._index))
+
+    def __eq__(self, other):
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self._table is other._table and self._index == other._index
+
+    def __hash__(self):
+        return hash((id(self._table), self._index))
 
     def monitor_performance(self):
-        """Simulate performance monitoring for the node."""
+        """Simulate performance monitoring for the node.
+
+        Telemetry is drawn too, from the table's generator, when the table
+        (or its ``NetworkManager``) has telemetry enabled.
+        """
         if not self.is_active:
             return 0.0  # Inactive nodes have no performance
 
         # Simulate random performance degradation
         degradation = random.uniform(0.0, 0.1)
         self.performance = max(0.0, self.performance - degradation)
-        self.history.append(self.performance)
+        self._table.history.append(self._index, self.performance)
+        if self._table.telemetry_enabled:
+            self._table.simulate_telemetry([self._index], self._table.rng)
         logging.info(f"Node {self.node_id} performance monitored: {self.performance:.2f}")
         return self.performance
 
@@ -47,27 +130,44 @@ class Node:
             "is_active": self.is_active,
             "performance": self.performance,
             "failure_count": self.failure_count,
+            "telemetry": self.telemetry,
             "performance_history": self.history
         }
 
     def communicate(self, message):
-        """Simulate communication with other nodes."""
-        if self.is_active:
-            logging.info(f"Node {self.node_id} sending message: {message}")
-            # Simulate message processing
-            time.sleep(0.1)
-            return f"Message from Node {self.node_id}: {message}"
-        else:
+        """Simulate communication with other nodes.
+
+        Blocking wrapper around ``acommunicate``; must not be called from a
+        running event loop.
+        """
+        return asyncio.run(self.acommunicate(message))
+
+    async def acommunicate(self, message, bus=None, latency=0.1):
+        """Simulate communication with other nodes without blocking the event loop.
+
+        With a ``MessageBus`` the message travels over the bus (using its
+        latency and loss model) into this node's inbox; otherwise processing
+        takes ``latency`` seconds. Returns None if the node is inactive or the
+        message was lost.
+        """
+        if not self.is_active:
             logging.warning(f"Node {self.node_id} is inactive and cannot communicate.")
             return None
+        logging.debug(f"Node {self.node_id} sending message: {message}")
+        # Simulate message processing
+        if bus is not None:
+            if not await bus.transmit(self.node_id, message):
+                return None
+        elif latency > 0:
+            await asyncio.sleep(latency)
+        return f"Message from Node {self.node_id}: {message}"
 
     def analyze_performance(self):
         """Analyze performance history and detect trends."""
-        if len(self.history) < 2:
+        samples, mean_performance, std_dev_performance = self.performance_stats()
+        if samples < 2:
             return "Insufficient data for analysis."
 
-        mean_performance = np.mean(self.history)
-        std_dev_performance = np.std(self.history)
         logging.info(f"Node {self.node_id} performance analysis: Mean = {mean_performance:.2f}, Std Dev = {std_dev_performance:.2f}")
 
         if std_dev_performance > 0.1:
@@ -0,0 +1,272 @@
+import logging
+import threading
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+from network.node import Node
+from network.performance_history import PerformanceHistory
+
+class NodeTable:
+    """Columnar, array-backed storage for the nodes of the Quantum-Pi Network.
+
+    Node state lives in contiguous NumPy arrays (one per attribute) so that
+    whole-network operations run as array operations. Indexing or iterating
+    the table yields thin ``Node`` views that read and write through to it.
+    Performance samples go to a bounded, shared ``PerformanceHistory`` of
+    ``history_window`` samples per node (0 disables history). By default the
+    window is 16 samples, reduced for very large tables so that the ring
+    stays within ``HISTORY_BUDGET`` bytes. The latest multivariate telemetry
+    of each node is kept in ``telemetry``, a float32 structured array with
+    one ``TELEMETRY_DTYPE`` record per row, allocated on first use; only
+    scalar performance has a per-sample history. Per-node monitoring draws
+    telemetry only when ``telemetry_enabled`` is set, from ``rng``.
+
+    Activity is indexed incrementally: ``is_active`` is read-only and every
+    transition goes through ``set_active``, which keeps a partition of rows
+    into active and inactive sets and, for each row, the number of inactive
+    nodes among its ``redundancy_level`` successors on the redundancy ring.
+    Both are updated in O(changed rows) per transition, under a lock, and
+    listeners registered with ``subscribe`` are told about every transition.
+    """
+
+    RECORD_DTYPE = np.dtype([
+        ('node_id', np.int64),
+        ('is_active', np.bool_),
+        ('performance', np.float64),
+        ('failure_count', np.int32),
+    ])
+
+    TELEMETRY_DTYPE = np.dtype([
+        ('latency', np.float32),  # Milliseconds
+        ('queue_depth', np.float32),
+        ('error_rate', np.float32),
+        ('throughput', np.float32),  # Requests per second
+    ])
+
+    BASE_LATENCY = 10.0
+    BASE_THROUGHPUT = 1000.0
+
+    DEFAULT_HISTORY_WINDOW = 16
+    HISTORY_BUDGET = 16 * 2**20  # Bytes of float32 samples for the default window
+
+    def __init__(self, num_nodes, redundancy_level=2, node_ids=None, history_window=None, history_tiers=None,
+                 telemetry_enabled=False, rng=None):
+        self.num_nodes = num_nodes
+        self.redundancy_level = redundancy_level
+        if node_ids is None:
+            self.node_id = np.arange(num_nodes, dtype=np.int64)
+        else:
+            self.node_id = np.array(node_ids, dtype=np.int64)
+        self.performance = np.ones(num_nodes, dtype=np.float64)  # 1.0 = 100% performance
+        self._is_active = np.ones(num_nodes, dtype=bool)
+        self.is_active = self._is_active.view()
+        self.is_active.flags.writeable = False
+        self.failure_count = np.zeros(num_nodes, dtype=np.int32)
+        self._telemetry = None
+        self.telemetry_enabled = telemetry_enabled
+        self.rng = np.random.default_rng() if rng is None else rng
+        if history_window is None:
+            history_window = self.default_history_window(num_nodes)
+        self.history = PerformanceHistory(num_nodes, window=history_window, tiers=history_tiers)
+        # Rows order[:num_active] are active, order[num_active:] inactive; position is the inverse permutation
+        self._order = np.arange(num_nodes, dtype=np.int64)
+        self._position = np.arange(num_nodes, dtype=np.int64)
+        self.num_active = num_nodes
+        self.inactive_replicas = np.zeros(num_nodes, dtype=np.int32)
+        self.lock = threading.RLock()
+        self._listeners = []
+
+    @classmethod
+    def default_history_window(cls, num_nodes):
+        """``DEFAULT_HISTORY_WINDOW`` samples, or fewer (at least one) if they would not fit ``HISTORY_BUDGET``."""
+        return max(1, min(cls.DEFAULT_HISTORY_WINDOW, cls.HISTORY_BUDGET // (4 * max(1, num_nodes))))
+
+    @property
+    def has_telemetry(self):
+        """Whether any telemetry has been recorded, i.e. the column is allocated."""
+        return self._telemetry is not None
+
+    @property
+    def telemetry(self):
+        if self._telemetry is None:
+            self._telemetry = np.zeros(self.num_nodes, dtype=self.TELEMETRY_DTYPE)
+        return self._telemetry
+
+    def __len__(self):
+        return self.num_nodes
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.view(i) for i in range(*index.indices(self.num_nodes))]
+        index = int(index)
+        if index < 0:
+            index += self.num_nodes
+        if not 0 <= index < self.num_nodes:
+            raise IndexError("NodeTable index out of range")
+        return self.view(index)
+
+    def __iter__(self):
+        for index in range(self.num_nodes):
+            yield self.view(index)
+
+    def view(self, index):
+        """Return a ``Node`` view bound to the given row."""
+        return Node.bind(self, index)
+
+    def active_indices(self):
+        """Return the row indices of all active nodes (in no particular order)."""
+        return self._order[:self.num_active]
+
+    def inactive_indices(self):
+        """Return the row indices of all inactive nodes (in no particular order)."""
+        return self._order[self.num_active:]
+
+    @property
+    def num_inactive(self):
+        return self.num_nodes - self.num_active
+
+    def subscribe(self, listener):
+        """Call ``listener(rows, is_active)`` after every activity transition."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Stop notifying a listener registered with ``subscribe``."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def set_active(self, indices, value):
+        """Activate or deactivate rows, updating the activity indexes.
+
+        Returns the rows whose state actually changed.
+        """
+        indices = np.atleast_1d(np.asarray(indices, dtype=np.int64))
+        with self.lock:
+            changed = np.unique(indices[self._is_active[indices] != value])
+            if changed.size == 0:
+                return changed
+            self._is_active[changed] = value
+            self._update_indexes(changed, value)
+        for listener in list(self._listeners):
+            listener(changed, value)
+        return changed
+
+    def _update_indexes(self, changed, value):
+        """Move changed rows across the active/inactive partition and update the ring counts."""
+        if changed.size > self.num_nodes // 8:
+            self._rebuild_indexes()
+            return
+
+        for row in changed.tolist():
+            # Swap the row across the active/inactive boundary of the partition
+            boundary = self.num_active if value else self.num_active - 1
+            other = self._order[boundary]
+            position = self._position[row]
+            self._order[position], self._order[boundary] = other, row
+            self._position[other], self._position[row] = position, boundary
+            self.num_active += 1 if value else -1
+
+        if self.redundancy_level > 0:
+            predecessors = (changed[:, None] - np.arange(1, self.redundancy_level + 1)) % self.num_nodes
+            np.add.at(self.inactive_replicas, predecessors.ravel(), -1 if value else 1)
+
+    def _rebuild_indexes(self):
+        """Recompute the activity indexes from ``is_active`` in O(N) array operations."""
+        with self.lock:
+            active = np.flatnonzero(self._is_active)
+            self._order = np.concatenate([active, np.flatnonzero(~self._is_active)])
+            self._position[self._order] = np.arange(self.num_nodes)
+            self.num_active = active.size
+            inactive = (~self._is_active).astype(np.int32)
+            self.inactive_replicas[:] = 0
+            for offset in range(1, self.redundancy_level + 1):
+                self.inactive_replicas += np.roll(inactive, -offset)
+
+    def degrade(self, indices, degradation):
+        """Lower the performance of the given rows, clamping at zero."""
+        self.performance[indices] = np.maximum(0.0, self.performance[indices] - degradation)
+        self.history.append(indices, self.performance[indices])
+        return self.performance[indices]
+
+    def degrade_where(self, mask, degradation):
+        """Lower performance wherever ``mask`` is set, clamping at zero.
+
+        ``degradation`` has one entry per row; entries outside ``mask`` are
+        ignored.
+        """
+        np.subtract(self.performance, degradation, out=self.performance, where=mask)
+        np.maximum(self.performance, 0.0, out=self.performance)
+        self.history.append_where(mask, self.performance)
+        return self.performance
+
+    def simulate_telemetry(self, rows, rng):
+        """Draw fresh telemetry for ``rows`` (indices or a boolean mask) from their current performance.
+
+        Latency and queue depth grow and throughput shrinks as performance
+        drops or load rises, and the error rate rises as performance drops.
+        Noise comes from two float32 draws per node (load and errors) from
+        ``rng``, however many fields there are. Returns the new records.
+        """
+        performance = np.maximum(self.performance[rows], 0.05).astype(np.float32)
+        load = rng.standard_normal(performance.size, dtype=np.float32)
+        load *= np.float32(0.1)
+        errors = rng.random(performance.size, dtype=np.float32)
+        errors -= np.float32(0.5)
+        telemetry = self.telemetry[rows] if isinstance(rows, slice) else np.empty(performance.size, self.TELEMETRY_DTYPE)
+        telemetry['latency'] = np.float32(self.BASE_LATENCY) / performance * (1.0 + load)
+        telemetry['queue_depth'] = np.maximum(0.0, np.float32(4.0) / performance - 4.0 + 10.0 * load)
+        telemetry['error_rate'] = np.clip(np.float32(0.05) * (1.0 - performance) + np.float32(0.005) * errors,
+                                          0.0, 1.0)
+        telemetry['throughput'] = np.maximum(0.0, np.float32(self.BASE_THROUGHPUT) * performance * (1.0 - 0.5 * load))
+        if not isinstance(rows, slice):  # Slices were written in place
+            for name in self.TELEMETRY_DTYPE.names:  # Field-wise copies are much faster than record copies
+                self.telemetry[name][rows] = telemetry[name]
+        return telemetry
+
+    def telemetry_matrix(self, telemetry=None):
+        """View telemetry records (the table's own by default) as an ``(n, fields)`` float32 matrix."""
+        return structured_to_unstructured(self.telemetry if telemetry is None else telemetry, dtype=np.float32)
+
+    def fail(self, indices):
+        """Mark the given rows as failed and bump their failure counters."""
+        indices = np.asarray(indices, dtype=np.int64)
+        self.set_active(indices, False)
+        np.add.at(self.failure_count, indices, 1)
+
+    def repair(self, indices):
+        """Reactivate the inactive rows among ``indices`` at full performance.
+
+        Returns the row indices that were actually repaired.
+        """
+        repaired = self.set_active(indices, True)
+        self.performance[repaired] = 1.0
+        return repaired
+
+    def to_records(self):
+        """Return a structured-array snapshot of the table."""
+        records = np.empty(self.num_nodes, dtype=self.RECORD_DTYPE)
+        records['node_id'] = self.node_id
+        records['is_active'] = self.is_active
+        records['performance'] = self.performance
+        records['failure_count'] = self.failure_count
+        return records
+
+    @property
+    def nbytes(self):
+        """Memory used by the columnar arrays, the activity indexes and the history buffer, in bytes."""
+        columns = self.node_id.nbytes + self.performance.nbytes + self._is_active.nbytes + self.failure_count.nbytes
+        if self._telemetry is not None:
+            columns += self._telemetry.nbytes
+        indexes = self._order.nbytes + self._position.nbytes + self.inactive_replicas.nbytes
+        return columns + indexes + self.history.nbytes
+
+    def __str__(self):
+        return f"NodeTable with {self.num_nodes} nodes ({self.nbytes / 1e6:.1f} MB)."
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    table = NodeTable(num_nodes=1_000_000, history_window=0)
+    active = table.active_indices()
+    table.degrade(active, np.random.uniform(0.0, 0.1, size=active.size))
+    table.fail(np.random.randint(0, table.num_nodes, size=1000))
+    logging.info(f"{table} Active nodes: {table.num_active}")
+    logging.info(table[42])
@@ -0,0 +1,193 @@
+import logging
+from collections.abc import Mapping
+import numpy as np
+
+class PerformanceHistory:
+    """Bounded, preallocated ring buffer of per-node performance samples.
+
+    Samples for ``num_nodes`` nodes are kept in one float32
+    ``(window, num_nodes)`` array and written at row ``count % window``.
+    While every node has the same number of samples, appending to all nodes
+    writes one contiguous row; other appends scatter per node.
+    Chronologically ordered views are zero-copy until a node's ring wraps;
+    after that ``view`` unrolls the ring into a copy. Running sums are
+    updated on every append, which makes the windowed mean and standard
+    deviation O(1) per node.
+
+    ``tiers`` optionally adds downsampled long-term rollups, given as
+    ``{name: (factor, window)}``: every ``factor`` samples of a node are
+    averaged into one sample of the named tier, which is itself a
+    ``PerformanceHistory`` of the given window.
+    """
+
+    def __init__(self, num_nodes, window=16, tiers=None, dtype=np.float32, rollup_factor=1):
+        self.num_nodes = num_nodes
+        self.window = window
+        self.rollup_factor = rollup_factor
+        self._data = np.zeros((window, num_nodes), dtype=dtype)
+        self.count = np.zeros(num_nodes, dtype=np.int64)  # Total samples ever appended per node
+        self._aligned = True  # Every node has the same count, so a full append writes one ring row
+        self._sum = np.zeros(num_nodes, dtype=np.float64)
+        self._sumsq = np.zeros(num_nodes, dtype=np.float64)
+        self._pending_sum = np.zeros(num_nodes, dtype=np.float64) if rollup_factor > 1 else None
+        self._pending_count = np.zeros(num_nodes, dtype=np.int64) if rollup_factor > 1 else None
+        self.tiers = {
+            name: PerformanceHistory(num_nodes, window=tier_window, dtype=dtype, rollup_factor=factor)
+            for name, (factor, tier_window) in (tiers or {}).items()
+        }
+
+    def append(self, rows, values):
+        """Append one sample to each of the given (unique) rows."""
+        if self.window == 0:
+            return
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        if rows.size == self.num_nodes and self._aligned:
+            self._append_all(values)  # Rows are unique, so these are all of them
+            return
+        self._aligned = self._aligned and rows.size == 0
+        # Round to the stored precision first, so that evicting a sample subtracts exactly what was added
+        values = np.broadcast_to(np.asarray(values, dtype=self._data.dtype).astype(np.float64), rows.shape)
+        count = self.count[rows]
+        position = count % self.window
+        evicted = np.where(count >= self.window, self._data[position, rows].astype(np.float64), 0.0)
+        self._sum[rows] += values - evicted
+        self._sumsq[rows] += values * values - evicted * evicted
+        self._data[position, rows] = values
+        self.count[rows] = count + 1
+        for tier in self.tiers.values():
+            tier._rollup(rows, values)
+
+    def _append_all(self, values):
+        """Append one sample to every node while all counts are equal, as one contiguous ring row."""
+        ring_row = self._data[int(self.count[0]) % self.window]
+        if self.count[0] >= self.window:
+            evicted = ring_row.astype(np.float64)
+            self._sum -= evicted
+            evicted *= evicted
+            self._sumsq -= evicted
+        ring_row[:] = values  # Rounds to the stored precision
+        values = ring_row.astype(np.float64)
+        self._sum += values
+        self._sumsq += values * values
+        self.count += 1
+        if self.tiers:
+            rows = np.arange(self.num_nodes)
+            for tier in self.tiers.values():
+                tier._rollup(rows, values)
+
+    def append_where(self, mask, values):
+        """Append ``values[i]`` for every row ``i`` where ``mask`` is set."""
+        if self.window and self._aligned and mask.all():
+            self._append_all(values)
+            return
+        rows = np.flatnonzero(mask)
+        self.append(rows, np.asarray(values)[rows])
+
+    def _rollup(self, rows, values):
+        """Accumulate samples and append their mean every ``rollup_factor`` samples."""
+        self._pending_sum[rows] += values
+        self._pending_count[rows] += 1
+        done = rows[self._pending_count[rows] >= self.rollup_factor]
+        if done.size:
+            self.append(done, self._pending_sum[done] / self._pending_count[done])
+            self._pending_sum[done] = 0.0
+            self._pending_count[done] = 0
+
+    def length(self, rows=slice(None)):
+        """Number of samples currently held for the given rows."""
+        return np.minimum(self.count[rows], self.window)
+
+    def mean(self, rows=slice(None)):
+        """Windowed mean for the given rows (NaN where there are no samples)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._sum[rows] / self.length(rows)
+
+    def std(self, rows=slice(None)):
+        """Windowed population standard deviation for the given rows."""
+        n = self.length(rows)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = self._sum[rows] / n
+            variance = self._sumsq[rows] / n - mean * mean
+        return np.sqrt(np.maximum(variance, 0.0))
+
+    def view(self, row):
+        """Return a read-only array of a node's samples, oldest first.
+
+        This is a zero-copy view until the node's ring wraps, and an unrolled
+        copy after that.
+        """
+        count = int(self.count[row])
+        start = count % self.window if self.window else 0
+        if count <= self.window or start == 0:
+            view = self._data[:min(count, self.window), row]
+        else:
+            view = np.concatenate((self._data[start:, row], self._data[:start, row]))
+        view.flags.writeable = False
+        return view
+
+    def latest(self, rows=slice(None)):
+        """Most recent sample for the given rows (0.0 where there are none)."""
+        if self.window == 0:
+            return np.zeros_like(self.count[rows], dtype=self._data.dtype)
+        last = (self.count[rows] - 1) % self.window
+        return np.where(self.count[rows] > 0, self._data[last, np.arange(self.num_nodes)[rows]], 0.0)
+
+    def recent(self, rows, k):
+        """Return the last ``k`` samples of each row as a ``(len(rows), k)`` array, newest first.
+
+        Positions older than a row's available history are NaN.
+        """
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        if self.window == 0 or k == 0:
+            return np.full((rows.size, k), np.nan)
+        ages = np.arange(k)
+        count = self.count[rows][:, None]
+        values = self._data[(count - 1 - ages) % self.window, rows[:, None]].astype(np.float64)
+        values[ages >= np.minimum(count, self.window)] = np.nan
+        return values
+
+    @property
+    def nbytes(self):
+        """Memory used by the buffers, including all tiers, in bytes."""
+        total = self._data.nbytes + self.count.nbytes + self._sum.nbytes + self._sumsq.nbytes
+        if self._pending_sum is not None:
+            total += self._pending_sum.nbytes + self._pending_count.nbytes
+        return total + sum(tier.nbytes for tier in self.tiers.values())
+
+    def __str__(self):
+        return f"PerformanceHistory for {self.num_nodes} nodes, window {self.window} ({self.nbytes / 1e6:.1f} MB)."
+
+class HistoryViews(Mapping):
+    """Read-only ``{node_id: samples}`` mapping over a ``PerformanceHistory``.
+
+    Keys are table rows, which match node IDs for networks built by
+    ``NetworkManager``. Values are read-only arrays from
+    ``PerformanceHistory.view``, limited to the most recent ``limit`` samples
+    when a limit is given.
+    """
+
+    def __init__(self, history, limit=None):
+        self.history = history
+        self.limit = limit
+
+    def __getitem__(self, node_id):
+        if not 0 <= node_id < self.history.num_nodes:
+            raise KeyError(node_id)
+        view = self.history.view(node_id)
+        return view[-self.limit:] if self.limit else view
+
+    def __iter__(self):
+        return iter(range(self.history.num_nodes))
+
+    def __len__(self):
+        return self.history.num_nodes
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    history = PerformanceHistory(num_nodes=1000, window=60, tiers={'1m': (60, 60), '1h': (3600, 24)})
+    rng = np.random.default_rng(0)
+    for _ in range(7200):
+        history.append(np.arange(1000), rng.uniform(0.5, 1.0, size=1000))
+    logging.info(history)
+    logging.info(f"Node 0: mean = {history.mean(0):.3f}, std = {history.std(0):.3f}, hourly = {history.tiers['1h'].view(0)}")
@@ -1,30 +1,159 @@
+import heapq
+import itertools
 import logging
+import random
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from network.node import Node
 import numpy as np
+from config import Config
 
 class SelfHealingMechanism:
-    """Handles self-healing logic for the Quantum-Pi Network."""
+    """Handles self-healing logic for the Quantum-Pi Network.
 
-    def __init__(self, network_manager):
+    Healing is event-driven: once started, the mechanism subscribes to the
+    node table's activity transitions, queues every node that goes down and
+    repairs it on a pool of at most ``parallelism`` worker threads. A node
+    that is still down after its ``n``-th failed attempt (counting from 1) is
+    retried after ``backoff_base * 2 ** (n - 1) * (1 + random.uniform(0,
+    backoff_jitter))`` seconds, i.e. ``backoff_base`` first and doubling
+    each time, until ``repair_attempts`` (Config ``REPAIR_ATTEMPTS``)
+    attempts have been made.
+    """
+
+    MAX_FAILURES = 3  # Nodes that failed this often are not repaired any more
+
+    def __init__(self, network_manager, parallelism=4, backoff_base=0.5, backoff_jitter=0.1, repair_attempts=None):
         self.network_manager = network_manager
+        self.parallelism = parallelism
+        self.backoff_base = backoff_base
+        self.backoff_jitter = backoff_jitter
+        if repair_attempts is None:
+            repair_attempts = Config.CONFIG.get("REPAIR_ATTEMPTS", Config.DEFAULTS["REPAIR_ATTEMPTS"])
+        self.repair_attempts = repair_attempts
+        self.repair_latencies = deque(maxlen=1000)  # Seconds from failure event to repair
+        self._schedule = []  # Heap of (due time, sequence, row, attempt, failed at)
+        self._scheduled = set()
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._dispatcher = None
+        self._executor = None
+        self._running = False
 
     def monitor_and_repair(self):
-        """Continuously monitor nodes and repair as necessary."""
-        while True:
-            self.check_nodes()
-            time.sleep(5)  # Check every 5 seconds
+        """Continuously monitor nodes and repair as necessary.
+
+        Starts the event-driven healing engine and returns immediately; call
+        ``stop()`` to shut it down.
+        """
+        self.start()
+
+    def start(self):
+        """Start reacting to node failures."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix="self-healing")
+        self._dispatcher = threading.Thread(target=self._dispatch, name="self-healing-dispatcher", daemon=True)
+        self._dispatcher.start()
+        nodes = self.network_manager.nodes
+        nodes.subscribe(self._on_state_change)
+        # Nodes that were already down before the engine started
+        self._on_state_change(nodes.inactive_indices().copy(), False)
+        logging.info("Self-healing mechanism started.")
+
+    def stop(self):
+        """Stop the healing engine, waiting for in-flight repairs to finish."""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify_all()
+        self.network_manager.nodes.unsubscribe(self._on_state_change)
+        self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+        with self._condition:
+            self._schedule.clear()
+            self._scheduled.clear()
+        logging.info("Self-healing mechanism stopped.")
+
+    @property
+    def pending_repairs(self):
+        """Number of nodes queued or being repaired."""
+        with self._condition:
+            return len(self._scheduled)
+
+    def _on_state_change(self, rows, is_active):
+        """Queue newly failed nodes for repair."""
+        if is_active:
+            return
+        now = time.monotonic()
+        with self._condition:
+            for row in rows.tolist():
+                if row not in self._scheduled:
+                    self._scheduled.add(row)
+                    heapq.heappush(self._schedule, (now, next(self._sequence), row, 0, now))
+            self._condition.notify()
+
+    def _dispatch(self):
+        """Hand due repairs to the worker pool."""
+        with self._condition:
+            while self._running:
+                if not self._schedule:
+                    self._condition.wait()
+                    continue
+                delay = self._schedule[0][0] - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                _, _, row, attempt, failed_at = heapq.heappop(self._schedule)
+                self._executor.submit(self._attempt_repair, row, attempt, failed_at)
+
+    def _attempt_repair(self, row, attempt, failed_at):
+        """Run one repair attempt and reschedule it with backoff if the node is still down."""
+        node = self.network_manager.nodes.view(row)
+        if not node.is_active:
+            self.repair_node(node)
+        if node.is_active:
+            latency = time.monotonic() - failed_at
+            self.repair_latencies.append(latency)
+            if self.network_manager.metrics is not None:
+                self.network_manager.metrics.repair_latency.observe(latency)
+            with self._condition:
+                self._scheduled.discard(row)
+            return
+        attempt += 1
+        if attempt >= self.repair_attempts:
+            self.notify_admin(f"Node {node.node_id} could not be repaired after {attempt} attempts.")
+            with self._condition:
+                self._scheduled.discard(row)
+            return
+        delay = self.backoff_base * 2 ** (attempt - 1) * (1 + random.uniform(0.0, self.backoff_jitter))
+        with self._condition:
+            heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._sequence), row, attempt, failed_at))
+            self._condition.notify()
+
+    def mean_time_to_repair(self):
+        """Mean seconds from failure event to repair over recent repairs."""
+        return float(np.mean(self.repair_latencies)) if self.repair_latencies else 0.0
 
     def check_nodes(self):
-        """Check the status of all nodes and trigger repairs if needed."""
-        for node in self.network_manager.nodes:
-            if not node.is_active:
-                logging.warning(f"Node {node.node_id} is inactive. Attempting repair...")
-                self.repair_node(node)
+        """Check the status of all nodes and trigger repairs if needed.
+
+        Only the network's inactive-node index is visited, so a sweep costs
+        O(inactive nodes) rather than O(N).
+        """
+        inactive = self.network_manager.nodes.inactive_indices().copy()
+        if inactive.size:
+            logging.warning(f"{inactive.size} nodes are inactive. Attempting repair...")
+            return self.repair_many(inactive)
 
     def repair_node(self, node):
         """Attempt to repair a failed node with adaptive strategies."""
-        if node.failure_count < 3:  # Limit the number of repair attempts
+        if node.failure_count < self.MAX_FAILURES:  # Limit the number of repair attempts
             # Adaptive repair strategy based on performance history
             performance_analysis = self.analyze_performance(node)
             if performance_analysis == "unstable":
@@ -37,6 +166,40 @@ class SelfHealingMechanism:
         else:
             logging.error(f"Node {node.node_id} has failed too many times and cannot be repaired.")
 
+    def repair_many(self, node_ids):
+        """Repair many nodes at once with the same adaptive strategy as ``repair_node``.
+
+        All candidates are classified in one vectorized pass over the shared
+        history statistics, then soft resets and full repairs are applied in
+        bulk. Returns a report mapping each outcome to an array of node IDs:
+        ``soft_reset`` (unstable), ``repaired`` (of which
+        ``below_threshold`` had a low mean performance) and ``unrepairable``.
+        """
+        nodes = self.network_manager.nodes
+        rows = np.unique(np.asarray(node_ids, dtype=np.int64))
+        history = nodes.history
+        analysed = history.length(rows) >= 2
+        repairable = nodes.failure_count[rows] < self.MAX_FAILURES
+        unstable = repairable & analysed & (history.std(rows) > 0.1)
+        below_threshold = repairable & analysed & ~unstable & (history.mean(rows) < 0.5)
+
+        soft_reset = rows[unstable]
+        repaired = rows[repairable & ~unstable]
+        nodes.performance[soft_reset] = 0.5  # Reset performance to a safe level
+        nodes.set_active(soft_reset, True)
+        nodes.repair(repaired)
+
+        report = {
+            "soft_reset": nodes.node_id[soft_reset],
+            "repaired": nodes.node_id[repaired],
+            "below_threshold": nodes.node_id[rows[below_threshold]],
+            "unrepairable": nodes.node_id[rows[~repairable]]
+        }
+        logging.info(f"Repaired {repaired.size} nodes and soft-reset {soft_reset.size} unstable nodes.")
+        if report["unrepairable"].size:
+            logging.error(f"{report['unrepairable'].size} nodes have failed too many times and cannot be repaired.")
+        return report
+
     def soft_reset(self, node):
         """Perform a soft reset on the node to restore functionality."""
         node.performance = 0.5  # Reset performance to a safe level
@@ -45,11 +208,10 @@ class SelfHealingMechanism:
 
     def analyze_performance(self, node):
         """Analyze performance history and detect trends."""
-        if len(node.history) < 2:
+        samples, mean_performance, std_dev_performance = node.performance_stats()
+        if samples < 2:
             return "Insufficient data for analysis."
 
-        mean_performance = np.mean(node.history)
-        std_dev_performance = np.std(node.history)
         logging.info(f"Node {node.node_id} performance analysis: Mean = {mean_performance:.2f}, Std Dev = {std_dev_performance:.2f}")
 
         if std_dev_performance > 0.1:
@@ -61,11 +223,9 @@ class SelfHealingMechanism:
 
     def trigger_self_healing(self, anomalies):
         """Trigger self-healing mechanisms based on detected anomalies."""
-        for anomaly in anomalies:
-            node_id = anomaly['node_id']
-            logging.info(f"Detected anomaly in Node {node_id}. Initiating repair...")
-            node = self.network_manager.nodes[node_id]
-            self.repair_node(node)
+        node_ids = [anomaly['node_id'] for anomaly in anomalies]
+        logging.info(f"Detected anomalies in {len(set(node_ids))} nodes. Initiating repair...")
+        return self.repair_many(node_ids)
 
     def notify_admin(self, message):
         """Notify administrators of critical failures or repairs."""
@@ -85,8 +245,14 @@ if __name__ == "__main__":
     network_manager.initialize_network()
     self_healing_mechanism = SelfHealingMechanism(network_manager)
 
-    # Simulate monitoring and self-healing
+    # Simulate failures and let the event-driven engine repair them
+    self_healing_mechanism.start()
     try:
-        self_healing_mechanism.monitor_and_repair()
+        for node_id in range(5):
+            network_manager.simulate_node_failure(node_id)
+            time.sleep(0.5)
+        logging.info(f"Mean time to repair: {self_healing_mechanism.mean_time_to_repair():.4f}s")
     except KeyboardInterrupt:
-        logging.info("Self-healing mechanism stopped.")
+        pass
+    finally:
+        self_healing_mechanism.stop()
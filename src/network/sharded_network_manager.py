@@ -0,0 +1,271 @@
+import logging
+import multiprocessing
+import os
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from network.network_manager import NetworkManager
+
+def _shard_main(connection, start, stop, num_nodes, segment, history_window, seed):
+    """Serve coordinator commands for the nodes ``start:stop`` in a worker process.
+
+    The shard owns a ``NetworkManager`` over its node range and mirrors every
+    activity transition into its slice of the shared activity map.
+    """
+    shm = shared_memory.SharedMemory(name=segment)
+    active_map = np.ndarray((num_nodes,), dtype=np.uint8, buffer=shm.buf)[start:stop]
+    network_manager = NetworkManager(num_nodes=stop - start, redundancy_level=0, history_window=history_window,
+                                     seed=seed, node_ids=np.arange(start, stop))
+    nodes = network_manager.nodes
+
+    def mirror(rows, is_active):
+        active_map[rows] = is_active
+
+    nodes.subscribe(mirror)
+    active_map[:] = nodes.is_active
+    try:
+        while True:
+            command, argument = connection.recv()
+            try:
+                if command == 'tick':
+                    readings = network_manager.monitor_network_vectorized()
+                    performance = readings['performance'][nodes.is_active]
+                    reply = (performance.size, float(performance.sum()), float(np.dot(performance, performance)))
+                elif command == 'fail':
+                    nodes.fail(argument - start)
+                    reply = argument.size
+                elif command == 'repair':
+                    reply = nodes.repair(argument - start) + start
+                elif command == 'deactivate':
+                    reply = nodes.set_active(np.arange(nodes.num_nodes), False).size
+                elif command == 'records':
+                    reply = nodes.to_records()
+                elif command == 'close':
+                    connection.send(None)
+                    break
+                else:
+                    raise ValueError(f"Unknown shard command {command!r}.")
+            except Exception as e:
+                reply = e
+            connection.send(reply)
+    finally:
+        nodes.unsubscribe(mirror)
+        del active_map
+        shm.close()
+        connection.close()
+
+class ShardedNetworkManager:
+    """Network manager whose nodes are split over worker processes.
+
+    Nodes ``0..num_nodes-1`` are divided into ``num_shards`` contiguous
+    ranges (one per core by default), each owned by a worker process running
+    its own ``NetworkManager``. This coordinator sends ticks, failures and
+    repairs to the shards over pipes, to all of them at once, and shards
+    reply with compact deltas: per-tick active count and performance sums,
+    or the rows a repair changed. Node activity is mirrored in a shared
+    memory map with one byte per node, written by the owning shard on every
+    transition, so summaries and redundant-node failover in
+    ``handle_failure`` read the whole ring without messages, including
+    across shard boundaries.
+
+    Per-node performance, telemetry and history stay in the shards;
+    ``get_network_status`` gathers them on request. Call ``close()`` (or
+    ``shutdown_network()``) to stop the workers.
+    """
+
+    def __init__(self, num_nodes=10, num_shards=None, redundancy_level=2, history_window=None, seed=None):
+        self.num_nodes = num_nodes
+        self.num_shards = max(1, min(num_nodes, num_shards or os.cpu_count()))
+        self.redundancy_level = redundancy_level
+        self.history_window = history_window
+        self.bounds = np.linspace(0, num_nodes, self.num_shards + 1).astype(np.int64)
+        self.seeds = np.random.SeedSequence(seed).spawn(self.num_shards)
+        self.last_tick = None
+        self._shm = None
+        self.is_active = None
+        self._connections = []
+        self._processes = []
+
+    def start(self):
+        """Create the shared activity map and start the shard processes."""
+        if self._processes:
+            return
+        resource_tracker.ensure_running()  # Shared by the shards, so only close() unlinks the map
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, self.num_nodes))
+        self.is_active = np.ndarray((self.num_nodes,), dtype=np.uint8, buffer=self._shm.buf)
+        self.is_active[:] = 1
+        for shard, seed in enumerate(self.seeds):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_shard_main, name=f"network-shard-{shard}", daemon=True,
+                args=(child, int(self.bounds[shard]), int(self.bounds[shard + 1]), self.num_nodes, self._shm.name,
+                      self.history_window, int(seed.generate_state(1)[0])))
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        logging.info(f"Started {self.num_shards} network shards for {self.num_nodes} nodes.")
+
+    def _request(self, commands):
+        """Send ``{shard: (command, argument)}`` to all shards at once and return ``{shard: reply}``."""
+        for shard, command in commands.items():
+            self._connections[shard].send(command)
+        replies = {shard: self._connections[shard].recv() for shard in commands}
+        for reply in replies.values():
+            if isinstance(reply, Exception):
+                raise RuntimeError("Network shard failed.") from reply
+        return replies
+
+    def _by_shard(self, command, node_ids):
+        """Split node IDs by owning shard into one command per shard."""
+        shards = np.searchsorted(self.bounds, node_ids, side='right') - 1
+        return {shard: (command, node_ids[shards == shard]) for shard in np.unique(shards).tolist()}
+
+    @property
+    def num_active(self):
+        return int(np.count_nonzero(self.is_active))
+
+    def initialize_network(self):
+        """Start the shards and activate all nodes."""
+        self.start()
+        self._request({shard: ('repair', np.arange(self.bounds[shard], self.bounds[shard + 1]))
+                       for shard in range(self.num_shards)})
+        logging.info(f"Initialized {self.num_nodes} nodes in the network.")
+
+    def monitor_network(self):
+        """Run one monitoring tick on every shard in parallel.
+
+        Returns the number of active nodes and their mean and standard
+        deviation of performance, aggregated from the shards' sums.
+        """
+        start = time.perf_counter()
+        replies = self._request({shard: ('tick', None) for shard in range(self.num_shards)})
+        num_active = sum(count for count, _, _ in replies.values())
+        total = sum(total for _, total, _ in replies.values())
+        total_squares = sum(squares for _, _, squares in replies.values())
+        mean = total / num_active if num_active else 0.0
+        std = np.sqrt(max(0.0, total_squares / num_active - mean * mean)) if num_active else 0.0
+        self.last_tick = {"num_active": num_active, "mean_performance": mean, "std_performance": float(std),
+                          "duration": time.perf_counter() - start}
+        if num_active:
+            logging.info(f"Monitored {num_active} active nodes on {self.num_shards} shards. "
+                         f"Mean performance: {mean:.2f}")
+        return self.last_tick
+
+    def simulate_node_failure(self, node_id):
+        """Simulate a failure in a specific node, or in an array of nodes."""
+        node_ids = np.unique(np.atleast_1d(np.asarray(node_id, dtype=np.int64)))
+        node_ids = node_ids[(node_ids >= 0) & (node_ids < self.num_nodes)]
+        if node_ids.size == 0:
+            return
+        self._request(self._by_shard('fail', node_ids))
+        if node_ids.size == 1:
+            logging.error(f"Node {node_ids[0]} has failed.")
+        else:
+            logging.error(f"{node_ids.size} nodes have failed.")
+        self.handle_failure(node_ids)
+
+    def handle_failure(self, node_id):
+        """Handle the failure of a node (or array of nodes) and activate redundancy if necessary.
+
+        Redundant nodes follow their primary on the ring of all nodes, so the
+        replacement may be owned by a different shard than the failed node.
+        Nodes of the failed batch are never chosen as redundant nodes for
+        each other.
+        """
+        node_ids = np.atleast_1d(np.asarray(node_id, dtype=np.int64))
+        failed = np.unique(node_ids)
+        if node_ids.size == 1:
+            logging.info(f"Handling failure for Node {node_ids[0]}.")
+        else:
+            logging.info(f"Handling failure for {node_ids.size} nodes.")
+        offsets = np.arange(1, self.redundancy_level + 1)
+        # Only nodes with an inactive node on their redundancy ring need a failover
+        ring = (node_ids[:, None] + offsets) % self.num_nodes
+        node_ids = node_ids[(self.is_active[ring] == 0).any(axis=1)]
+        pending = np.ones(node_ids.size, dtype=bool)
+        for i in range(self.redundancy_level):
+            # Activate a redundant node if available
+            redundant_ids = (node_ids + i + 1) % self.num_nodes
+            activate = pending & (self.is_active[redundant_ids] == 0) & ~np.isin(redundant_ids, failed)
+            if not activate.any():
+                continue
+            self._request(self._by_shard('repair', np.unique(redundant_ids[activate])))
+            pending &= ~activate
+            if node_ids.size == 1:
+                logging.info(f"Activated redundant Node {redundant_ids[0]} to replace Node {node_ids[0]}.")
+            else:
+                logging.info(f"Activated {np.count_nonzero(activate)} redundant nodes at offset {i + 1}.")
+
+    def repair(self, node_id):
+        """Reactivate the given nodes at full performance; returns the node IDs actually repaired."""
+        node_ids = np.unique(np.atleast_1d(np.asarray(node_id, dtype=np.int64)))
+        replies = self._request(self._by_shard('repair', node_ids))
+        return np.concatenate([replies[shard] for shard in sorted(replies)]) if replies else node_ids
+
+    def get_network_summary(self):
+        """Return node counts and the inactive node IDs from the shared activity map."""
+        inactive = np.flatnonzero(self.is_active == 0)
+        return {
+            "num_nodes": self.num_nodes,
+            "active": self.num_nodes - inactive.size,
+            "inactive": inactive.size,
+            "inactive_node_ids": inactive.tolist()
+        }
+
+    def get_network_status(self, as_array=False):
+        """Return the status of all nodes, gathered from every shard.
+
+        With ``as_array=True`` a structured ``NodeTable.RECORD_DTYPE`` array is
+        returned instead of a list of dicts.
+        """
+        replies = self._request({shard: ('records', None) for shard in range(self.num_shards)})
+        records = np.concatenate([replies[shard] for shard in range(self.num_shards)])
+        if as_array:
+            return records
+        return [
+            {"node_id": node_id, "is_active": is_active, "performance": performance, "failure_count": failure_count}
+            for node_id, is_active, performance, failure_count in zip(
+                records['node_id'].tolist(), records['is_active'].tolist(),
+                records['performance'].tolist(), records['failure_count'].tolist())
+        ]
+
+    def shutdown_network(self):
+        """Shutdown all nodes in the network and stop the shards."""
+        if self._processes:
+            self._request({shard: ('deactivate', None) for shard in range(self.num_shards)})
+        logging.info("All nodes have been shut down.")
+        self.close()
+
+    def close(self):
+        """Stop the shard processes and free the shared activity map."""
+        for connection in self._connections:
+            connection.send(('close', None))
+            connection.recv()
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+        if self._shm is not None:
+            self.is_active = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __str__(self):
+        return f"ShardedNetworkManager with {self.num_nodes} nodes on {self.num_shards} shards."
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    network_manager = ShardedNetworkManager(num_nodes=1_000_000, num_shards=4, history_window=10, seed=0)
+    network_manager.initialize_network()
+    start = time.perf_counter()
+    for _ in range(10):
+        network_manager.monitor_network()
+    logging.info(f"Mean tick time on {network_manager.num_shards} shards: {(time.perf_counter() - start) / 10 * 1000:.1f} ms")
+    network_manager.simulate_node_failure([250_000, 500_000])
+    network_manager.simulate_node_failure([249_999, 499_999])  # Failover reactivates nodes on the next shards
+    logging.info(network_manager.get_network_summary()["inactive_node_ids"])
+    network_manager.shutdown_network()
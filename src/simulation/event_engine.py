@@ -0,0 +1,113 @@
+import heapq
+import itertools
+import logging
+import random
+import numpy as np
+
+class Recurrence:
+    """Handle for a callback scheduled with ``EventEngine.every``.
+
+    ``event`` is the next pending occurrence; once ``cancelled`` is set no
+    further occurrences are scheduled.
+    """
+
+    __slots__ = ('event', 'cancelled')
+
+    def __init__(self):
+        self.event = None
+        self.cancelled = False
+
+class EventEngine:
+    """Discrete-event scheduler for the Quantum-Pi Network simulations.
+
+    Events are callbacks kept in a heap ordered by virtual time. Running the
+    engine jumps the virtual clock from one event to the next instead of
+    sleeping, so simulated days take seconds of wall time. ``random`` and
+    ``rng`` are seeded from ``seed`` so runs are reproducible.
+    """
+
+    def __init__(self, seed=None, start_time=0.0):
+        self.now = start_time
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+        self.events_processed = 0
+        self.running = False  # True while an event callback runs
+        self._queue = []  # Heap of [time, sequence, callback, args]
+        self._sequence = itertools.count()
+
+    def schedule(self, delay, callback, *args):
+        """Run ``callback(*args)`` after ``delay`` virtual seconds; returns the event."""
+        return self.schedule_at(self.now + delay, callback, *args)
+
+    def schedule_at(self, time, callback, *args):
+        """Run ``callback(*args)`` at virtual time ``time``; returns the event."""
+        if time < self.now:
+            raise ValueError("Cannot schedule an event in the past.")
+        event = [time, next(self._sequence), callback, args]
+        heapq.heappush(self._queue, event)
+        return event
+
+    def every(self, interval, callback, *args):
+        """Run ``callback(*args)`` every ``interval`` virtual seconds, starting one interval from now.
+
+        Returns a ``Recurrence``; cancelling it stops all later occurrences.
+        """
+        recurrence = Recurrence()
+
+        def tick():
+            callback(*args)
+            if not recurrence.cancelled:  # The callback itself may cancel the recurrence
+                recurrence.event = self.schedule(interval, tick)
+
+        recurrence.event = self.schedule(interval, tick)
+        return recurrence
+
+    def cancel(self, event):
+        """Cancel a scheduled event, or every later occurrence of a ``Recurrence``."""
+        if isinstance(event, Recurrence):
+            event.cancelled = True
+            event = event.event
+        event[2] = None
+
+    def step(self):
+        """Process the next event; returns False if the queue is empty."""
+        while self._queue:
+            time, _, callback, args = heapq.heappop(self._queue)
+            if callback is None:
+                continue
+            self.now = time
+            self.running = True
+            try:
+                callback(*args)
+            finally:
+                self.running = False
+            self.events_processed += 1
+            return True
+        return False
+
+    def run(self, until=None, max_events=None):
+        """Process events up to virtual time ``until`` (or until the queue drains)."""
+        processed = 0
+        while self._queue and (max_events is None or processed < max_events):
+            if until is not None and self._queue[0][0] > until:
+                break
+            if self.step():
+                processed += 1
+        if until is not None and until > self.now:
+            self.now = until
+        return processed
+
+    def __len__(self):
+        return sum(1 for event in self._queue if event[2] is not None)
+
+    def __str__(self):
+        return f"EventEngine at t={self.now:.2f}s with {len(self)} pending events."
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    engine = EventEngine(seed=42)
+    engine.every(3600, lambda: logging.info(f"Hourly tick at t={engine.now:.0f}s"))
+    engine.schedule(5400, lambda: logging.info("One-off event at 1.5 h"))
+    engine.run(until=4 * 3600)
+    logging.info(engine)
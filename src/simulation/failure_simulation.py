@@ -1,11 +1,64 @@
+import itertools
 import logging
-import random
-import time
+import numpy as np
+from simulation.event_engine import EventEngine
+
+class ReliabilityMetrics:
+    """Tracks failures, repairs, time-to-repair and availability in virtual time."""
+
+    def __init__(self, nodes, engine):
+        self.nodes = nodes
+        self.engine = engine
+        self.start_time = engine.now
+        self.failures = 0
+        self.repairs = 0
+        self.repair_times = []
+        self._failed_at = np.full(nodes.num_nodes, np.nan)
+        self._active_node_seconds = 0.0
+        self._last_time = engine.now
+        self._last_active = nodes.num_active
+
+    def on_state_change(self, rows, is_active):
+        """Listener for ``NodeTable`` activity transitions."""
+        self._accumulate()
+        if is_active:
+            failed_at = self._failed_at[rows]
+            known = ~np.isnan(failed_at)
+            self.repair_times.extend((self.engine.now - failed_at[known]).tolist())
+            self._failed_at[rows] = np.nan
+            self.repairs += rows.size
+        else:
+            self._failed_at[rows] = self.engine.now
+            self.failures += rows.size
+
+    def _accumulate(self):
+        self._active_node_seconds += self._last_active * (self.engine.now - self._last_time)
+        self._last_time = self.engine.now
+        self._last_active = self.nodes.num_active
+
+    def summary(self):
+        """Return availability, MTTR and event counts for the run so far."""
+        self._accumulate()
+        elapsed = self.engine.now - self.start_time
+        availability = self._active_node_seconds / (self.nodes.num_nodes * elapsed) if elapsed > 0 else 1.0
+        return {
+            "simulated_seconds": elapsed,
+            "availability": availability,
+            "mttr": float(np.mean(self.repair_times)) if self.repair_times else 0.0,
+            "failures": self.failures,
+            "repairs": self.repairs,
+            "failures_per_hour": self.failures / (elapsed / 3600.0) if elapsed > 0 else 0.0
+        }
 
 class FailureSimulation:
-    """Simulates node failures in the Quantum-Pi Network."""
+    """Simulates node failures in the Quantum-Pi Network.
 
-    def __init__(self, network_manager, failure_probabilities=None):
+    Time is virtual: transient outages and repairs are events on an
+    ``EventEngine`` rather than sleeps, and randomness comes from the
+    engine's seeded generators.
+    """
+
+    def __init__(self, network_manager, failure_probabilities=None, engine=None, seed=None, transient_downtime=2.0):
         self.network_manager = network_manager
         # Default failure probabilities for different types of failures
         self.failure_probabilities = failure_probabilities or {
@@ -13,17 +66,92 @@ class FailureSimulation:
             'degradation': 0.2,  # 20% chance of performance degradation
             'transient': 0.1  # 10% chance of transient failure
         }
+        self.engine = engine or EventEngine(seed=seed)
+        self.random = self.engine.random
+        self.transient_downtime = transient_downtime  # Virtual seconds of downtime
+        # Batch number -> (recovery event, recovery method, rows or node) for transient failures still down
+        self._pending_transients = {}
+        self._transient_batches = itertools.count()
 
     def simulate_random_failures(self):
-        """Simulate random failures across the network based on the configured probabilities."""
-        for node in self.network_manager.nodes:
-            failure_type = self.determine_failure_type()
-            if failure_type:
-                self.simulate_failure(node, failure_type)
+        """Simulate random failures across the network based on the configured probabilities.
+
+        Failure types for every node are sampled in one batch and applied as
+        array updates; returns the number of nodes hit by each failure type.
+        Called directly rather than from an engine event, it first recovers
+        the transient failures of the previous call, whose recovery events
+        would otherwise wait for the engine to run.
+        """
+        self._recover_pending_transients()
+        nodes = self.network_manager.nodes
+        failure_types = list(self.failure_probabilities)
+        codes = self.sample_failure_types(nodes.num_nodes)
+        outcome = dict.fromkeys(failure_types, 0)
+        for code, failure_type in enumerate(failure_types):
+            rows = np.flatnonzero(codes == code)
+            outcome[failure_type] = rows.size
+            if rows.size:
+                self.apply_failures(rows, failure_type)
+        if any(outcome.values()):
+            logging.warning(f"Random failures: {outcome}")
+        return outcome
+
+    def sample_failure_types(self, size):
+        """Sample a failure type code per node from the cumulative probabilities.
+
+        Code ``i`` is the ``i``-th key of ``failure_probabilities``; ``len``
+        of the dict means no failure.
+        """
+        cdf = np.cumsum(list(self.failure_probabilities.values()))
+        return np.searchsorted(cdf, self.engine.rng.random(size), side='right')
+
+    def apply_failures(self, rows, failure_type):
+        """Apply one failure type to many table rows at once.
+
+        Complete and transient failures go through the network manager's
+        failover, so its ``redundancy_level`` takes effect.
+        """
+        nodes = self.network_manager.nodes
+        self._count_injected(failure_type, rows.size)
+        if failure_type == 'complete':
+            nodes.fail(rows)  # Mark the nodes as failed
+            self.network_manager.handle_failure(rows)
+        elif failure_type == 'degradation':
+            degradation = self.engine.rng.uniform(0.1, 0.5, size=rows.size)  # Degrade performance by 10% to 50%
+            nodes.performance[rows] = np.maximum(0.0, nodes.performance[rows] - degradation)
+        elif failure_type == 'transient':
+            # Transient failures recover together after the downtime in virtual time
+            nodes.fail(rows)
+            self.network_manager.handle_failure(rows)
+            self._schedule_transient_recovery(self.recover_transients, rows)
+
+    def _schedule_transient_recovery(self, recover, target):
+        """Call ``recover(target)`` after the transient downtime, tracked until it runs."""
+        batch = next(self._transient_batches)
+        event = self.engine.schedule(self.transient_downtime, self._recover_batch, batch)
+        self._pending_transients[batch] = (event, recover, target)
+
+    def _recover_batch(self, batch):
+        _, recover, target = self._pending_transients.pop(batch)
+        recover(target)
+
+    def _recover_pending_transients(self):
+        """Outside a running engine, recover the transient failures whose downtime would never elapse."""
+        if self.engine.running:
+            return
+        for batch, (event, _, _) in list(self._pending_transients.items()):
+            self.engine.cancel(event)
+            self._recover_batch(batch)
+
+    def recover_transients(self, rows):
+        """Automatically repair a batch of nodes after a transient failure."""
+        recovered = self.network_manager.nodes.repair(rows)
+        if recovered.size:
+            logging.info(f"{recovered.size} nodes have recovered from transient failures.")
 
     def determine_failure_type(self):
         """Determine the type of failure based on configured probabilities."""
-        rand_value = random.random()
+        rand_value = self.random.random()
         cumulative_probability = 0.0
         for failure_type, probability in self.failure_probabilities.items():
             cumulative_probability += probability
@@ -32,20 +160,36 @@ class FailureSimulation:
         return None
 
     def simulate_failure(self, node, failure_type):
-        """Simulate a specific type of failure for a node."""
+        """Simulate a specific type of failure for a node.
+
+        As with ``simulate_random_failures``, a direct call first recovers
+        earlier transient failures that are still waiting for the engine.
+        """
+        self._recover_pending_transients()
+        self._count_injected(failure_type, 1)
         if failure_type == 'complete':
             logging.error(f"Node {node.node_id} has completely failed.")
             node.simulate_failure()  # Mark the node as failed
         elif failure_type == 'degradation':
-            degradation_amount = random.uniform(0.1, 0.5)  # Degrade performance by 10% to 50%
+            degradation_amount = self.random.uniform(0.1, 0.5)  # Degrade performance by 10% to 50%
             node.performance = max(0.0, node.performance - degradation_amount)
             logging.warning(f"Node {node.node_id} performance degraded by {degradation_amount:.2f}. Current performance: {node.performance:.2f}")
         elif failure_type == 'transient':
             logging.info(f"Node {node.node_id} has experienced a transient failure.")
-            # Simulate a transient failure (temporary)
+            # Simulate a transient failure (temporary); it recovers after the downtime in virtual time
             node.simulate_failure()
-            time.sleep(2)  # Simulate downtime
-            node.repair()  # Automatically repair after transient failure
+            self._schedule_transient_recovery(self.recover_transient, node)
+
+    def _count_injected(self, failure_type, count):
+        """Count injected failures by type when the network exports metrics."""
+        metrics = self.network_manager.metrics
+        if metrics is not None and failure_type is not None and count:
+            metrics.injected_failures.labels(type=failure_type).inc(count)
+
+    def recover_transient(self, node):
+        """Automatically repair a node after a transient failure."""
+        if not node.is_active:
+            node.repair()
             logging.info(f"Node {node.node_id} has recovered from transient failure.")
 
     def recover_node(self, node):
@@ -60,6 +204,58 @@ class FailureSimulation:
             if not node.is_active:
                 self.recover_node(node)
 
+    def run(self, duration, failure_interval=60.0, mean_repair_time=300.0, self_healing=True, monitor_interval=None):
+        """Run the network for ``duration`` virtual seconds and return reliability metrics.
+
+        Random failures are injected every ``failure_interval`` seconds. With
+        ``self_healing`` each failed node is handed to the network's
+        ``SelfHealingMechanism`` after an exponentially distributed delay with
+        mean ``mean_repair_time``. ``monitor_interval`` optionally adds
+        periodic monitoring ticks. Returns availability (fraction of node-time
+        spent active), MTTR, failures per hour and repair counts.
+        """
+        nodes = self.network_manager.nodes
+        metrics = ReliabilityMetrics(nodes, self.engine)
+        listeners = [metrics.on_state_change]
+        if self_healing:
+            listeners.append(self._schedule_repairs(mean_repair_time))
+        for listener in listeners:
+            nodes.subscribe(listener)
+        ticks = [self.engine.every(failure_interval, self.simulate_random_failures)]
+        if monitor_interval:
+            ticks.append(self.engine.every(monitor_interval, self.network_manager.monitor_network_vectorized,
+                                           self.engine.rng))
+        try:
+            self.engine.run(until=self.engine.now + duration)
+        finally:
+            for tick in ticks:
+                self.engine.cancel(tick)
+            for listener in listeners:
+                nodes.unsubscribe(listener)
+        summary = metrics.summary()
+        logging.info(f"Simulated {duration:.0f}s: availability {summary['availability']:.4f}, "
+                     f"MTTR {summary['mttr']:.1f}s, {summary['failures']} failures, {summary['repairs']} repairs.")
+        return summary
+
+    def _schedule_repairs(self, mean_repair_time):
+        """Return a listener that schedules a repair event for every failed node."""
+        healer = self.network_manager.self_healing_mechanism
+        nodes = self.network_manager.nodes
+
+        def repair_due(rows):
+            rows = rows[~nodes.is_active[rows]]
+            if rows.size:
+                healer.repair_many(rows)
+
+        def on_state_change(rows, is_active):
+            if is_active:
+                return
+            delays = self.engine.rng.exponential(mean_repair_time, size=rows.size)
+            for row, delay in zip(rows.tolist(), delays.tolist()):
+                self.engine.schedule(delay, repair_due, np.array([row]))
+
+        return on_state_change
+
     def report_failures(self):
         """Report the current state of the network after failures."""
         for node in self.network_manager.nodes:
@@ -99,3 +295,9 @@ if __name__ == "__main__":
 
     # Report the state of the network after recovery
     failure_simulation.report_failures()
+
+    # Simulate a day of network behaviour in virtual time
+    logging.getLogger().setLevel(logging.CRITICAL)
+    simulation = FailureSimulation(NetworkManager(num_nodes=100), {'complete': 0.001, 'transient': 0.002}, seed=7)
+    metrics = simulation.run(duration=24 * 3600, failure_interval=60.0, mean_repair_time=120.0)
+    print(metrics)
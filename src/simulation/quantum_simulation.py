@@ -3,16 +3,87 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 class QuantumSimulation:
-    """Simulates quantum behaviors and interactions in the Quantum-Pi Network."""
+    """Simulates quantum behaviors and interactions in the Quantum-Pi Network.
 
-    def __init__(self, num_qubits):
+    The state vector is a complex128 tensor of shape ``(2,) * num_qubits``
+    in ``self.state``, with qubit 0 on the first (most significant) axis.
+    Gates act only on the axes of the qubits involved: single-qubit gates
+    update the two amplitude halves of their axis in place and multi-qubit
+    gates are contracted with ``np.tensordot``, so a gate costs O(2^n) time
+    and memory instead of building a 2^n x 2^n matrix. Controlled gates
+    (CNOT, CZ, controlled phase and controlled-U, with one or more controls)
+    only touch the amplitude blocks where all controls are 1, through index
+    slicing. ``states`` views the state as a ``(2**num_qubits, 1)`` column
+    vector.
+
+    With ``lazy`` set, gates are recorded in ``circuit`` instead of being
+    applied. ``run()`` compiles the recorded circuit by greedily fusing
+    consecutive gates, including gates on disjoint qubits, into blocks of up
+    to ``max_fused_qubits`` qubits, each applied as one dense matrix in a
+    single sweep over the state. Reading ``states`` or measuring runs any
+    pending gates first.
+
+    ``measure(shots=k)`` samples k outcomes at once from the cumulative
+    probabilities of the state, which are cached until the next gate.
+
+    With ``batch_size=B`` the simulation evolves B states at once, held as a
+    ``(B,) + (2,) * num_qubits`` tensor (``states`` is ``(B, 2**num_qubits)``),
+    for parameter sweeps. Every gate accepts a single matrix, broadcast to all
+    states, and ``apply_gate``, ``apply_ry``, ``apply_controlled_gate`` and
+    ``apply_controlled_phase`` also take one gate or angle per state (a
+    ``(B, 2**k, 2**k)`` stack or a ``(B,)`` array). Measurements then return
+    one result per state.
+    """
+
+    MIN_INNER_LOOP = 32  # Shortest run of trailing amplitudes updated through strided views
+
+    def __init__(self, num_qubits, seed=None, lazy=False, max_fused_qubits=4, batch_size=None):
         self.num_qubits = num_qubits
-        self.states = self.initialize_states()
+        self.batch_size = batch_size
+        self._batch_shape = () if batch_size is None else (batch_size,)  # Leading axes before the qubit axes
+        self.rng = np.random.default_rng(seed)
+        self.state = self.initialize_states()
+        self._scratch = None
+        self.lazy = lazy
+        self.max_fused_qubits = max_fused_qubits
+        self.circuit = []  # Recorded (qubits, matrix or native callable) operations, in lazy mode
+        self._cumulative = None  # (state, cumulative probabilities) cached for measure()
 
     def initialize_states(self):
         """Initialize quantum states for the given number of qubits."""
         # Each qubit starts in the |0⟩ state
-        return np.zeros((2**self.num_qubits, 1))
+        state = np.zeros(self._batch_shape + (2,) * self.num_qubits, dtype=np.complex128)
+        state[(Ellipsis,) + (0,) * self.num_qubits] = 1.0
+        return state
+
+    def reset(self):
+        """Return to |0...0⟩, discarding any recorded gates."""
+        self.circuit = []
+        self.state = self.initialize_states()
+
+    @property
+    def states(self):
+        """A copy of the state vector as a ``(2**num_qubits, 1)`` column, after running pending gates.
+
+        Batched simulations return their states as ``(batch_size, 2**num_qubits)``
+        rows. Gates swap the live buffer with a scratch buffer, so a view would
+        be overwritten by the next gate; use ``state`` for zero-copy access.
+        """
+        self.run()
+        states = self.state.reshape(-1, 1) if self.batch_size is None else self.state.reshape(self.batch_size, -1)
+        return states.copy()
+
+    @states.setter
+    def states(self, value):
+        self.state = np.ascontiguousarray(value, dtype=np.complex128).reshape(
+            self._batch_shape + (2,) * self.num_qubits)
+
+    def _broadcastable(self, values):
+        """Shape one value per batched state to broadcast against the state; scalars pass through."""
+        values = np.asarray(values)
+        if values.ndim == 0:
+            return values[()]
+        return values.reshape(values.shape + (1,) * self.num_qubits)
 
     def apply_hadamard(self, qubit_index):
         """Apply the Hadamard gate to a specific qubit."""
@@ -24,73 +95,459 @@ class QuantumSimulation:
         X = np.array([[0, 1], [1, 0]])
         self.apply_gate(X, qubit_index)
 
+    def apply_ry(self, theta, qubit_index):
+        """Rotate a qubit by ``theta`` about the Y axis; ``theta`` may hold one angle per batched state."""
+        cos, sin = np.cos(np.asarray(theta, dtype=np.float64) / 2), np.sin(np.asarray(theta, dtype=np.float64) / 2)
+        self.apply_gate(np.stack([np.stack([cos, -sin], axis=-1), np.stack([sin, cos], axis=-1)], axis=-2),
+                        qubit_index)
+
+    def apply_pauli_z(self, qubit_index):
+        """Apply the Pauli-Z gate to a specific qubit."""
+        self._cumulative = None
+        if self.lazy:
+            self.circuit.append(((qubit_index,), np.diag([1.0, -1.0]).astype(np.complex128)))
+            return
+        self._block(qubit_index, 1)[...] *= -1
+
     def apply_cnot(self, control_index, target_index):
         """Apply the CNOT gate with the specified control and target qubits."""
-        CNOT = np.eye(1)
-        for i in range(self.num_qubits):
-            if i == control_index:
-                CNOT = np.kron(CNOT, np.array([[1, 0], [0, 1]]))  # Control qubit
-            elif i == target_index:
-                CNOT = np.kron(CNOT, np.array([[1, 0], [0, 1]]))  # Target qubit
-            else:
-                CNOT = np.kron(CNOT, np.eye(2))  # Other qubits
-        self.apply_gate(CNOT, control_index)
+        self._cumulative = None
+        if self._record_controlled(np.array([[0, 1], [1, 0]]), control_index, target_index, self.apply_cnot):
+            return
+        zero, one = self._controlled_blocks(control_index, target_index)
+        swap = self._buffers()[:zero.size].reshape(zero.shape)
+        np.copyto(swap, zero)
+        np.copyto(zero, one)
+        np.copyto(one, swap)
+
+    def apply_cz(self, control_index, target_index):
+        """Apply the controlled-Z gate (symmetric in its two qubits)."""
+        self.apply_controlled_phase(np.pi, control_index, target_index)
+
+    def apply_controlled_phase(self, theta, control_index, target_index):
+        """Multiply the amplitudes where control and target are both 1 by ``exp(i theta)``."""
+        self._cumulative = None
+        gate = np.diag([1.0, np.exp(1j * theta)]) if np.ndim(theta) == 0 else None
+        if self._record_controlled(gate, control_index, target_index,
+                                   lambda control, target: self.apply_controlled_phase(theta, control, target)):
+            return
+        _, one = self._controlled_blocks(control_index, target_index)
+        one *= -1.0 if np.ndim(theta) == 0 and theta == np.pi else self._broadcastable(np.exp(1j * np.asarray(theta)))
+
+    def apply_controlled_gate(self, gate, control_index, target_index):
+        """Apply a 2x2 gate to the target qubit where all control qubits are 1.
+
+        ``control_index`` may be a sequence of qubits for multi-controlled gates,
+        and ``gate`` a ``(batch_size, 2, 2)`` stack of one gate per batched state.
+        """
+        self._cumulative = None
+        gate = np.asarray(gate, dtype=np.complex128)
+        if self._record_controlled(gate if gate.ndim == 2 else None, control_index, target_index,
+                                   lambda control, target: self.apply_controlled_gate(gate, control, target)):
+            return
+        zero, one = self._controlled_blocks(control_index, target_index)
+        old_zero, product = (half[:zero.size].reshape(zero.shape) for half in np.split(self._buffers(), 2))
+        g00, g01, g10, g11 = (self._broadcastable(gate[..., row, column]) for row, column in np.ndindex(2, 2))
+        np.copyto(old_zero, zero)
+        np.multiply(one, g01, out=product)
+        zero *= g00
+        zero += product
+        np.multiply(old_zero, g10, out=product)
+        one *= g11
+        one += product
+
+    def _record_controlled(self, gate, control_index, target_index, apply):
+        """In lazy mode, record a controlled gate and return True.
+
+        Gates that fit in a fused block are recorded as their full matrix over
+        (controls..., target); wider ones, and per-batch gates (``gate`` is
+        None), are recorded as a call to the native kernel, run in order when
+        the circuit executes.
+        """
+        if not self.lazy:
+            return False
+        controls = tuple(np.atleast_1d(control_index).tolist())
+        qubits = controls + (target_index,)
+        if target_index in controls:
+            raise ValueError("The target qubit cannot also be a control qubit.")
+        if gate is not None and len(qubits) <= self.max_fused_qubits:
+            matrix = np.eye(2 ** len(qubits), dtype=np.complex128)
+            matrix[-2:, -2:] = gate
+            self.circuit.append((qubits, matrix))
+        else:
+            self.circuit.append((qubits, lambda: apply(list(controls), target_index)))
+        return True
+
+    def _block(self, qubit_index, value):
+        """View of the amplitudes where the given qubit(s) equal ``value``."""
+        offset = len(self._batch_shape)
+        index = [slice(None)] * self.state.ndim
+        for qubit in np.atleast_1d(qubit_index).tolist():
+            index[offset + qubit] = slice(value, value + 1)  # Slices keep even a single amplitude a view
+        return self.state[tuple(index)]
+
+    def _controlled_blocks(self, control_index, target_index):
+        """Views of the control-all-ones subspace with the target at 0 and at 1.
+
+        Controlled gates only touch these two blocks, in place, so no matrix
+        over the other qubits is ever built.
+        """
+        controls = np.atleast_1d(control_index).tolist()
+        if target_index in controls:
+            raise ValueError("The target qubit cannot also be a control qubit.")
+        offset = len(self._batch_shape)
+        index = [slice(None)] * self.state.ndim
+        for qubit in controls:
+            index[offset + qubit] = slice(1, 2)  # Slices keep even a single amplitude a view
+        index[offset + target_index] = slice(0, 1)
+        zero = self.state[tuple(index)]
+        index[offset + target_index] = slice(1, 2)
+        return zero, self.state[tuple(index)]
 
     def apply_gate(self, gate, qubit_index):
-        """Apply a quantum gate to the specified qubit."""
-        # Create the full gate for the multi-qubit system
-        full_gate = np.eye(1)
-        for i in range(self.num_qubits):
-            if i == qubit_index:
-                full_gate = np.kron(full_gate, gate)
+        """Apply a quantum gate to the specified qubit.
+
+        ``gate`` is a 2x2 matrix for one qubit, or a 2^k x 2^k matrix for the
+        ``k`` qubits in ``qubit_index`` (a sequence, first qubit most
+        significant). Batched simulations also take a ``(batch_size, 2**k, 2**k)``
+        stack of one gate per state.
+        """
+        self._cumulative = None
+        qubits = tuple(np.atleast_1d(qubit_index).tolist())
+        gate = np.asarray(gate, dtype=np.complex128)
+        if gate.shape[-2:] != (2 ** len(qubits),) * 2 or gate.ndim not in (2, 3):
+            raise ValueError(f"A gate on {len(qubits)} qubits must be a {2 ** len(qubits)}x{2 ** len(qubits)} matrix.")
+        if gate.ndim == 3 and gate.shape[0] != self.batch_size:
+            raise ValueError(f"A stack of {gate.shape[0]} gates needs a simulation with batch_size={gate.shape[0]}.")
+        if self.lazy:
+            self.circuit.append((qubits, gate if gate.ndim == 2 else lambda: self.apply_gate(gate, qubits)))
+        elif gate.ndim == 3:
+            self._apply_per_state(gate, qubits)
+        elif len(qubits) == 1:
+            self._apply_single(gate, qubits[0])
+        else:
+            self._apply_multi(gate, qubits)
+
+    def _buffers(self):
+        """A reusable state-sized scratch buffer, so gates do not allocate per call."""
+        if self._scratch is None or self._scratch.size != self.state.size:
+            self._scratch = np.empty(self.state.size, dtype=np.complex128)
+        return self._scratch
+
+    def _apply_single(self, gate, qubit):
+        """Apply a 2x2 gate on the axis of ``qubit``.
+
+        The amplitude pairs that differ only in ``qubit`` are updated in place
+        through strided views. When the axes after ``qubit`` are short, those
+        views would make NumPy loop over a handful of elements at a time, so
+        the gate is widened to act on whole trailing blocks and applied as one
+        matrix product into the scratch buffer, which then becomes the state.
+        """
+        amplitudes = self.state.reshape(-1, 2, 2 ** (self.num_qubits - 1 - qubit))
+        trailing = amplitudes.shape[2]
+        scratch = self._buffers()
+        if trailing < self.MIN_INNER_LOOP and amplitudes.shape[0] > 1:
+            block = np.kron(gate, np.eye(trailing)).T
+            np.matmul(amplitudes.reshape(amplitudes.shape[0], -1), block,
+                      out=scratch.reshape(amplitudes.shape[0], -1))
+            self._scratch = self.state.reshape(-1)
+            self.state = scratch.reshape(self.state.shape)
+            return
+        zero, one = amplitudes[:, 0, :], amplitudes[:, 1, :]
+        old_zero, product = (half.reshape(zero.shape) for half in np.split(scratch, 2))
+        np.copyto(old_zero, zero)
+        np.multiply(one, gate[0, 1], out=product)
+        zero *= gate[0, 0]
+        zero += product
+        np.multiply(old_zero, gate[1, 0], out=product)
+        one *= gate[1, 1]
+        one += product
+
+    def _apply_multi(self, gate, qubits):
+        """Apply a k-qubit gate on the axes of ``qubits``.
+
+        Gates on a run of adjacent qubits in ascending order are one matrix
+        product over a ``(before, 2**k, after)`` view of the state, written
+        to the scratch buffer; other gates are contracted with
+        ``np.tensordot``.
+        """
+        k = len(qubits)
+        first = qubits[0]
+        if list(qubits) == list(range(first, first + k)):
+            amplitudes = self.state.reshape(-1, 2 ** k, 2 ** (self.num_qubits - first - k))
+            before, _, after = amplitudes.shape
+            scratch = self._buffers()
+            if after == 1:
+                np.matmul(amplitudes.reshape(before, -1), gate.T, out=scratch.reshape(before, -1))
+            elif (2 ** k) * after <= 64:  # Widen short trailing blocks into one matrix, as for single qubits
+                np.matmul(amplitudes.reshape(before, -1), np.kron(gate, np.eye(after)).T,
+                          out=scratch.reshape(before, -1))
             else:
-                full_gate = np.kron(full_gate, np.eye(2))
-        
-        # Apply the gate to the current state
-        self.states = np.dot(full_gate, self.states)
-
-    def measure(self):
-        """Measure the quantum state and return the result."""
-        probabilities = np.abs(self.states)**2
-        result = np.random.choice(range(2**self.num_qubits), p=probabilities.flatten())
-        logging.info(f"Measurement result: {result}")
-        return result
+                np.matmul(gate, amplitudes, out=scratch.reshape(amplitudes.shape))
+            self._scratch = self.state.reshape(-1)
+            self.state = scratch.reshape(self.state.shape)
+            return
+        axes = [len(self._batch_shape) + qubit for qubit in qubits]
+        tensor = gate.reshape((2,) * (2 * k))
+        result = np.tensordot(tensor, self.state, axes=(list(range(k, 2 * k)), axes))
+        self.state = np.ascontiguousarray(np.moveaxis(result, list(range(k)), axes))
+
+    def _apply_per_state(self, gates, qubits):
+        """Apply one gate from the ``(batch_size, 2**k, 2**k)`` stack ``gates`` to each batched state.
+
+        The gates' qubit axes are moved next to the batch axis, so all states
+        are updated by one broadcast matrix product.
+        """
+        k = len(qubits)
+        axes = [1 + qubit for qubit in qubits]
+        moved = np.moveaxis(self.state, axes, list(range(1, k + 1)))
+        result = np.matmul(gates, moved.reshape(self.batch_size, 2 ** k, -1)).reshape(moved.shape)
+        self.state = np.ascontiguousarray(np.moveaxis(result, list(range(1, k + 1)), axes))
+
+    @staticmethod
+    def _embed(matrix, qubits, support):
+        """Extend a gate on ``qubits`` to the sorted qubits in ``support`` (identity elsewhere)."""
+        if tuple(qubits) == tuple(support):
+            return matrix
+        k, m = len(support), len(qubits)
+        axes = [support.index(qubit) for qubit in qubits]
+        columns = np.eye(2 ** k, dtype=np.complex128).reshape((2,) * k + (2 ** k,))
+        result = np.tensordot(matrix.reshape((2,) * (2 * m)), columns, axes=(list(range(m, 2 * m)), axes))
+        return np.moveaxis(result, list(range(m)), axes).reshape(2 ** k, 2 ** k)
+
+    def compile(self, circuit=None):
+        """Fuse a recorded circuit (``self.circuit`` by default) into blocks.
+
+        Gates are taken in order; each joins the most recent block touching
+        any of its qubits when the union stays within ``max_fused_qubits``
+        qubits (this also batches gates on disjoint qubits), and otherwise
+        starts a new block. Moving a gate into that block is safe because no
+        later block touches its qubits. Native operations are never fused.
+        Returns ``[(sorted qubits, matrix or native callable), ...]``.
+        """
+        blocks = []
+        last_block = {}  # qubit -> index of the last block touching it
+        for qubits, operation in self.circuit if circuit is None else circuit:
+            touched = [last_block[qubit] for qubit in qubits if qubit in last_block]
+            target = max(touched) if touched else (len(blocks) - 1 if blocks else None)
+            if callable(operation):
+                blocks.append((tuple(qubits), operation))
+                target = len(blocks) - 1
+            elif target is not None and not callable(blocks[target][1]) and \
+                    len(set(blocks[target][0]) | set(qubits)) <= self.max_fused_qubits:
+                support = tuple(sorted(set(blocks[target][0]) | set(qubits)))
+                previous = self._embed(blocks[target][1], blocks[target][0], support)
+                blocks[target] = (support, self._embed(operation, qubits, support) @ previous)
+            else:
+                support = tuple(sorted(qubits))
+                blocks.append((support, self._embed(operation, qubits, support)))
+                target = len(blocks) - 1
+            for qubit in qubits:
+                last_block[qubit] = target
+        return blocks
+
+    def run(self):
+        """Compile and execute the recorded circuit; returns the number of passes over the state."""
+        if not self.circuit:
+            return 0
+        gates = len(self.circuit)
+        blocks = self.compile()
+        self.circuit = []
+        for qubits, operation in blocks:
+            if callable(operation):
+                lazy, self.lazy = self.lazy, False
+                try:
+                    operation()
+                finally:
+                    self.lazy = lazy
+            elif len(qubits) == 1:
+                self._apply_single(operation, qubits[0])
+            else:
+                self._apply_multi(operation, qubits)
+        logging.debug(f"Ran {gates} gates in {len(blocks)} fused passes.")
+        return len(blocks)
+
+    def _cumulative_probabilities(self):
+        """Cumulative basis-state probabilities, one row per batched state, normalized to end at 1.
+
+        Cached until the next gate, or until ``state`` is replaced.
+        """
+        self.run()
+        if self._cumulative is None or self._cumulative[0] is not self.state:
+            amplitudes = self.state.reshape(self.batch_size or 1, -1)
+            cumulative = np.cumsum(amplitudes.real ** 2 + amplitudes.imag ** 2, axis=1)
+            cumulative /= cumulative[:, -1:]
+            self._cumulative = (self.state, cumulative)
+        return self._cumulative[1]
+
+    def measure(self, shots=None, as_array=False):
+        """Measure the quantum state without collapsing it.
 
-    def create_entangled_state(self):
+        Returns one basis-state index, or with ``shots`` a dict of counts keyed
+        by bitstring (qubit 0 first) like Aer's ``get_counts``, or with
+        ``as_array=True`` a histogram of counts over all ``2**n`` basis states.
+        Batched simulations return an array of indices, a list of dicts or a
+        ``(batch_size, 2**n)`` histogram, one per state.
+        Fewer shots than basis states are drawn with one ``np.searchsorted``
+        of sorted uniforms over the cumulative probabilities, which keeps the
+        search cache-friendly and groups equal outcomes for counting; more
+        shots are counted directly with one multinomial draw.
+        """
+        cumulative = self._cumulative_probabilities()
+        rows, size = cumulative.shape
+        if shots is None:
+            results = self._search(cumulative, self.rng.random((rows, 1)))[:, 0]
+            result = int(results[0]) if self.batch_size is None else results
+            logging.info(f"Measurement result: {result}")
+            return result
+        if shots >= size:
+            histograms = self.rng.multinomial(shots, np.diff(cumulative, axis=1, prepend=0.0))
+            if as_array:
+                return histograms[0] if self.batch_size is None else histograms
+            outcomes = [np.flatnonzero(histogram) for histogram in histograms]
+            counts = [histogram[row_outcomes] for histogram, row_outcomes in zip(histograms, outcomes)]
+        else:
+            uniforms = self.rng.random((rows, shots))
+            uniforms.sort(axis=1)
+            indices = self._search(cumulative, uniforms)
+            if as_array:
+                histograms = np.bincount((indices + size * np.arange(rows)[:, None]).ravel(),
+                                         minlength=rows * size).reshape(rows, size)
+                return histograms[0] if self.batch_size is None else histograms
+            starts = [np.flatnonzero(np.diff(row, prepend=-1)) for row in indices]
+            outcomes = [row[row_starts] for row, row_starts in zip(indices, starts)]
+            counts = [np.diff(row_starts, append=shots) for row_starts in starts]
+        results = [{format(index, f'0{self.num_qubits}b'): count
+                    for index, count in zip(row_outcomes.tolist(), row_counts.tolist())}
+                   for row_outcomes, row_counts in zip(outcomes, counts)]
+        logging.info(f"Measured {shots} shots: {sum(map(len, results))} distinct outcomes.")
+        return results[0] if self.batch_size is None else results
+
+    @staticmethod
+    def _search(cumulative, uniforms):
+        """Basis-state indices for each row of sorted ``uniforms`` in the matching row of ``cumulative``.
+
+        Rows are offset by their index so that all of them are searched in one
+        ``np.searchsorted`` call over the flattened, still sorted, arrays.
+        """
+        rows, size = cumulative.shape
+        if rows == 1:
+            return np.searchsorted(cumulative[0], uniforms[0], side='right')[None]
+        offsets = np.arange(rows)[:, None]
+        indices = np.searchsorted((cumulative + offsets).ravel(), (uniforms + offsets).ravel(), side='right')
+        return indices.reshape(uniforms.shape) - size * offsets
+
+    def measure_qubit(self, qubit_index):
+        """Measure one qubit, collapse the state accordingly and return the outcome (0 or 1).
+
+        Batched simulations measure the qubit in every state and return an array of outcomes.
+        """
+        self.run()
+        self._cumulative = None
+        one = self._block(qubit_index, 1)
+        probability_one = np.sum(np.abs(one) ** 2, axis=tuple(range(len(self._batch_shape), self.state.ndim)))
+        outcome = self.rng.random(np.shape(probability_one)) < probability_one
+        one *= self._broadcastable(outcome)
+        self._block(qubit_index, 0)[...] *= self._broadcastable(~outcome)
+        self.state /= self._broadcastable(np.sqrt(np.where(outcome, probability_one, 1.0 - probability_one)))
+        return int(outcome) if self.batch_size is None else outcome.astype(np.int64)
+
+    def create_entangled_state(self, qubits=(0, 1)):
         """Create a Bell state (entangled state) between two qubits."""
-        self.initialize_states()
-        self.apply_hadamard(0)  # Apply Hadamard to the first qubit
-        self.apply_cnot(0, 1)    # Apply CNOT with the first qubit as control and second as target
+        self.reset()
+        self.apply_hadamard(qubits[0])  # Apply Hadamard to the first qubit
+        self.apply_cnot(qubits[0], qubits[1])    # Apply CNOT with the first qubit as control and second as target
         logging.info("Entangled state created.")
 
     def simulate_quantum_algorithm(self, algorithm):
         """Simulate a specified quantum algorithm."""
         if algorithm == "quantum_teleportation":
-            self.simulate_quantum_teleportation()
+            return self.simulate_quantum_teleportation()
         elif algorithm == "grovers_search":
-            self.simulate_grovers_search()
+            return self.simulate_grovers_search()
         else:
             logging.error("Unknown quantum algorithm specified.")
 
-    def simulate_quantum_teleportation(self):
-        """Simulate a simple quantum teleportation protocol."""
+    def simulate_quantum_teleportation(self, theta=np.pi / 3, phi=np.pi / 5):
+        """Teleport the state ``cos(theta/2)|0⟩ + exp(i phi) sin(theta/2)|1⟩`` from qubit 0 to qubit 2.
+
+        Qubits 1 and 2 share a Bell pair; qubit 0 is entangled with qubit 1
+        and both are measured, and the outcomes select the X and Z corrections
+        on qubit 2. Returns the two measured bits and the fidelity of the
+        teleported state.
+        """
         logging.info("Starting quantum teleportation simulation...")
-        self.create_entangled_state()  # Create entangled state
-        # Simulate teleportation logic here (omitted for brevity)
-        result = self.measure()
-        logging.info(f"Teleportation result: {result}")
+        if self.num_qubits < 3:
+            logging.error("Quantum teleportation needs at least 3 qubits.")
+            return None
+        if self.batch_size is not None:
+            logging.error("Quantum teleportation runs on an unbatched simulation.")
+            return None
+        message = np.array([np.cos(theta / 2), np.exp(1j * phi) * np.sin(theta / 2)])
+        self.create_entangled_state(qubits=(1, 2))  # Create entangled state
+        self.apply_gate([[message[0], -np.conj(message[1])], [message[1], np.conj(message[0])]], 0)  # |0⟩ -> message
+        self.apply_cnot(0, 1)
+        self.apply_hadamard(0)
+        m0, m1 = self.measure_qubit(0), self.measure_qubit(1)
+        if m1:
+            self.apply_pauli_x(2)
+        if m0:
+            self.apply_pauli_z(2)
+        self.run()
+        received = self.state[(m0, m1) + (slice(None),) + (0,) * (self.num_qubits - 3)]
+        fidelity = float(np.abs(np.vdot(message, received)) ** 2)
+        logging.info(f"Teleportation result: measured {m0}{m1}, fidelity {fidelity:.6f}")
+        return (m0, m1), fidelity
+
+    def apply_grover_diffusion(self):
+        """Reflect the state about the uniform superposition."""
+        qubits = range(self.num_qubits)
+        for qubit in qubits:
+            self.apply_hadamard(qubit)
+            self.apply_pauli_x(qubit)
+        self._apply_phase_flip_all_ones()
+        for qubit in qubits:
+            self.apply_pauli_x(qubit)
+            self.apply_hadamard(qubit)
+
+    def _apply_phase_flip_all_ones(self):
+        """Flip the sign of |1...1⟩ with a multi-controlled Z."""
+        if self.num_qubits == 1:
+            self.apply_pauli_z(0)
+        else:
+            self.apply_controlled_phase(np.pi, list(range(self.num_qubits - 1)), self.num_qubits - 1)
 
-    def simulate_grovers_search(self):
-        """Simulate Grover's Search algorithm."""
+    def simulate_grovers_search(self, marked=None, iterations=None):
+        """Search for the basis state ``marked`` (default ``2**n - 1``) with Grover's algorithm.
+
+        The oracle flips the marked state's phase with X gates around a
+        multi-controlled Z; ``iterations`` defaults to the optimal
+        ``floor(pi / 4 * sqrt(2**n))``. Returns the measured basis state.
+        """
         logging.info("Starting Grover's Search simulation...")
-        # Implement Grover's Search logic here (omitted for brevity)
+        marked = 2 ** self.num_qubits - 1 if marked is None else marked
+        if iterations is None:
+            iterations = int(np.pi / 4 * np.sqrt(2 ** self.num_qubits))
+        zero_bits = [qubit for qubit in range(self.num_qubits) if not (marked >> (self.num_qubits - 1 - qubit)) & 1]
+        self.reset()
+        for qubit in range(self.num_qubits):
+            self.apply_hadamard(qubit)
+        for _ in range(iterations):
+            for qubit in zero_bits:
+                self.apply_pauli_x(qubit)
+            self._apply_phase_flip_all_ones()
+            for qubit in zero_bits:
+                self.apply_pauli_x(qubit)
+            self.apply_grover_diffusion()
         result = self.measure()
         logging.info(f"Grover's Search result: {result}")
+        return result
 
     def visualize_state(self):
         """Visualize the quantum state."""
         plt.figure(figsize=(10, 5))
-        plt.bar(range(len(self.states)), np.abs(self.states.flatten())**2)
+        probabilities = np.abs(self.states.ravel()) ** 2
+        plt.bar(range(probabilities.size), probabilities)
         plt.title('Quantum State Probability Distribution')
         plt.xlabel('State Index')
         plt.ylabel('Probability')
@@ -104,8 +561,8 @@ class QuantumSimulation:
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
-    # Initialize quantum simulation with 2 qubits
-    quantum_simulation = QuantumSimulation(num_qubits=2)
+    # Initialize quantum simulation with 3 qubits
+    quantum_simulation = QuantumSimulation(num_qubits=3)
 
     # Simulate quantum teleportation
     quantum_simulation.simulate_quantum_algorithm("quantum_teleportation")
@@ -113,5 +570,10 @@ if __name__ == "__main__":
     # Simulate Grover's Search
     quantum_simulation.simulate_quantum_algorithm("grovers_search")
 
+    # Sweep an RY rotation angle over 8 batched states at once
+    sweep = QuantumSimulation(num_qubits=1, batch_size=8)
+    sweep.apply_ry(np.linspace(0, np.pi, 8), 0)
+    logging.info(f"P(1) over the sweep: {np.abs(sweep.states[:, 1]) ** 2}")
+
     # Visualize the quantum state
     quantum_simulation.visualize_state()
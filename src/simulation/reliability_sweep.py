@@ -0,0 +1,115 @@
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+METRIC_COLUMNS = ["availability", "mttr", "failures", "failures_per_hour", "repairs"]
+
+def run_replica(task):
+    """Build a network from a task description, run one seeded simulation and return its metrics.
+
+    Tasks are small dicts of parameters, so only those (not network objects)
+    cross the process boundary.
+    """
+    from network.network_manager import NetworkManager
+    from simulation.failure_simulation import FailureSimulation
+
+    network_manager = NetworkManager(num_nodes=task["num_nodes"], redundancy_level=task["redundancy_level"],
+                                     history_window=0, seed=task["seed"])
+    network_manager.initialize_network()
+    simulation = FailureSimulation(network_manager, dict(task["failure_probabilities"]), seed=task["seed"])
+    metrics = simulation.run(duration=task["duration"], failure_interval=task["failure_interval"],
+                             mean_repair_time=task["mean_repair_time"])
+    row = {key: value for key, value in task.items() if key != "failure_probabilities"}
+    row.update({f"p_{name}": probability for name, probability in task["failure_probabilities"]})
+    row.update(metrics)
+    return row
+
+def _configure_worker(log_level):
+    """Keep per-node simulation logging out of worker output."""
+    logging.getLogger().setLevel(log_level)
+
+class ReliabilitySweep:
+    """Monte Carlo reliability sweep over failure profiles, network sizes and redundancy levels.
+
+    Every combination of the grid is run ``replicas`` times with independent
+    seeds spawned from ``seed``, fanned out across a process pool.
+    """
+
+    def __init__(self, failure_probabilities, node_counts, redundancy_levels, replicas=10, duration=24 * 3600,
+                 failure_interval=60.0, mean_repair_time=300.0, seed=None):
+        self.failure_probabilities = failure_probabilities
+        self.node_counts = node_counts
+        self.redundancy_levels = redundancy_levels
+        self.replicas = replicas
+        self.duration = duration
+        self.failure_interval = failure_interval
+        self.mean_repair_time = mean_repair_time
+        self.seed = seed
+
+    def tasks(self):
+        """Return one picklable task dict per replica of every grid point."""
+        grid = list(itertools.product(range(len(self.failure_probabilities)), self.node_counts,
+                                      self.redundancy_levels, range(self.replicas)))
+        seeds = np.random.SeedSequence(self.seed).generate_state(len(grid), dtype=np.uint32)
+        return [
+            {
+                "profile": profile,
+                "failure_probabilities": tuple(self.failure_probabilities[profile].items()),
+                "num_nodes": num_nodes,
+                "redundancy_level": redundancy_level,
+                "replica": replica,
+                "seed": int(seed),
+                "duration": self.duration,
+                "failure_interval": self.failure_interval,
+                "mean_repair_time": self.mean_repair_time
+            }
+            for (profile, num_nodes, redundancy_level, replica), seed in zip(grid, seeds)
+        ]
+
+    def run(self, max_workers=None, output_path=None, log_level=logging.CRITICAL):
+        """Run all replicas on a process pool (all cores by default) and return a DataFrame.
+
+        With ``output_path`` the results are also written as Parquet (for a
+        ``.parquet`` suffix) or CSV.
+        """
+        tasks = self.tasks()
+        max_workers = max_workers or os.cpu_count()
+        chunksize = max(1, len(tasks) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_configure_worker,
+                                 initargs=(log_level,)) as executor:
+            results = pd.DataFrame(list(executor.map(run_replica, tasks, chunksize=chunksize)))
+        logging.info(f"Ran {len(tasks)} replicas on {max_workers} workers.")
+        if output_path:
+            if str(output_path).endswith(".parquet"):
+                results.to_parquet(output_path, index=False)
+            else:
+                results.to_csv(output_path, index=False)
+        return results
+
+    @staticmethod
+    def aggregate(results):
+        """Average the metrics over replicas for every grid point."""
+        keys = ["profile"] + [column for column in results.columns if column.startswith("p_")] + \
+            ["num_nodes", "redundancy_level"]
+        return results.groupby(keys, dropna=False)[METRIC_COLUMNS].agg(["mean", "std"]).reset_index()
+
+    def __str__(self):
+        points = len(self.failure_probabilities) * len(self.node_counts) * len(self.redundancy_levels)
+        return f"ReliabilitySweep over {points} grid points x {self.replicas} replicas."
+
+# Example usage
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sweep = ReliabilitySweep(
+        failure_probabilities=[{'complete': 0.001, 'transient': 0.002}, {'complete': 0.005, 'transient': 0.01}],
+        node_counts=[50, 200],
+        redundancy_levels=[1, 2, 3],
+        replicas=4,
+        duration=6 * 3600,
+        seed=2024
+    )
+    logging.info(sweep)
+    print(ReliabilitySweep.aggregate(sweep.run()))
@@ -35,5 +35,90 @@ class TestAnomalyDetector(unittest.TestCase):
         self.anomaly_detector.trigger_self_healing(anomalies)
         self.assertTrue(self.network_manager.nodes[0].is_active)  # Check if the node is repaired
 
+    def test_model_is_reused_between_refits(self):
+        """Test that the model is fitted on schedule, not on every call."""
+        detector = AnomalyDetector(self.network_manager, refit_interval=5, seed=0)
+        with patch.object(detector, 'train_model', wraps=detector.train_model) as mock_train:
+            for _ in range(10):
+                self.network_manager.monitor_network()
+                detector.detect_anomalies()
+        self.assertEqual(mock_train.call_count, 2)
+
+    def test_only_new_samples_are_scored(self):
+        """Test that already-scored samples are not reported again."""
+        performance_data = [{'node_id': 1, 'performance': 0.1}, {'node_id': 2, 'performance': 0.95}]
+        self.anomaly_detector.update_performance_history(performance_data)
+        anomalies = self.anomaly_detector.detect_anomalies()
+        self.assertEqual([anomaly['node_id'] for anomaly in anomalies], [1])
+        self.assertEqual(anomalies[0]['anomaly_index'], 0)
+        self.assertEqual(self.anomaly_detector.detect_anomalies(), [])
+
+    def test_background_refit(self):
+        """Test that background refits keep scoring with the cached model."""
+        detector = AnomalyDetector(self.network_manager, refit_interval=2, background_refit=True, seed=0)
+        try:
+            for _ in range(6):
+                self.network_manager.monitor_network()
+                detector.detect_anomalies()
+            self.assertTrue(detector.models)
+        finally:
+            detector.close()
+
+    def test_parallel_scoring_matches_serial(self):
+        """Test that scoring on a process pool merges into the same anomalies as serial scoring."""
+        network_manager = NetworkManager(num_nodes=200, seed=0)
+        network_manager.initialize_network()
+        serial = AnomalyDetector(network_manager, cohorts=2, seed=0)
+        parallel = AnomalyDetector(network_manager, cohorts=2, seed=0, n_jobs=2)
+        parallel.parallel_chunk_size = 50
+        try:
+            for _ in range(3):
+                network_manager.monitor_network()
+                self.assertEqual(parallel.detect_anomalies(), serial.detect_anomalies())
+            self.assertEqual(set(parallel._model_segments), {0, 1})
+            self.assertIsNotNone(parallel._pool)
+        finally:
+            parallel.close()
+        self.assertEqual(parallel._model_segments, {})
+
+    def test_healthy_network_is_rarely_flagged(self):
+        """Test that the default detector does not flag a fixed share of stable telemetry, but still flags a drop."""
+        network_manager = NetworkManager(num_nodes=500, seed=0)
+        network_manager.initialize_network()
+        detector = AnomalyDetector(network_manager, seed=0)
+        flagged = 0
+        for _ in range(15):
+            network_manager.nodes.performance[:] = 1.0
+            network_manager.monitor_network()
+            flagged += len(detector.detect_anomalies())
+        self.assertLess(flagged / (15 * 500), 0.05)
+
+        network_manager.nodes.performance[:] = 1.0
+        network_manager.nodes.performance[3] = 0.4
+        network_manager.monitor_network()
+        self.assertIn(3, [anomaly['node_id'] for anomaly in detector.detect_anomalies()])
+
+    def test_multivariate_telemetry(self):
+        """Test that multivariate models flag a node whose telemetry shifts while its performance looks normal."""
+        network_manager = NetworkManager(num_nodes=100, seed=0, telemetry=True)
+        network_manager.initialize_network()
+        with self.assertRaises(ValueError):
+            AnomalyDetector(self.network_manager, multivariate=True)  # Telemetry is off by default
+        detector = AnomalyDetector(network_manager, multivariate=True, refit_interval=100, seed=0)
+        for _ in range(5):
+            network_manager.nodes.performance[:] = 1.0
+            network_manager.monitor_network()
+            detector.detect_anomalies()
+        self.assertEqual(detector.models[0][-1].n_features_in_, 4)
+
+        network_manager.nodes.performance[:] = 1.0
+        network_manager.monitor_network()
+        network_manager.last_readings['telemetry'][7] = (200.0, 50.0, 0.5, 10.0)
+        anomalies = detector.detect_anomalies()
+        self.assertIn(7, [anomaly['node_id'] for anomaly in anomalies])
+        flagged = next(anomaly for anomaly in anomalies if anomaly['node_id'] == 7)
+        self.assertEqual(flagged['telemetry']['latency'], 200.0)
+        self.assertEqual(detector.detect_anomalies(), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_runner():
+    spec = importlib.util.spec_from_file_location('benchmark_runner', os.path.join(ROOT, 'benchmarks', 'run.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class TestBenchmarkRunner(unittest.TestCase):
+    """Smoke tests for the benchmark runner at the smallest network size."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.runner = load_runner()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_results_and_baseline(self):
+        """Test that every suite runs and that a baseline round-trips without regressions."""
+        output = os.path.join(self.directory.name, 'results.json')
+        baseline = os.path.join(self.directory.name, 'baseline.json')
+        argv = ['--sizes', '10', '--repeat', '2', '--min-sample-time', '0.001', '--baseline', baseline]
+        self.assertEqual(self.runner.main(argv + ['--output', output, '--save-baseline']), 0)
+        with open(output) as file:
+            results = json.load(file)
+        self.assertEqual(set(results['results']), {
+            'AlgorithmSuite.time_grovers_search',
+            'AlgorithmSuite.time_teleportation',
+            'AnomalyDetectorSuite.time_detect_anomalies',
+            'FailureSimulationSuite.time_simulate_random_failures',
+            'NetworkManagerSuite.time_monitor_network',
+            'PerformanceMonitorSuite.time_collect_performance_data',
+            'QuantumSimulationSuite.time_ghz',
+            'QuantumSimulationSuite.time_layered_circuit',
+            'QuantumSimulationSuite.time_layered_circuit_fused',
+            'QuantumSimulationSuite.time_measure_shots',
+            'SelfHealingSuite.time_check_nodes',
+            'ShardedNetworkManagerSuite.time_monitor_network',
+        })
+        for params in results['results'].values():
+            self.assertEqual(list(params), ['10'])
+            self.assertGreater(params['10']['median'], 0)
+        self.assertEqual(self.runner.main(argv + ['--bench', 'monitor_network', '--tolerance', '1000']), 0)
+
+    def test_compare_flags_regressions(self):
+        """Test that medians beyond the tolerance are reported as regressions."""
+        baseline = {"results": {"Suite.time_x": {"10": {"median": 1.0}, "1000": {"median": 1.0}}}}
+        results = {"results": {"Suite.time_x": {"10": {"median": 1.2}, "1000": {"median": 2.0}},
+                               "Suite.time_new": {"10": {"median": 5.0}}}}
+        regressions = self.runner.compare(results, baseline, tolerance=1.5)
+        self.assertEqual(regressions, [("Suite.time_x", "1000", 2.0)])
+
+if __name__ == '__main__':
+    unittest.main()
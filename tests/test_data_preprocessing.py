@@ -1,5 +1,7 @@
 # tests/test_data_preprocessing.py
 
+import os
+import tempfile
 import unittest
 import pandas as pd
 from src.data_preprocessing import load_data, clean_data, preprocess_data
@@ -13,11 +15,16 @@ class TestDataPreprocessing(unittest.TestCase):
             'feature2': ['A', 'B', 'A', 'B'],
             'price': [100, 200, 150, 300]
         })
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'test_data.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
 
     def test_load_data(self):
         # Test loading data from a CSV file
-        self.data.to_csv('test_data.csv', index=False)
-        loaded_data = load_data('test_data.csv')
+        self.data.to_csv(self.path, index=False)
+        loaded_data = load_data(self.path)
         pd.testing.assert_frame_equal(loaded_data, self.data)
 
     def test_clean_data(self):
@@ -28,7 +35,8 @@ class TestDataPreprocessing(unittest.TestCase):
 
     def test_preprocess_data(self):
         # Test preprocessing data
-        X, y = preprocess_data('test_data.csv')
+        self.data.to_csv(self.path, index=False)
+        X, y = preprocess_data(self.path)
         self.assertEqual(X.shape[0], 4)  # Should have 4 rows
         self.assertEqual(y.shape[0], 4)  # Should have 4 rows
         self.assertIn('feature1', X.columns)  # Check if feature1 is in the features
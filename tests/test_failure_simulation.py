@@ -0,0 +1,127 @@
+import time
+import unittest
+import numpy as np
+from network.network_manager import NetworkManager
+from simulation.event_engine import EventEngine
+from simulation.failure_simulation import FailureSimulation
+
+class TestFailureSimulation(unittest.TestCase):
+    """Unit tests for the FailureSimulation class."""
+
+    def setUp(self):
+        """Set up a FailureSimulation instance for testing."""
+        self.network_manager = NetworkManager(num_nodes=5, redundancy_level=2)
+        self.network_manager.initialize_network()
+        self.failure_simulation = FailureSimulation(self.network_manager, seed=1)
+
+    def test_transient_failure_uses_virtual_time(self):
+        """Test that a transient failure recovers on the virtual clock without sleeping."""
+        node = self.network_manager.nodes[0]
+        start = time.perf_counter()
+        self.failure_simulation.simulate_failure(node, 'transient')
+        self.assertFalse(node.is_active)
+        self.failure_simulation.engine.run(until=1.0)
+        self.assertFalse(node.is_active)
+        self.failure_simulation.engine.run(until=2.0)
+        self.assertTrue(node.is_active)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_simulate_random_failures_batch(self):
+        """Test batched sampling and application of failure types."""
+        self.failure_simulation.failure_probabilities = {'complete': 0.0, 'degradation': 1.0, 'transient': 0.0}
+        outcome = self.failure_simulation.simulate_random_failures()
+        self.assertEqual(outcome, {'complete': 0, 'degradation': 5, 'transient': 0})
+        self.assertTrue(all(node.performance <= 0.9 for node in self.network_manager.nodes))
+
+        self.failure_simulation.failure_probabilities = {'complete': 0.0, 'degradation': 0.0, 'transient': 1.0}
+        outcome = self.failure_simulation.simulate_random_failures()
+        self.assertEqual(outcome['transient'], 5)
+        self.assertEqual(self.network_manager.nodes.num_active, 0)
+        self.failure_simulation.engine.run(until=self.failure_simulation.transient_downtime)
+        self.assertEqual(self.network_manager.nodes.num_active, 5)
+
+    def test_standalone_calls_recover_transients(self):
+        """Test that without the engine running, transient failures recover on the next call."""
+        self.failure_simulation.failure_probabilities = {'transient': 1.0}
+        self.failure_simulation.simulate_random_failures()
+        self.assertEqual(self.network_manager.nodes.num_active, 0)
+        self.failure_simulation.failure_probabilities = {'transient': 0.0}
+        self.failure_simulation.simulate_random_failures()
+        self.assertEqual(self.network_manager.nodes.num_active, 5)
+        self.assertEqual(len(self.failure_simulation.engine), 0)  # The recovery event was consumed
+
+    def test_standalone_simulate_failure_recovers_transients(self):
+        """Test that a direct transient simulate_failure is recovered by the next direct call."""
+        first, second = self.network_manager.nodes[0], self.network_manager.nodes[1]
+        self.failure_simulation.simulate_failure(first, 'transient')
+        self.assertFalse(first.is_active)
+        self.failure_simulation.simulate_failure(second, 'transient')
+        self.assertTrue(first.is_active)
+        self.assertFalse(second.is_active)
+        self.failure_simulation.failure_probabilities = {'transient': 0.0}
+        self.failure_simulation.simulate_random_failures()
+        self.assertTrue(second.is_active)
+        self.assertEqual(len(self.failure_simulation.engine), 0)
+
+    def test_sample_failure_types(self):
+        """Test that sampled failure types follow the configured probabilities."""
+        codes = self.failure_simulation.sample_failure_types(100000)
+        frequencies = np.bincount(codes, minlength=4) / codes.size
+        np.testing.assert_allclose(frequencies, [0.1, 0.2, 0.1, 0.6], atol=0.01)
+
+    def test_run_is_deterministic(self):
+        """Test that seeded runs report identical metrics."""
+        def run():
+            network_manager = NetworkManager(num_nodes=20)
+            network_manager.initialize_network()
+            simulation = FailureSimulation(network_manager, {'complete': 0.01, 'transient': 0.01}, seed=3)
+            return simulation.run(duration=6 * 3600, failure_interval=60.0, mean_repair_time=60.0)
+
+        first = run()
+        self.assertEqual(first, run())
+        self.assertEqual(first['simulated_seconds'], 6 * 3600)
+        self.assertGreater(first['failures'], 0)
+        self.assertGreater(first['mttr'], 0.0)
+        self.assertTrue(0.0 < first['availability'] <= 1.0)
+
+    def test_run_stops_its_injectors(self):
+        """Test that a finished run leaves no periodic injectors behind on the engine."""
+        self.failure_simulation.run(duration=600, failure_interval=60.0, monitor_interval=30.0)
+        calls = []
+        self.failure_simulation.simulate_random_failures = lambda: calls.append(self.failure_simulation.engine.now)
+        self.failure_simulation.engine.run(until=self.failure_simulation.engine.now + 3600)
+        self.assertEqual(calls, [])
+
+class TestEventEngine(unittest.TestCase):
+    """Unit tests for the EventEngine class."""
+
+    def test_events_run_in_time_order(self):
+        """Test ordering, cancellation and periodic events."""
+        engine = EventEngine(seed=0)
+        calls = []
+        engine.schedule(5.0, calls.append, 'b')
+        engine.schedule(1.0, calls.append, 'a')
+        cancelled = engine.schedule(3.0, calls.append, 'x')
+        engine.cancel(cancelled)
+        engine.every(4.0, calls.append, 'tick')
+        engine.run(until=10.0)
+        self.assertEqual(calls, ['a', 'tick', 'b', 'tick'])
+        self.assertEqual(engine.now, 10.0)
+
+    def test_cancel_recurrence(self):
+        """Test that cancelling an every() handle stops all later occurrences."""
+        engine = EventEngine(seed=0)
+        calls = []
+        recurrence = engine.every(10.0, lambda: calls.append(engine.now))
+        engine.run(until=35.0)
+        engine.cancel(recurrence)
+        engine.run(until=100.0)
+        self.assertEqual(calls, [10.0, 20.0, 30.0])
+        self.assertEqual(len(engine), 0)
+        stop_inside = engine.every(10.0, lambda: engine.cancel(stop_inside))  # Cancelled from its own callback
+        engine.run(until=200.0)
+        self.assertEqual(engine.events_processed, 4)
+        self.assertEqual(len(engine), 0)
+
+if __name__ == '__main__':
+    unittest.main()
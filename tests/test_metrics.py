@@ -0,0 +1,95 @@
+import os
+import tempfile
+import threading
+import unittest
+import urllib.request
+from monitoring.metrics import MetricsRegistry, NetworkMetrics
+from monitoring.performance_monitor import PerformanceMonitor
+from network.network_manager import NetworkManager
+from simulation.failure_simulation import FailureSimulation
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Unit tests for the in-process metrics registry."""
+
+    def setUp(self):
+        """Set up a registry with one metric of each type."""
+        self.registry = MetricsRegistry()
+        self.counter = self.registry.counter('test_events_total', 'Events.', ('kind',))
+        self.gauge = self.registry.gauge('test_level', 'Level.')
+        self.histogram = self.registry.histogram('test_duration_seconds', 'Duration.', buckets=(0.1, 1.0))
+
+    def test_counters_sum_across_threads(self):
+        """Test that per-thread increments are all counted."""
+        def work():
+            for _ in range(1000):
+                self.counter.labels(kind='a').inc()
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.counter.labels(kind='a').value, 4000)
+        with self.assertRaises(ValueError):
+            self.counter.labels(kind='a').inc(-1)
+
+    def test_exposition_format(self):
+        """Test the Prometheus text exposition of all metric types."""
+        self.counter.labels(kind='b').inc(2)
+        self.gauge.set_function(lambda: 7)
+        self.histogram.observe(0.05)
+        self.histogram.observe_many([0.5, 5.0])
+        text = self.registry.exposition()
+        self.assertIn('# TYPE test_events_total counter\ntest_events_total{kind="b"} 2.0\n', text)
+        self.assertIn('test_level 7.0\n', text)
+        self.assertIn('test_duration_seconds_bucket{le="0.1"} 1\n', text)
+        self.assertIn('test_duration_seconds_bucket{le="1.0"} 2\n', text)
+        self.assertIn('test_duration_seconds_bucket{le="+Inf"} 3\n', text)
+        self.assertIn('test_duration_seconds_count 3\n', text)
+        self.assertIn('test_duration_seconds_sum 5.55\n', text)
+
+    def test_textfile(self):
+        """Test writing the textfile collector file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'quantum_pi.prom')
+            self.registry.write_textfile(path)
+            with open(path) as file:
+                self.assertEqual(file.read(), self.registry.exposition())
+
+class TestNetworkMetrics(unittest.TestCase):
+    """Unit tests for the network metrics wiring."""
+
+    def setUp(self):
+        """Set up an instrumented network."""
+        self.network_manager = NetworkManager(num_nodes=20, seed=0)
+        self.network_manager.initialize_network()
+        self.metrics = NetworkMetrics(self.network_manager)
+
+    def tearDown(self):
+        self.metrics.close()
+
+    def test_local_scrape(self):
+        """Test counters, gauges and histograms through a local /metrics scrape."""
+        self.network_manager.nodes.fail([1, 2, 3])
+        self.network_manager.nodes.repair([1])
+        PerformanceMonitor(self.network_manager).analyze_performance(self.network_manager.monitor_network_vectorized())
+        simulation = FailureSimulation(self.network_manager, {'degradation': 1.0}, seed=0)
+        simulation.simulate_random_failures()
+
+        server = self.metrics.registry.serve(port=0)
+        try:
+            url = f'http://127.0.0.1:{server.server_address[1]}/metrics'
+            with urllib.request.urlopen(url) as response:
+                self.assertTrue(response.headers['Content-Type'].startswith('text/plain'))
+                text = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn('quantum_pi_node_failures_total 3.0', text)
+        self.assertIn('quantum_pi_node_repairs_total 1.0', text)
+        self.assertIn('quantum_pi_active_nodes 18.0', text)
+        self.assertIn('quantum_pi_monitor_tick_duration_seconds_count 1', text)
+        self.assertIn('quantum_pi_injected_failures_total{type="degradation"} 20.0', text)
+        self.assertIn('quantum_pi_performance_stddev', text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,8 @@
+import time
 import unittest
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
+import numpy as np
+from network.message_bus import MessageBus
 from network.network_manager import NetworkManager
 
 class TestNetworkManager(unittest.TestCase):
@@ -19,6 +22,45 @@ class TestNetworkManager(unittest.TestCase):
         """Test the network monitoring functionality."""
         self.network_manager.monitor_network()  # Should not raise any exceptions
 
+    def test_monitor_network_vectorized(self):
+        """Test the batched monitoring tick with a seeded generator."""
+        self.network_manager.simulate_node_failure(2)
+        readings = self.network_manager.monitor_network_vectorized(np.random.default_rng(7))
+        self.assertEqual(readings.dtype.names, ('node_id', 'performance'))  # Telemetry is opt-in
+        self.assertEqual(readings['performance'][2], 0.0)
+
+        self.network_manager.telemetry = True
+        readings = self.network_manager.monitor_network_vectorized(np.random.default_rng(7))
+        self.assertEqual(readings.dtype.names, ('node_id', 'performance', 'telemetry'))
+        self.assertEqual(len(readings), 5)
+        self.assertEqual(readings['performance'][2], 0.0)
+        self.assertEqual(readings['telemetry'][2].tolist(), (0.0, 0.0, 0.0, 0.0))
+        self.assertTrue(np.all(readings['telemetry']['latency'][readings['node_id'] != 2] > 0.0))
+        self.assertEqual(readings['telemetry'].dtype.itemsize, 16)  # Four float32 fields
+        self.assertTrue(np.all(readings['performance'][readings['node_id'] != 2] < 1.0))
+
+        other = NetworkManager(num_nodes=5, redundancy_level=2, telemetry=True)
+        other.initialize_network()
+        other.simulate_node_failure(2)
+        other.monitor_network_vectorized(np.random.default_rng(7))
+        np.testing.assert_array_equal(other.monitor_network_vectorized(np.random.default_rng(7)), readings)
+
+    @patch('network.node.random.uniform', return_value=0.05)
+    def test_per_node_telemetry_follows_manager(self, mock_uniform):
+        """Test that per-node monitoring draws telemetry only when enabled, from the seeded generator."""
+        self.network_manager.nodes[1].monitor_performance()
+        self.assertIsNone(self.network_manager.nodes[1].telemetry)  # Telemetry is off by default
+
+        def monitored_telemetry():
+            network_manager = NetworkManager(num_nodes=5, seed=3, telemetry=True)
+            network_manager.initialize_network()
+            network_manager.nodes[1].monitor_performance()
+            return network_manager.nodes[1].telemetry
+
+        first = monitored_telemetry()
+        self.assertGreater(first['latency'], 0.0)
+        self.assertEqual(first, monitored_telemetry())
+
     @patch('network.network_manager.random.random')
     def test_simulate_node_failure(self, mock_random):
         """Test the simulation of node failures."""
@@ -32,17 +74,72 @@ class TestNetworkManager(unittest.TestCase):
         self.network_manager.handle_failure(0)
         self.assertTrue(self.network_manager.nodes[1].is_active)  # Check if a redundant node is activated
 
+    def test_simulate_multiple_node_failures(self):
+        """Test failing an array of nodes in a single call."""
+        self.network_manager.redundancy_level = 0
+        self.network_manager.simulate_node_failure([1, 3, 7])
+        self.assertFalse(self.network_manager.nodes[1].is_active)
+        self.assertFalse(self.network_manager.nodes[3].is_active)
+        self.assertEqual(self.network_manager.nodes[3].failure_count, 1)
+
+    def test_batch_failure_does_not_fail_over_within_batch(self):
+        """Test that nodes failed together are not reactivated as each other's redundant nodes."""
+        self.network_manager.redundancy_level = 0
+        self.network_manager.simulate_node_failure(3)
+        self.network_manager.redundancy_level = 2
+        self.network_manager.simulate_node_failure([1, 2])
+        self.assertFalse(self.network_manager.nodes[1].is_active)
+        self.assertFalse(self.network_manager.nodes[2].is_active)
+        self.assertTrue(self.network_manager.nodes[3].is_active)  # Node 1 fails over to Node 3, outside the batch
+        self.assertEqual(self.network_manager.get_network_summary()['inactive_node_ids'], [1, 2])
+
+    def test_get_network_summary(self):
+        """Test the O(changed) summary of active and inactive nodes."""
+        self.network_manager.redundancy_level = 0
+        self.network_manager.simulate_node_failure([4, 2])
+        summary = self.network_manager.get_network_summary()
+        self.assertEqual(summary['active'], 3)
+        self.assertEqual(summary['inactive_node_ids'], [2, 4])
+        self.assertEqual([node.node_id for node in self.network_manager.inactive_nodes], [2, 4])
+
     def test_get_network_status(self):
         """Test the retrieval of network status."""
         status = self.network_manager.get_network_status()
         self.assertEqual(len(status), 5)
 
-    @patch('network.network_manager.Node.communicate')
+    @patch('network.network_manager.Node.acommunicate')
     def test_communicate_between_nodes(self, mock_communicate):
         """Test communication between nodes."""
         mock_communicate.return_value = "Message received"
         self.network_manager.communicate_between_nodes("Hello, Nodes!")
         mock_communicate.assert_called()
 
+    def test_broadcast_is_concurrent(self):
+        """Test that a broadcast takes about one latency period and fills inboxes."""
+        network_manager = NetworkManager(num_nodes=1000, message_bus=MessageBus(latency=0.1))
+        network_manager.initialize_network()
+        network_manager.simulate_node_failure(5)
+        start = time.perf_counter()
+        responses = network_manager.communicate_between_nodes("Hello, Nodes!")
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(len(responses), len(network_manager.active_nodes))
+        self.assertEqual(network_manager.message_bus.receive(0), ["Hello, Nodes!"])
+        self.assertEqual(network_manager.message_bus.receive(5), [])
+
+    def test_broadcast_uses_partition_index(self):
+        """Test that a broadcast reads the active partition instead of building the active_nodes list."""
+        self.network_manager.simulate_node_failure(3)
+        with patch.object(NetworkManager, 'active_nodes', new_callable=PropertyMock) as mock_active_nodes:
+            responses = self.network_manager.communicate_between_nodes("Hello, Nodes!")
+        mock_active_nodes.assert_not_called()
+        self.assertEqual(len(responses), 4)
+        self.assertEqual(self.network_manager.message_bus.receive(3), [])
+
+    def test_broadcast_loss(self):
+        """Test that lost messages yield no response."""
+        self.network_manager.message_bus = MessageBus(latency=0.0, loss_rate=1.0)
+        responses = self.network_manager.communicate_between_nodes("Hello, Nodes!")
+        self.assertEqual(responses, [None] * 5)
+
 if __name__ == '__main__':
     unittest.main()
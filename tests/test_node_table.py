@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+from network.node import Node
+from network.node_table import NodeTable
+
+class TestNodeTable(unittest.TestCase):
+    """Unit tests for the NodeTable columnar node storage."""
+
+    def setUp(self):
+        """Set up a NodeTable instance for testing."""
+        self.table = NodeTable(num_nodes=5, redundancy_level=2)
+
+    def test_initialization(self):
+        """Test the initialization of the NodeTable."""
+        self.assertEqual(len(self.table), 5)
+        self.assertTrue(self.table.is_active.all())
+        np.testing.assert_array_equal(self.table.performance, np.ones(5))
+        np.testing.assert_array_equal(self.table.node_id, np.arange(5))
+
+    def test_views_write_through(self):
+        """Test that Node views read and write the table's arrays."""
+        node = self.table[2]
+        self.assertIsInstance(node, Node)
+        node.performance = 0.25
+        node.simulate_failure()
+        self.assertEqual(self.table.performance[2], 0.25)
+        self.assertFalse(self.table.is_active[2])
+        self.assertEqual(self.table[2].failure_count, 1)
+        self.assertEqual(self.table[-3], node)
+
+    def test_fail_and_repair(self):
+        """Test batched failure and repair of rows."""
+        self.table.fail([1, 3, 3])
+        self.assertEqual(self.table.failure_count[3], 2)
+        repaired = self.table.repair([0, 1, 3])
+        np.testing.assert_array_equal(repaired, [1, 3])
+        self.assertTrue(self.table.is_active.all())
+
+    def test_degrade(self):
+        """Test that degradation clamps at zero and records history."""
+        self.table.degrade(np.array([0, 1]), np.array([0.5, 2.0]))
+        np.testing.assert_array_equal(self.table.performance[:2], [0.5, 0.0])
+        np.testing.assert_array_equal(self.table[0].history, [0.5])
+
+    def test_activity_indexes_follow_transitions(self):
+        """Test that the active/inactive partition and redundancy ring stay in sync."""
+        table = NodeTable(num_nodes=50, redundancy_level=3)
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            rows = rng.choice(50, size=rng.integers(1, 10), replace=False)
+            if rng.random() < 0.5:
+                table.fail(rows)
+            else:
+                table.repair(rows)
+            np.testing.assert_array_equal(np.sort(table.active_indices()), np.flatnonzero(table.is_active))
+            np.testing.assert_array_equal(np.sort(table.inactive_indices()), np.flatnonzero(~table.is_active))
+            expected = sum(np.roll(~table.is_active, -offset).astype(int) for offset in range(1, 4))
+            np.testing.assert_array_equal(table.inactive_replicas, expected)
+
+    def test_is_active_is_read_only(self):
+        """Test that activity can only change through set_active."""
+        with self.assertRaises(ValueError):
+            self.table.is_active[0] = False
+        self.table[0].is_active = False
+        self.assertEqual(self.table.num_active, 4)
+        np.testing.assert_array_equal(self.table.inactive_indices(), [0])
+
+    def test_to_records(self):
+        """Test the structured-array snapshot."""
+        records = self.table.to_records()
+        self.assertEqual(records.shape, (5,))
+        self.assertEqual(records['node_id'][4], 4)
+
+    def test_simulate_telemetry(self):
+        """Test that telemetry tracks performance in compact float32 columns."""
+        self.table.performance[:] = [1.0, 1.0, 0.2, 1.0, 1.0]
+        self.table.simulate_telemetry(np.arange(5), np.random.default_rng(0))
+        matrix = self.table.telemetry_matrix()
+        self.assertEqual(matrix.shape, (5, 4))
+        self.assertEqual(matrix.dtype, np.float32)
+        self.assertGreater(self.table.telemetry['latency'][2], self.table.telemetry['latency'][0])
+        self.assertLess(self.table.telemetry['throughput'][2], self.table.telemetry['throughput'][0])
+        self.assertEqual(self.table[2].telemetry['latency'], float(self.table.telemetry['latency'][2]))
+
+    def test_nbytes_and_default_window(self):
+        """Test that nbytes counts the activity indexes and telemetry only once it is used."""
+        history_bytes = self.table.history.nbytes
+        self.assertEqual(self.table.history.window, NodeTable.DEFAULT_HISTORY_WINDOW)
+        self.assertEqual(self.table.nbytes, 5 * (8 + 8 + 1 + 4) + 5 * (8 + 8 + 4) + history_bytes)
+        self.table.simulate_telemetry(np.arange(5), np.random.default_rng(0))
+        self.assertEqual(self.table.nbytes, 5 * (8 + 8 + 1 + 4 + 16) + 5 * (8 + 8 + 4) + history_bytes)
+        self.assertEqual(NodeTable.default_history_window(1000), NodeTable.DEFAULT_HISTORY_WINDOW)
+        self.assertEqual(NodeTable.default_history_window(1_000_000), 4)  # 16 MB budget of float32 samples
+        self.assertEqual(NodeTable.default_history_window(10**9), 1)
+
+if __name__ == '__main__':
+    unittest.main()
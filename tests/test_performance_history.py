@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+from network.performance_history import PerformanceHistory, HistoryViews
+
+class TestPerformanceHistory(unittest.TestCase):
+    """Unit tests for the PerformanceHistory ring buffer."""
+
+    def setUp(self):
+        """Set up a PerformanceHistory instance for testing."""
+        self.history = PerformanceHistory(num_nodes=3, window=4, tiers={'rollup': (2, 3)})
+
+    def test_view_is_ordered_and_bounded(self):
+        """Test that views hold the last window samples, oldest first."""
+        for value in range(6):
+            self.history.append([0], [value])
+        view = self.history.view(0)
+        np.testing.assert_array_equal(view, [2, 3, 4, 5])
+        self.assertFalse(view.flags.writeable)
+        self.assertEqual(len(self.history.view(1)), 0)
+
+    def test_incremental_statistics(self):
+        """Test that running mean and std match a full recomputation."""
+        rng = np.random.default_rng(0)
+        samples = rng.uniform(0.0, 1.0, size=(10, 3)).astype(np.float32).astype(np.float64)  # Stored precision
+        for row in samples:
+            self.history.append(np.arange(3), row)
+        np.testing.assert_allclose(self.history.mean(), samples[-4:].mean(axis=0))
+        np.testing.assert_allclose(self.history.std(), samples[-4:].std(axis=0), atol=1e-12)
+
+    def test_append_where(self):
+        """Test masked appends only touch the selected rows."""
+        self.history.append_where(np.array([True, False, True]), np.array([0.1, 0.2, 0.3]))
+        np.testing.assert_array_equal(self.history.length(), [1, 0, 1])
+        np.testing.assert_array_equal(self.history.latest(), np.array([0.1, 0.0, 0.3], dtype=np.float32))
+
+    def test_rollup_tier(self):
+        """Test that tiers store the mean of every rollup_factor samples."""
+        for value in [1.0, 3.0, 5.0, 7.0, 9.0]:
+            self.history.append([0], [value])
+        np.testing.assert_array_equal(self.history.tiers['rollup'].view(0), [2.0, 6.0])
+
+    def test_view_unrolls_wrapped_ring(self):
+        """Test that views stay ordered at every ring position, before and after the ring wraps."""
+        for value in range(11):
+            self.history.append([1], [value])
+            expected = np.arange(max(0, value - 3), value + 1)
+            np.testing.assert_array_equal(self.history.view(1), expected)
+            np.testing.assert_array_equal(self.history.recent([1], 2)[0, :min(2, value + 1)], expected[::-1][:2])
+        self.assertEqual(self.history._data.shape, (4, 3))  # One float32 copy of each sample
+        self.assertEqual(self.history._data.dtype, np.float32)
+
+    def test_full_appends_match_scattered_appends(self):
+        """Test that appending to every node at once stores the same history as per-node appends."""
+        rng = np.random.default_rng(0)
+        full, scattered = PerformanceHistory(5, window=4), PerformanceHistory(5, window=4)
+        for tick in range(10):
+            values = rng.uniform(size=5)
+            full.append(np.arange(5), values)
+            scattered.append([3, 4], values[3:])
+            scattered.append([0, 1, 2], values[:3])
+            if tick == 6:  # A partial tick leaves the full-append path for good
+                full.append_where(np.array([True, False, True, True, True]), values + 1)
+                scattered.append([0, 2, 3, 4], values[[0, 2, 3, 4]] + 1)
+        self.assertFalse(full._aligned)
+        for row in range(5):
+            np.testing.assert_array_equal(full.view(row), scattered.view(row))
+        np.testing.assert_allclose(full.mean(), scattered.mean())
+        np.testing.assert_allclose(full.std(), scattered.std())
+
+    def test_memory_is_flat(self):
+        """Test that appending does not grow the buffers."""
+        nbytes = self.history.nbytes
+        for _ in range(100):
+            self.history.append(np.arange(3), np.ones(3))
+        self.assertEqual(self.history.nbytes, nbytes)
+
+    def test_history_views(self):
+        """Test the read-only mapping over the buffer."""
+        for value in range(5):
+            self.history.append([2], [value])
+        views = HistoryViews(self.history, limit=2)
+        self.assertEqual(len(views), 3)
+        np.testing.assert_array_equal(views[2], [3, 4])
+        with self.assertRaises(KeyError):
+            views[3]
+
+if __name__ == '__main__':
+    unittest.main()
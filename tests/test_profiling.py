@@ -0,0 +1,67 @@
+import importlib.util
+import os
+import tempfile
+import time
+import unittest
+from monitoring import profiling
+from monitoring.profiling import TickProfiler
+
+class TestTickProfiler(unittest.TestCase):
+    """Unit tests for the TickProfiler class."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_stage_summary(self):
+        """Test rolling per-stage percentiles of wall time, CPU time and allocations."""
+        profiler = TickProfiler(window=10, track_allocations=True)
+        try:
+            for _ in range(20):
+                with profiler.tick():
+                    with profiler.stage('sleep'):
+                        time.sleep(0.002)
+                    with profiler.stage('allocate'):
+                        data = bytearray(100000)
+        finally:
+            profiler.close()
+        summary = profiler.summary()
+        self.assertEqual(set(summary), {'tick', 'sleep', 'allocate'})
+        self.assertEqual(len(profiler.samples['sleep']['wall']), 10)
+        self.assertGreaterEqual(summary['sleep']['wall']['p50'], 0.002)
+        self.assertLess(summary['sleep']['cpu']['p50'], 0.002)
+        self.assertGreaterEqual(summary['allocate']['peak']['p50'], 100000)
+        self.assertLessEqual(summary['tick']['wall']['p50'], summary['tick']['wall']['p99'])
+        self.assertIn('allocate', profiler.format_summary())
+        del data
+
+    def test_profile_capture(self):
+        """Test that every N-th tick is dumped as a cProfile and collapsed-stack profile."""
+        profiler = TickProfiler(profile_every=2, profile_dir=self.directory.name, flamegraph=True)
+        for _ in range(4):
+            with profiler.tick():
+                with profiler.stage('work'):
+                    sum(i * i for i in range(200000))
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         ['tick-000002.folded', 'tick-000002.prof', 'tick-000004.folded', 'tick-000004.prof'])
+        with open(os.path.join(self.directory.name, 'tick-000002.folded')) as file:
+            line = file.readline()
+        self.assertRegex(line, r'^\S.* \d+$')
+
+    def test_main_loop_stages(self):
+        """Test that the monitoring loop reports every stage."""
+        # Load src/main.py by path; the repository root has its own main.py
+        path = os.path.join(os.path.dirname(os.path.dirname(profiling.__file__)), 'main.py')
+        spec = importlib.util.spec_from_file_location('quantum_pi_main', path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        profiler = module.main(['--ticks', '3', '--interval', '0', '--profile-every', '3',
+                         '--profile-dir', self.directory.name])
+        self.assertEqual(profiler.ticks, 3)
+        self.assertEqual(set(profiler.summary()), {'tick', 'collect', 'detect', 'repair', 'inject'})
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'tick-000003.prof')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+import unittest
+from functools import reduce
+import numpy as np
+from simulation.quantum_simulation import QuantumSimulation
+
+def dense_gate(gate, qubit, num_qubits):
+    """Reference full-size matrix of a single-qubit gate, qubit 0 most significant."""
+    return reduce(np.kron, [gate if i == qubit else np.eye(2) for i in range(num_qubits)])
+
+def random_unitary(rng, size):
+    matrix = rng.normal(size=(size, size)) + 1j * rng.normal(size=(size, size))
+    return np.linalg.qr(matrix)[0]
+
+class TestQuantumSimulation(unittest.TestCase):
+    """Unit tests for the QuantumSimulation class."""
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_initial_state(self):
+        """Test that all qubits start in |0⟩ as a complex state tensor."""
+        simulation = QuantumSimulation(num_qubits=3)
+        self.assertEqual(simulation.state.shape, (2, 2, 2))
+        self.assertEqual(simulation.state.dtype, np.complex128)
+        np.testing.assert_array_equal(simulation.states.ravel(), np.eye(8)[0])
+
+    def test_states_survive_later_gates(self):
+        """Test that ``states`` is a snapshot that later gates do not overwrite."""
+        simulation = QuantumSimulation(num_qubits=3)
+        simulation.apply_pauli_x(0)
+        before = simulation.states
+        for qubit in range(3):
+            simulation.apply_hadamard(qubit)
+        simulation.run()
+        np.testing.assert_array_equal(before.ravel(), np.eye(8)[4])
+        self.assertFalse(np.shares_memory(before, simulation.state))
+
+    def test_single_qubit_gates_match_dense_reference(self):
+        """Test single-qubit gates on every axis against Kronecker-product matrices."""
+        for num_qubits in (1, 3, 7):
+            simulation = QuantumSimulation(num_qubits)
+            expected = simulation.states.copy()
+            for _ in range(30):
+                gate, qubit = random_unitary(self.rng, 2), int(self.rng.integers(num_qubits))
+                simulation.apply_gate(gate, qubit)
+                expected = dense_gate(gate, qubit, num_qubits) @ expected
+            np.testing.assert_allclose(simulation.states, expected, atol=1e-12)
+
+    def test_two_qubit_gate_axis_order(self):
+        """Test that a 4x4 gate acts on its qubits in the given order."""
+        simulation = QuantumSimulation(num_qubits=4)
+        simulation.apply_pauli_x(3)
+        simulation.apply_cnot(3, 1)  # Control on the last qubit, target before it
+        self.assertEqual(int(np.flatnonzero(simulation.states.ravel())[0]), 0b0101)
+        with self.assertRaises(ValueError):
+            simulation.apply_gate(np.eye(4), 0)
+
+    def test_controlled_gates_match_dense_reference(self):
+        """Test the controlled-gate kernel against the same gates applied as 4x4 matrices."""
+        phase = np.exp(0.7j)
+        gates = {
+            'cnot': (lambda simulation, c, t: simulation.apply_cnot(c, t), np.array([[0, 1], [1, 0]])),
+            'cz': (lambda simulation, c, t: simulation.apply_cz(c, t), np.diag([1, -1])),
+            'cphase': (lambda simulation, c, t: simulation.apply_controlled_phase(0.7, c, t), np.diag([1, phase])),
+        }
+        unitary = random_unitary(self.rng, 2)
+        gates['cu'] = (lambda simulation, c, t: simulation.apply_controlled_gate(unitary, c, t), unitary)
+        for name, (apply, gate) in gates.items():
+            for control, target in ((0, 3), (3, 1), (2, 0)):
+                with self.subTest(gate=name, control=control, target=target):
+                    simulation, reference = QuantumSimulation(4), QuantumSimulation(4)
+                    for qubit in range(4):
+                        u = random_unitary(self.rng, 2)
+                        simulation.apply_gate(u, qubit)
+                        reference.apply_gate(u, qubit)
+                    apply(simulation, control, target)
+                    controlled = np.eye(4, dtype=complex)
+                    controlled[2:, 2:] = gate
+                    reference.apply_gate(controlled, (control, target))
+                    np.testing.assert_allclose(simulation.states, reference.states, atol=1e-12)
+        with self.assertRaises(ValueError):
+            QuantumSimulation(2).apply_cnot(1, 1)
+
+    def test_multi_controlled_phase(self):
+        """Test that a doubly controlled Z only flips |111⟩."""
+        simulation = QuantumSimulation(num_qubits=3)
+        for qubit in range(3):
+            simulation.apply_hadamard(qubit)
+        simulation.apply_controlled_phase(np.pi, [0, 1], 2)
+        expected = np.full(8, 8 ** -0.5)
+        expected[7] *= -1
+        np.testing.assert_allclose(simulation.states.ravel(), expected, atol=1e-12)
+
+    def test_teleportation(self):
+        """Test that teleportation reproduces the message state on qubit 2 for any outcome."""
+        simulation = QuantumSimulation(num_qubits=3, seed=0)
+        outcomes = set()
+        for _ in range(12):
+            bits, fidelity = simulation.simulate_quantum_teleportation(theta=1.1, phi=0.4)
+            outcomes.add(bits)
+            self.assertAlmostEqual(fidelity, 1.0)
+        self.assertGreater(len(outcomes), 1)
+        self.assertIsNone(QuantumSimulation(num_qubits=2).simulate_quantum_teleportation())
+
+    def test_grovers_search(self):
+        """Test that Grover's search amplifies the marked state."""
+        simulation = QuantumSimulation(num_qubits=6, seed=0)
+        self.assertEqual(simulation.simulate_grovers_search(marked=41), 41)
+        self.assertGreater(np.abs(simulation.states[41, 0]) ** 2, 0.99)
+
+    def test_entangled_state(self):
+        """Test that the Bell state has equal weight on |00⟩ and |11⟩."""
+        simulation = QuantumSimulation(num_qubits=2)
+        simulation.create_entangled_state()
+        np.testing.assert_allclose(simulation.states.ravel(), [2 ** -0.5, 0, 0, 2 ** -0.5], atol=1e-12)
+        self.assertIn(simulation.measure(), (0, 3))
+
+    def random_circuit(self, simulation, num_gates):
+        """Apply a random mix of gates, as recorded in lazy mode or applied eagerly."""
+        num_qubits = simulation.num_qubits
+        rng = np.random.default_rng(1)
+        for _ in range(num_gates):
+            kind = int(rng.integers(6))
+            qubits = [int(qubit) for qubit in rng.permutation(num_qubits)[:4]]
+            if kind == 0:
+                simulation.apply_gate(random_unitary(rng, 2), qubits[0])
+            elif kind == 1:
+                simulation.apply_gate(random_unitary(rng, 4), qubits[:2])
+            elif kind == 2:
+                simulation.apply_cnot(qubits[0], qubits[1])
+            elif kind == 3:
+                simulation.apply_controlled_phase(float(rng.uniform(0, np.pi)), qubits[0], qubits[1])
+            elif kind == 4:
+                simulation.apply_pauli_z(qubits[0])
+            else:
+                simulation.apply_controlled_gate(random_unitary(rng, 2), qubits[:3], qubits[3])
+
+    def test_lazy_circuit_matches_eager(self):
+        """Test that fused lazy circuits give the same state as applying gates one by one."""
+        for num_qubits, max_fused_qubits in ((4, 2), (6, 3), (9, 4), (9, 5)):
+            with self.subTest(num_qubits=num_qubits, max_fused_qubits=max_fused_qubits):
+                eager = QuantumSimulation(num_qubits)
+                lazy = QuantumSimulation(num_qubits, lazy=True, max_fused_qubits=max_fused_qubits)
+                self.random_circuit(eager, 60)
+                self.random_circuit(lazy, 60)
+                np.testing.assert_array_equal(lazy.state.ravel(), np.eye(2 ** num_qubits)[0])  # Nothing ran yet
+                np.testing.assert_allclose(lazy.states, eager.states, atol=1e-12)
+                self.assertEqual(lazy.circuit, [])
+
+    def test_fusion_reduces_passes(self):
+        """Test that layers of gates fuse into a few sweeps over the state."""
+        simulation = QuantumSimulation(num_qubits=8, lazy=True, max_fused_qubits=4)
+        for _ in range(10):
+            for qubit in range(8):
+                simulation.apply_hadamard(qubit)
+        self.assertEqual(simulation.run(), 2)  # 80 gates on two groups of four qubits
+        simulation.create_entangled_state()
+        self.assertEqual(simulation.run(), 1)
+        np.testing.assert_allclose(simulation.states[[0, 2 ** 6 * 3]].ravel(), [2 ** -0.5] * 2, atol=1e-12)
+        self.assertEqual(QuantumSimulation(num_qubits=6, lazy=True).simulate_grovers_search(marked=41), 41)
+
+    def test_measure_shots(self):
+        """Test that batched shots follow the state's distribution and reuse the cached probabilities."""
+        simulation = QuantumSimulation(num_qubits=3, seed=0)
+        simulation.apply_hadamard(0)
+        simulation.apply_cnot(0, 2)
+        for shots in (100, 100_000):  # Sampled, then counted with one multinomial draw
+            with self.subTest(shots=shots):
+                counts = simulation.measure(shots=shots)
+                self.assertEqual(set(counts), {'000', '101'})
+                self.assertEqual(sum(counts.values()), shots)
+                self.assertAlmostEqual(counts['101'] / shots, 0.5, delta=0.15 if shots == 100 else 0.01)
+                histogram = simulation.measure(shots=shots, as_array=True)
+                self.assertEqual(histogram.shape, (8,))
+                self.assertEqual(histogram.sum(), shots)
+                self.assertEqual(np.count_nonzero(histogram[[1, 2, 3, 4, 6, 7]]), 0)
+        cumulative = simulation._cumulative_probabilities()
+        self.assertIs(simulation._cumulative_probabilities(), cumulative)
+        simulation.apply_pauli_x(1)
+        self.assertEqual(set(simulation.measure(shots=100)), {'010', '111'})
+        self.assertIn(simulation.measure(), (2, 7))
+        simulation.state = simulation.initialize_states()
+        self.assertEqual(simulation.measure(shots=10), {'000': 10})
+
+    def test_batched_parameter_sweep(self):
+        """Test that each batched state evolves like its own unbatched simulation."""
+        angles = self.rng.uniform(0, np.pi, size=(5, 4))
+        unitaries = np.stack([random_unitary(self.rng, 4) for _ in range(5)])
+        controlled = np.stack([random_unitary(self.rng, 2) for _ in range(5)])
+        for lazy in (False, True):
+            with self.subTest(lazy=lazy):
+                batched = QuantumSimulation(num_qubits=4, lazy=lazy, batch_size=5)
+                for qubit in range(4):
+                    batched.apply_ry(angles[:, qubit], qubit)
+                batched.apply_cnot(0, 3)
+                batched.apply_gate(unitaries, [3, 1])
+                batched.apply_controlled_gate(controlled, [0, 1], 2)
+                batched.apply_controlled_phase(angles[:, 0], 2, 0)
+                batched.apply_hadamard(2)
+                self.assertEqual(batched.states.shape, (5, 16))
+                for row in range(5):
+                    simulation = QuantumSimulation(num_qubits=4)
+                    for qubit in range(4):
+                        simulation.apply_ry(angles[row, qubit], qubit)
+                    simulation.apply_cnot(0, 3)
+                    simulation.apply_gate(unitaries[row], [3, 1])
+                    simulation.apply_controlled_gate(controlled[row], [0, 1], 2)
+                    simulation.apply_controlled_phase(angles[row, 0], 2, 0)
+                    simulation.apply_hadamard(2)
+                    np.testing.assert_allclose(batched.states[row], simulation.states.ravel(), atol=1e-12)
+        with self.assertRaises(ValueError):
+            QuantumSimulation(num_qubits=4, batch_size=3).apply_gate(unitaries, [0, 1])
+
+    def test_batched_measurement(self):
+        """Test that batched measurements return one result per state."""
+        simulation = QuantumSimulation(num_qubits=2, seed=0, batch_size=3)
+        simulation.apply_ry(np.array([0.0, np.pi, np.pi / 2]), 1)
+        np.testing.assert_array_equal(simulation.measure()[:2], [0, 1])
+        for shots in (3, 1000):
+            with self.subTest(shots=shots):
+                counts = simulation.measure(shots=shots)
+                self.assertEqual(counts[:2], [{'00': shots}, {'01': shots}])
+                self.assertEqual(sum(counts[2].values()), shots)
+                histograms = simulation.measure(shots=shots, as_array=True)
+                self.assertEqual(histograms.shape, (3, 4))
+                np.testing.assert_array_equal(histograms.sum(axis=1), [shots] * 3)
+        outcomes = simulation.measure_qubit(1)
+        np.testing.assert_array_equal(outcomes[:2], [0, 1])
+        np.testing.assert_allclose(np.linalg.norm(simulation.states, axis=1), 1.0)
+        np.testing.assert_allclose(np.abs(simulation.states[2, outcomes[2]]), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from simulation.reliability_sweep import ReliabilitySweep, run_replica
+
+class TestReliabilitySweep(unittest.TestCase):
+    """Unit tests for the ReliabilitySweep runner."""
+
+    def setUp(self):
+        """Set up a small ReliabilitySweep for testing."""
+        self.sweep = ReliabilitySweep(
+            failure_probabilities=[{'complete': 0.01}, {'complete': 0.01, 'transient': 0.02}],
+            node_counts=[10],
+            redundancy_levels=[1, 2],
+            replicas=2,
+            duration=3600,
+            seed=11
+        )
+
+    def test_tasks(self):
+        """Test that every grid point gets seeded, picklable replicas."""
+        tasks = self.sweep.tasks()
+        self.assertEqual(len(tasks), 8)
+        self.assertEqual(len({task['seed'] for task in tasks}), 8)
+        self.assertEqual(tasks, self.sweep.tasks())
+
+    def test_run_replica_is_reproducible(self):
+        """Test that a task yields the same metrics every time."""
+        task = self.sweep.tasks()[3]
+        self.assertEqual(run_replica(task), run_replica(task))
+
+    def test_redundancy_improves_availability(self):
+        """Test that the same seeded replica is more available at higher redundancy levels."""
+        task = dict(self.sweep.tasks()[0], num_nodes=50, duration=6 * 3600, mean_repair_time=900.0,
+                    failure_probabilities=(('complete', 0.005), ('transient', 0.005)))
+        availability = [run_replica(dict(task, redundancy_level=level))['availability'] for level in (0, 1, 3)]
+        self.assertLess(availability[0], availability[1])
+        self.assertLess(availability[1], availability[2])
+
+    def test_run_and_aggregate(self):
+        """Test the process-pool run and the per-grid-point aggregation."""
+        results = self.sweep.run(max_workers=2)
+        self.assertEqual(len(results), 8)
+        self.assertIn('availability', results.columns)
+        summary = ReliabilitySweep.aggregate(results)
+        self.assertEqual(len(summary), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from monitoring.anomaly_detection import AnomalyDetector
+from monitoring.performance_monitor import PerformanceMonitor
+from monitoring.reporting import PerformanceReport
+from network.network_manager import NetworkManager
+from network.performance_history import PerformanceHistory
+
+class TestPerformanceReport(unittest.TestCase):
+    """Unit tests for the PerformanceReport class."""
+
+    def setUp(self):
+        """Set up a history with one clearly degraded node."""
+        self.history = PerformanceHistory(num_nodes=500, window=40)
+        rng = np.random.default_rng(0)
+        for _ in range(40):
+            values = rng.uniform(0.7, 1.0, size=500)
+            values[123] = 0.2
+            self.history.append(np.arange(500), values)
+        self.report = PerformanceReport(self.history, top_k=3, max_nodes=100, max_points=10, seed=0)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_compute_is_bounded(self):
+        """Test that the aggregate is sampled, downsampled and finds the worst node."""
+        data = self.report.compute()
+        self.assertEqual(data["sampled_nodes"], 100)
+        self.assertEqual(data["bands"].shape, (5, 10))
+        self.assertEqual(data["worst"].shape, (3, 10))
+        self.assertEqual(data["worst_node_ids"][0], 123)
+        self.assertTrue(np.all(data["bands"][0] <= data["bands"][-1]))
+
+    def test_render_png_reuses_background(self):
+        """Test repeated PNG renders reuse the cached background."""
+        path = os.path.join(self.directory.name, 'report.png')
+        self.report.render(path)
+        background = self.report._background
+        self.report.render(path)
+        self.assertIs(self.report._background, background)
+        with open(path, 'rb') as file:
+            self.assertEqual(file.read(8), b'\x89PNG\r\n\x1a\n')
+
+    def test_render_svg_and_json(self):
+        """Test SVG output and the compact JSON export."""
+        svg_path = os.path.join(self.directory.name, 'report.svg')
+        json_path = os.path.join(self.directory.name, 'report.json')
+        self.report.render(svg_path)
+        self.assertGreater(os.path.getsize(svg_path), 0)
+        self.report.write_json(json_path)
+        with open(json_path) as file:
+            text = file.read()
+        self.assertNotIn(' ', text)
+        exported = json.loads(text)
+        self.assertEqual(set(exported["percentiles"]), {"p5", "p25", "p50", "p75", "p95"})
+        self.assertIn("123", exported["worst"])
+
+    def test_headless_visualization(self):
+        """Test that the monitor and detector render headless reports."""
+        network_manager = NetworkManager(num_nodes=50, seed=0)
+        network_manager.initialize_network()
+        for _ in range(5):
+            network_manager.monitor_network()
+        path = os.path.join(self.directory.name, 'performance.png')
+        data = PerformanceMonitor(network_manager).visualize_performance(output_path=path)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(data["num_nodes"], 50)
+        json_path = os.path.join(self.directory.name, 'anomalies.json')
+        AnomalyDetector(network_manager).visualize_anomalies(json_path=json_path)
+        self.assertTrue(os.path.exists(json_path))
+
+if __name__ == '__main__':
+    unittest.main()
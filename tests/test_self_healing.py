@@ -1,3 +1,4 @@
+import time
 import unittest
 from unittest.mock import patch
 from network.self_healing import SelfHealingMechanism
@@ -15,7 +16,11 @@ class TestSelfHealingMechanism(unittest.TestCase):
     def test_monitor_and_repair(self):
         """Test the monitoring and repair functionality."""
         self.network_manager.simulate_node_failure(0)
-        self.self_healing.monitor_and_repair()  # Should not raise any exceptions
+        try:
+            self.self_healing.monitor_and_repair()  # Should not raise any exceptions
+        finally:
+            self.self_healing.stop()
+        self.assertNotIn(self.self_healing._on_state_change, self.network_manager.nodes._listeners)
 
     @patch('network.self_healing.random.random')
     def test_trigger_self_healing(self, mock_random):
@@ -25,5 +30,58 @@ class TestSelfHealingMechanism(unittest.TestCase):
         self.self_healing.trigger_self_healing(anomalies)
         self.assertTrue(self.network_manager.nodes[0].is_active)  # Check if the node is repaired
 
+    def test_repair_many(self):
+        """Test batch classification and repair of many nodes."""
+        nodes = self.network_manager.nodes
+        for value in [1.0, 0.5, 1.0, 0.5]:
+            nodes.history.append([0], [value])  # Unstable history
+        for value in [0.3, 0.3]:
+            nodes.history.append([1], [value])  # Stable but low
+        nodes.fail([0, 1, 2])
+        nodes[3].failure_count = 3
+        nodes.fail([3])
+        report = self.self_healing.repair_many([0, 1, 2, 3])
+        self.assertEqual(report['soft_reset'].tolist(), [0])
+        self.assertEqual(report['repaired'].tolist(), [1, 2])
+        self.assertEqual(report['below_threshold'].tolist(), [1])
+        self.assertEqual(report['unrepairable'].tolist(), [3])
+        self.assertEqual(nodes[0].performance, 0.5)
+        self.assertEqual(nodes[1].performance, 1.0)
+        self.assertTrue(nodes[2].is_active)
+        self.assertFalse(nodes[3].is_active)
+
+    def wait_for(self, condition, timeout=5.0):
+        """Poll until a condition holds or the timeout expires."""
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_event_driven_repair(self):
+        """Test that a failure is repaired without polling."""
+        self.network_manager.redundancy_level = 0
+        self.self_healing.start()
+        try:
+            self.network_manager.simulate_node_failure(3)
+            self.assertTrue(self.wait_for(lambda: self.network_manager.nodes[3].is_active))
+            self.assertEqual(len(self.self_healing.repair_latencies), 1)
+        finally:
+            self.self_healing.stop()
+
+    def test_repair_gives_up_after_repair_attempts(self):
+        """Test exponential backoff and the attempt limit for unrepairable nodes."""
+        healer = SelfHealingMechanism(self.network_manager, backoff_base=0.01, repair_attempts=3)
+        self.network_manager.nodes[2].failure_count = 5  # Too many failures to repair
+        with patch.object(healer, 'notify_admin') as mock_notify, \
+                patch.object(healer, 'repair_node', wraps=healer.repair_node) as mock_repair:
+            healer.start()
+            try:
+                self.network_manager.nodes[2].is_active = False
+                self.assertTrue(self.wait_for(lambda: mock_notify.called))
+                self.assertEqual(mock_repair.call_count, 3)
+                self.assertEqual(healer.pending_repairs, 0)
+            finally:
+                healer.stop()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from network.network_manager import NetworkManager
+from network.sharded_network_manager import ShardedNetworkManager
+
+class TestShardedNetworkManager(unittest.TestCase):
+    """Unit tests for the ShardedNetworkManager class."""
+
+    def setUp(self):
+        self.network_manager = ShardedNetworkManager(num_nodes=30, num_shards=3, history_window=5, seed=0)
+        self.network_manager.initialize_network()
+
+    def tearDown(self):
+        self.network_manager.close()
+
+    def test_monitor_network_aggregates_shards(self):
+        """Test that a tick runs on every shard and its statistics match the gathered status."""
+        tick = self.network_manager.monitor_network()
+        records = self.network_manager.get_network_status(as_array=True)
+        np.testing.assert_array_equal(records['node_id'], np.arange(30))
+        self.assertEqual(tick['num_active'], 30)
+        self.assertAlmostEqual(tick['mean_performance'], records['performance'].mean())
+        self.assertAlmostEqual(tick['std_performance'], records['performance'].std())
+        self.assertTrue((records['performance'] < 1.0).all())
+
+    def test_failover_across_shards(self):
+        """Test that a failed node's redundant successor is reactivated on the next shard."""
+        self.network_manager.simulate_node_failure(10)  # First node of shard 1
+        self.assertEqual(self.network_manager.get_network_summary()['inactive_node_ids'], [10])
+        self.network_manager.simulate_node_failure(9)  # Last node of shard 0
+        summary = self.network_manager.get_network_summary()
+        self.assertEqual(summary['inactive_node_ids'], [9])
+        status = self.network_manager.get_network_status()
+        self.assertTrue(status[10]['is_active'])
+        self.assertEqual(status[10]['performance'], 1.0)
+        self.assertEqual(status[9]['failure_count'], 1)
+
+    def test_failover_matches_network_manager(self):
+        """Test that failover across shards and around the ring matches the in-process manager."""
+        reference = NetworkManager(num_nodes=30, redundancy_level=2)
+        reference.initialize_network()
+        for failed in ([0, 1], [29], [19, 20, 21], [18], [5, 25]):
+            self.network_manager.simulate_node_failure(failed)
+            reference.simulate_node_failure(failed)
+            self.assertEqual(self.network_manager.get_network_summary(), reference.get_network_summary())
+            self.assertFalse(self.network_manager.is_active[failed].any())  # No failover within the batch
+
+    def test_shutdown_network(self):
+        """Test that shutdown deactivates every node and stops the shards."""
+        self.network_manager.shutdown_network()
+        self.assertFalse(self.network_manager._processes)
+
+if __name__ == '__main__':
+    unittest.main()
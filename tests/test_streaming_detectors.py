@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from monitoring.anomaly_detection import AnomalyDetector
+from monitoring.streaming_detectors import STREAMING_DETECTORS
+from network.network_manager import NetworkManager
+
+class TestStreamingDetectors(unittest.TestCase):
+    """Unit tests for the streaming anomaly detectors."""
+
+    def test_outage_is_flagged_on_arrival(self):
+        """Test that every detector flags an injected drop on the tick it arrives."""
+        rows = np.arange(200)
+        for name, detector_class in STREAMING_DETECTORS.items():
+            with self.subTest(detector=name):
+                rng = np.random.default_rng(0)
+                detector = detector_class(rows.size)
+                for tick in range(120):
+                    values = rng.normal(0.8, 0.02, size=rows.size)
+                    if tick == 110:
+                        values[:5] = 0.1
+                    flagged = detector.update(rows, values)
+                    if tick == 110:
+                        self.assertTrue(flagged[:5].all())
+                        self.assertLess(flagged[5:].sum(), 5)
+
+    def test_state_is_constant_per_node(self):
+        """Test that detector memory does not grow with the number of samples."""
+        for name, detector_class in STREAMING_DETECTORS.items():
+            with self.subTest(detector=name):
+                detector = detector_class(10)
+                nbytes = detector.nbytes
+                for _ in range(100):
+                    detector.update(np.arange(10), np.full(10, 0.8))
+                self.assertEqual(detector.nbytes, nbytes)
+
+    def test_anomaly_detector_streaming_algorithm(self):
+        """Test that AnomalyDetector reports streaming detections in its usual format."""
+        network_manager = NetworkManager(num_nodes=5, seed=0)
+        network_manager.initialize_network()
+        detector = AnomalyDetector(network_manager, algorithm='cusum')
+        history = network_manager.nodes.history
+        for _ in range(20):
+            history.append(np.arange(5), np.full(5, 0.8))
+        self.assertEqual(detector.detect_anomalies(), [])
+        history.append(np.arange(5), [0.8, 0.1, 0.8, 0.8, 0.8])
+        self.assertEqual(detector.detect_anomalies(), [{'node_id': 1, 'anomaly_index': 20, 'performance': float(np.float32(0.1))}])
+        self.assertEqual(detector.models, {})
+
+if __name__ == '__main__':
+    unittest.main()
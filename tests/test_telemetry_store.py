@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from monitoring.anomaly_detection import AnomalyDetector
+from monitoring.performance_monitor import PerformanceMonitor
+from monitoring.telemetry_store import HEADER_SIZE, TelemetryStore
+from network.network_manager import NetworkManager
+
+class TestTelemetryStore(unittest.TestCase):
+    """Unit tests for the TelemetryStore class."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.network_manager = NetworkManager(num_nodes=20, seed=0, telemetry=True)
+        self.network_manager.initialize_network()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_append_read_and_rotation(self):
+        """Test that ticks round-trip through rotated, memory-mapped segments."""
+        store = TelemetryStore(self.directory.name, num_nodes=20, segment_ticks=4)
+        readings = [self.network_manager.monitor_network_vectorized() for _ in range(10)]
+        for tick_readings in readings:
+            store.append(tick_readings)
+        records = store.read()
+        self.assertEqual(len(store.segments()), 3)
+        np.testing.assert_array_equal(records['tick'], np.arange(10))
+        np.testing.assert_allclose(records['performance'][7], readings[7]['performance'], rtol=1e-6)
+        np.testing.assert_array_equal(records['telemetry'][7], readings[7]['telemetry'])
+        window = store.read(4, 8)
+        self.assertIsInstance(window.base, np.memmap)  # Zero-copy within one segment
+        np.testing.assert_array_equal(store.tail(3)['tick'], [7, 8, 9])
+        store.close()
+
+    def test_reopen_continues_after_torn_record(self):
+        """Test that a reopened store drops a partial trailing record and keeps appending."""
+        store = TelemetryStore(self.directory.name, num_nodes=20, segment_ticks=100, async_writes=False)
+        for _ in range(5):
+            store.append(self.network_manager.monitor_network_vectorized())
+        store.close()
+        with open(store.segments()[-1], 'ab') as file:
+            file.write(b'\x01' * 7)
+        reopened = TelemetryStore(self.directory.name, num_nodes=20, segment_ticks=100)
+        self.assertEqual(reopened.next_tick, 5)
+        reopened.append(self.network_manager.monitor_network_vectorized())
+        np.testing.assert_array_equal(reopened.read()['tick'], np.arange(6))
+        self.assertEqual(os.path.getsize(reopened.segments()[-1]), HEADER_SIZE + 6 * reopened.record_dtype.itemsize)
+        reopened.close()
+        with self.assertRaises(ValueError):
+            TelemetryStore(self.directory.name, num_nodes=10)
+
+    def test_retention_and_compaction(self):
+        """Test that old segments are dropped or averaged down to one record per factor ticks."""
+        store = TelemetryStore(self.directory.name, num_nodes=20, segment_ticks=5, max_segments=3)
+        for _ in range(20):
+            store.append(self.network_manager.monitor_network_vectorized())
+        store.flush()
+        self.assertEqual(len(store.segments()), 3)
+        expected = store.read(5, 15)['performance'].reshape(2, 5, 20).mean(axis=1)
+        path = store.compact(factor=5, keep_segments=1)
+        self.assertIsNotNone(path)
+        self.assertEqual(len(store.segments()), 2)
+        records = store.read()
+        np.testing.assert_array_equal(records['tick'], [5, 10, 15, 16, 17, 18, 19])
+        np.testing.assert_allclose(records['performance'][:2], expected, rtol=1e-5)
+        self.assertIsNone(store.compact(factor=5, keep_segments=1))  # Nothing left to compact
+        store.close()
+
+    def test_warm_start(self):
+        """Test that a restarted detector restores history and fits models from the store."""
+        store = TelemetryStore(self.directory.name, num_nodes=20)
+        monitor = PerformanceMonitor(self.network_manager, telemetry_store=store)
+        for _ in range(5):
+            monitor.collect_performance_data()
+        store.close()
+
+        network_manager = NetworkManager(num_nodes=20, seed=1)
+        network_manager.initialize_network()
+        detector = AnomalyDetector(network_manager, seed=0)
+        reopened = TelemetryStore(self.directory.name, num_nodes=20)
+        restored = detector.warm_start(reopened)
+        reopened.close()
+        self.assertEqual(restored, 5)
+        np.testing.assert_array_equal(network_manager.nodes.history.count, np.full(20, 5))
+        np.testing.assert_allclose(network_manager.nodes.history.view(3),
+                                   self.network_manager.nodes.history.view(3), rtol=1e-6)
+        self.assertTrue(detector.models)
+        self.assertEqual(detector.detect_anomalies(), [])  # Restored samples are not scored again
+
+if __name__ == '__main__':
+    unittest.main()